@@ -5,6 +5,7 @@ evolution of quantum states according to the Schrodinger equation,
 and related functions.
 """
 
+import os
 import functools
 
 import numpy as np
@@ -15,7 +16,8 @@ from .core import (qarray, isop, ldmul, rdmul, explt,
                    dot, issparse, qu, eye, dag, make_immutable)
 from .linalg.base_linalg import eigh, norm, expm_multiply, Lazy
 from .linalg.approx_spectral import norm_fro_approx
-from .utils import continuous_progbar, progbar
+from .utils import (continuous_progbar, progbar,
+                    save_to_disk, load_from_disk)
 
 
 CALLABLE_TIME_INDEP_CLASSES = (LinearOperator, Lazy)
@@ -598,14 +600,82 @@ class Evolution(object):
         """
         self._stepper.integrate(t)
 
-    def update_to(self, t):
+    def save_checkpoint(self, fname):
+        """Save the current time, state and any computed results to
+        ``fname``, such that the evolution can be resumed later with
+        :meth:`~quimb.Evolution.load_checkpoint`. The file is replaced
+        atomically, so a crash mid-save leaves the previous checkpoint intact.
+
+        Parameters
+        ----------
+        fname : str
+            Where to save the checkpoint.
+        """
+        save_to_disk({
+            't': self.t,
+            'pt': self.pt,
+            'results': getattr(self, '_results', None),
+        }, fname)
+
+    def load_checkpoint(self, fname):
+        """Load a checkpoint saved with
+        :meth:`~quimb.Evolution.save_checkpoint` into this evolution, which
+        should have been set up with the same initial state and hamiltonian.
+
+        Parameters
+        ----------
+        fname : str
+            The checkpoint file.
+        """
+        checkpoint = load_from_disk(fname)
+        t, pt = checkpoint['t'], checkpoint['pt']
+
+        if pt.shape != self._p0.shape:
+            raise ValueError(f"Checkpoint state has shape {pt.shape}, but "
+                             f"this evolution has shape {self._p0.shape}.")
+
+        if self._update_method == self._update_to_integrate:
+            self._stepper.set_initial_value(np.asarray(pt).reshape(-1), t)
+        else:
+            self._t, self._pt = t, pt
+
+        if checkpoint['results'] is not None:
+            self._results = checkpoint['results']
+
+    def update_to(self, t, checkpoint=None, checkpoint_every=None):
         """Update the simulation to time ``t`` using relevant method.
 
         Parameters
         ----------
         t : float
             Time to update the evolution to.
+        checkpoint : str, optional
+            If given, a file to save the evolution to. If the file already
+            exists, the evolution is first resumed from it.
+        checkpoint_every : float, optional
+            If ``checkpoint`` is given, the interval of simulation time to
+            evolve by between each save. By default, only save once ``t`` is
+            reached.
         """
+        if checkpoint is None:
+            return self._update_to_with_progbar(t)
+
+        if os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+
+        if checkpoint_every is None:
+            ts = [t]
+        else:
+            ts = [*np.arange(self.t + checkpoint_every, t, checkpoint_every),
+                  t]
+
+        for ti in ts:
+            # might have already reached ``t`` if resuming
+            if ti > self.t:
+                self._update_to_with_progbar(ti)
+                self.save_checkpoint(checkpoint)
+
+    def _update_to_with_progbar(self, t):
         if self._progbar and hasattr(self, '_stepper'):
 
             with continuous_progbar(self.t, t) as pbar:
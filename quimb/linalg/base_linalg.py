@@ -18,6 +18,8 @@ from .numpy_linalg import (
 from .scipy_linalg import (
     eigs_scipy,
     eigs_lobpcg,
+    eigs_davidson,
+    expm_multiply_krylov,
     svds_scipy,
 )
 from . import SLEPC4PY_FOUND
@@ -71,6 +73,7 @@ _EIGS_METHODS = {
     'NUMPY': eigs_numpy,
     'SCIPY': eigs_scipy,
     'LOBPCG': eigs_lobpcg,
+    'DAVIDSON': eigs_davidson,
     'SLEPC': eigs_slepc_spawn,
     'SLEPC-NOMPI': eigs_slepc,
 }
@@ -107,7 +110,7 @@ def eigensystem_partial(A, k, isherm, *, B=None, which=None, return_vecs=True,
     sort : bool, optional
         Whether to explicitly sort by ascending eigenvalue order.
     backend : {'AUTO', 'NUMPY', 'SCIPY',
-               'LOBPCG', 'SLEPC', 'SLEPC-NOMPI'}, optional
+               'LOBPCG', 'DAVIDSON', 'SLEPC', 'SLEPC-NOMPI'}, optional
         Which solver to use.
     fallback_to_scipy : bool, optional
         If an error occurs and scipy is not being used, try using scipy.
@@ -496,6 +499,7 @@ _EXPM_MULTIPLY_METHODS = {
     'SLEPC-EXPOKIT': functools.partial(
         mfn_multiply_slepc_spawn, fntype='exp', MFNType='EXPOKIT'),
     'SLEPC-NOMPI': functools.partial(mfn_multiply_slepc, fntype='exp'),
+    'KRYLOV': expm_multiply_krylov,
 }
 
 
@@ -508,8 +512,11 @@ def expm_multiply(mat, vec, backend="AUTO", **kwargs):
         Operator with which to act with exponential on ``vec``.
     vec : vector-like
         Vector to act with exponential of operator on.
-    backend : {'AUTO', 'SCIPY', 'SLEPC', 'SLEPC-KRYLOV', 'SLEPC-EXPOKIT'}
-        Which backend to use.
+    backend : {'AUTO', 'SCIPY', 'SLEPC', 'SLEPC-KRYLOV', 'SLEPC-EXPOKIT',
+               'KRYLOV'}
+        Which backend to use. ``'KRYLOV'`` is a simple Arnoldi iteration, see
+        :func:`~quimb.linalg.scipy_linalg.expm_multiply_krylov`, which is
+        efficient for small to moderate sized problems.
     kwargs
         Supplied to backend function.
 
@@ -2,6 +2,7 @@
 """
 
 import numpy as np
+import scipy.linalg as scla
 import scipy.sparse.linalg as spla
 
 import quimb as qu
@@ -200,6 +201,271 @@ def eigs_lobpcg(A, k, *, B=None, v0=None, which=None, return_vecs=True,
         return np.sort(lk) if sort else lk
 
 
+def _orthonormalize_against(V, X, drop_tol=1e-10):
+    """Orthonormalize the columns of ``X`` against those of the orthonormal
+    ``V`` and each other (twice, for stability), dropping any columns that are
+    (numerically) already in the span.
+    """
+    for _ in range(2):
+        if V.shape[1]:
+            X = X - V @ (V.conj().T @ X)
+        Q, R = np.linalg.qr(X)
+        keep = np.abs(np.diag(R)) > drop_tol * max(1.0, np.abs(R).max())
+        X = Q[:, keep]
+    return X
+
+
+def eigs_davidson(A, k, *, B=None, v0=None, which=None, return_vecs=True,
+                  sigma=None, isherm=True, P=None, sort=True, tol=None,
+                  maxiter=None, ncv=None, subspace=None, precond=None,
+                  return_subspace=False, **_):
+    """Davidson eigensolver for the extremal eigenpairs of a hermitian
+    operator, requiring only its action on blocks of vectors. The search space
+    is thick restarted, keeping the best Ritz vectors, once it reaches ``ncv``
+    vectors. It can be warm-started not only with a guess ``v0`` but with a
+    whole previous ``subspace``, e.g. that returned when
+    ``return_subspace=True`` from a related, previous solve.
+
+    Parameters
+    ----------
+    A : array_like, sparse_matrix, LinearOperator or quimb.Lazy
+        The operator to solve for.
+    k : int
+        Number of eigenpairs to return
+    v0 : array_like (d,) or (d, m), optional
+        The initial guess(es), which always form the start of the subspace.
+    which : {'SA', 'LA'}, optional
+        Find the smallest or largest eigenvalues.
+    return_vecs : bool, optional
+        Whether to return the eigenvectors found.
+    P : array_like, sparse_matrix, LinearOperator or quimb.Lazy, optional
+        Perform the eigensolve in the subspace defined by this projector.
+    sort : bool, optional
+        Whether to ensure the eigenvalues are sorted in ascending value.
+    tol : float, optional
+        The tolerance on the norm of each residual, relative to the magnitude
+        of the eigenvalue. Defaults to ``1e-8``.
+    maxiter : int, optional
+        The maximum number of iterations, each costing a matrix-vector product
+        for every unconverged eigenpair. Defaults to 100.
+    ncv : int, optional
+        The maximum size of the search space, defaults to ``max(20, 3 * k)``.
+    subspace : array_like (d, m), optional
+        Extra vectors to add to the initial search space after ``v0``. These
+        need not be orthonormal, nor even linearly independent.
+    precond : array_like (d,), optional
+        The diagonal of ``A`` to use as the standard Davidson preconditioner.
+        If ``A`` is dense this is taken automatically, else no preconditioning
+        is used, which is equivalent to a thick restarted block Lanczos.
+    return_subspace : bool, optional
+        Whether to also return the final best ``k + 2`` Ritz vectors, to
+        warm-start a subsequent solve with.
+
+    Returns
+    -------
+    lk : array_like (k,)
+        The eigenvalues.
+    vk : array_like (d, k)
+        The eigenvectors, if `return_vecs=True`.
+    subspace : array_like (d, m)
+        The best Ritz vectors, if ``return_subspace=True``.
+
+    See Also
+    --------
+    eigs_scipy, eigs_lobpcg
+    """
+    if B is not None:
+        raise ValueError("davidson can't solve generalized eigenproblems.")
+    if (not isherm) or (sigma is not None):
+        raise ValueError("davidson can only solve for extremal eigenpairs of "
+                         "hermitian operators.")
+
+    largest = {'SA': False, 'LA': True}['SA' if which is None else which]
+    tol = 1e-8 if tol is None else tol
+    maxiter = 100 if maxiter is None else maxiter
+
+    if isinstance(A, qu.Lazy):
+        A = A()
+    if isinstance(P, qu.Lazy):
+        P = P()
+
+    # project into subspace
+    if P is not None:
+        A = qu.dag(P) @ (A @ P)
+
+    # avoid matrix like behaviour
+    if isinstance(A, qu.qarray):
+        A = A.A
+
+    d = A.shape[0]
+    dtype = np.result_type(A.dtype, *(
+        x.dtype for x in (v0, subspace) if x is not None))
+    ncv = min(d, max(20, 3 * k) if ncv is None else max(ncv, 2 * k + 1))
+
+    if (precond is None) and isinstance(A, np.ndarray):
+        precond = np.diag(A).real
+
+    # set up the initial subspace to iterate with
+    X0 = [np.asarray(x).reshape(-1, np.asarray(x).shape[-1])
+          if np.ndim(x) > 1 else np.asarray(x).reshape(-1, 1)
+          for x in (v0, subspace) if x is not None]
+    if sum(x.shape[1] for x in X0) < k:
+        X0.append(qu.randn((d, k), dtype=dtype))
+    if P is not None:
+        X0 = [qu.dag(P) @ x if x.shape[0] != d else x for x in X0]
+    V = _orthonormalize_against(np.empty((d, 0), dtype=dtype),
+                                np.concatenate(X0, axis=1).astype(dtype))
+    V = V[:, :ncv - k]
+    AV = np.asarray(A @ V)
+
+    for _ in range(maxiter):
+        # Rayleigh-Ritz in the current search space
+        V_rr = V
+        H = V.conj().T @ AV
+        theta, s = np.linalg.eigh((H + H.conj().T) / 2)
+        if largest:
+            theta, s = theta[::-1], s[:, ::-1]
+
+        X, AX = V @ s[:, :k], AV @ s[:, :k]
+        R = AX - X * theta[:k]
+        rnorms = np.linalg.norm(R, axis=0)
+        unconverged = rnorms > tol * np.maximum(1.0, np.abs(theta[:k]))
+        if not unconverged.any():
+            break
+
+        # the correction vectors
+        T = R[:, unconverged]
+        if precond is not None:
+            denom = precond[:, None] - theta[:k][unconverged]
+            denom[np.abs(denom) < 1e-8] = 1e-8
+            T = T / denom
+
+        T = _orthonormalize_against(V, T)
+        if not T.shape[1]:
+            break
+
+        # thick restart, keeping the best ritz vectors, which span a subspace
+        #     of the current space and so T is still orthogonal to them
+        if V.shape[1] + T.shape[1] > ncv:
+            nkeep = max(k, ncv - T.shape[1])
+            V, AV = V @ s[:, :nkeep], AV @ s[:, :nkeep]
+
+        V = np.concatenate((V, T), axis=1)
+        AV = np.concatenate((AV, np.asarray(A @ T)), axis=1)
+
+    lk = theta[:k]
+    if return_vecs:
+        vk = qu.qarray(X)
+        res = maybe_sort_and_project(lk, vk, P, sort)
+    else:
+        res = np.sort(lk) if sort else lk
+
+    if return_subspace:
+        ritz = V_rr @ s[:, :min(V_rr.shape[1], k + 2)]
+        return (*res, ritz) if return_vecs else (res, ritz)
+
+    return res
+
+
+def _expm_multiply_arnoldi(A, v, scale, tol, ncv):
+    """Single Arnoldi approximation of ``expm(scale * A) @ v``, returning
+    ``None`` if the Krylov subspace of size ``ncv`` isn't enough for ``tol``.
+    """
+    beta = np.linalg.norm(v)
+    if beta == 0.0:
+        return v
+
+    d = v.size
+    m = min(ncv, d)
+    dtype = np.result_type(A.dtype, v.dtype, scale)
+    V = np.empty((m + 1, d), dtype=dtype)
+    H = np.zeros((m + 1, m), dtype=dtype)
+    V[0] = v / beta
+
+    # running estimate of the operator norm, ``|A v_j|`` with ``|v_j| = 1``
+    anorm = 0.0
+
+    for j in range(m):
+        w = np.asarray(A @ V[j]).reshape(-1)
+        anorm = max(anorm, np.linalg.norm(w))
+
+        # modified Gram-Schmidt
+        for i in range(j + 1):
+            H[i, j] = np.vdot(V[i], w)
+            w = w - H[i, j] * V[i]
+        h = np.linalg.norm(w)
+
+        F = scla.expm(scale * H[:j + 1, :j + 1])[:, 0]
+
+        # exact (happy breakdown) or converged according to the usual
+        #     a posteriori estimate of the error
+        if (h <= 1e-14 * anorm) or (j + 1 == d) or (
+                beta * abs(scale * h * F[j]) < tol):
+            return beta * (F @ V[:j + 1])
+
+        H[j + 1, j] = h
+        V[j + 1] = w / h
+
+    return None
+
+
+def expm_multiply_krylov(A, v, *, tol=1e-12, ncv=32, max_nsub=2**20):
+    """Compute the action of ``expm(A)`` on ``v`` by projecting into a Krylov
+    subspace built with the Arnoldi iteration, which only requires the action
+    of ``A``, e.g. as a ``LinearOperator``. If the subspace doesn't converge
+    within ``ncv`` vectors, ``expm(A)`` is split into successively more
+    ``expm(A / s)`` sub-steps. Useful for the many small, but not tiny, local
+    exponentials of algorithms such as TDVP.
+
+    Parameters
+    ----------
+    A : array_like, sparse_matrix or LinearOperator
+        Operator to exponentiate.
+    v : array_like
+        Vector to act on.
+    tol : float, optional
+        The target (estimated) absolute error.
+    ncv : int, optional
+        The maximum size of the Krylov subspace per sub-step.
+    max_nsub : int, optional
+        The maximum number of sub-steps to try before giving up.
+
+    Returns
+    -------
+    array_like
+        The result of ``expm(A) @ v``, with the same shape as ``v``.
+
+    Raises
+    ------
+    RuntimeError
+        If ``v`` is not finite, or the exponential still doesn't converge
+        with ``max_nsub`` sub-steps, e.g. if ``A`` is not finite.
+    """
+    if isinstance(A, qu.qarray):
+        A = A.A
+
+    v = np.asarray(v)
+    shape = v.shape
+    v = v.reshape(-1)
+
+    if not np.isfinite(v).all():
+        raise RuntimeError("Krylov ``expm_multiply`` needs a finite vector.")
+
+    nsub = 1
+    while nsub <= max_nsub:
+        w = v
+        for _ in range(nsub):
+            w = _expm_multiply_arnoldi(A, w, 1 / nsub, tol / nsub, ncv)
+            if w is None:
+                break
+        else:
+            return w.reshape(shape)
+        nsub *= 2
+
+    raise RuntimeError(f"Krylov ``expm_multiply`` did not converge with "
+                       f"{max_nsub} sub-steps of subspace size {ncv}.")
+
+
 def svds_scipy(A, k=6, *, return_vecs=True, **svds_opts):
     """Compute a number of singular value pairs
 
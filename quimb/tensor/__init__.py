@@ -8,7 +8,15 @@ from .tensor_core import (
     get_tensor_linop_backend,
     set_tensor_linop_backend,
     tensor_linop_backend,
+    get_contract_path_cache,
+    set_contract_path_cache,
+    contract_path_cache,
+    get_contraction_cache_info,
+    set_contraction_cache_size,
+    clear_contraction_cache,
     tensor_contract,
+    find_slice_inds,
+    tensor_contraction_cost,
     tensor_split,
     tensor_canonize_bond,
     tensor_compress_bond,
@@ -18,10 +26,15 @@ from .tensor_core import (
     bonds_size,
     connect,
     new_bond,
+    save_tn_to_disk,
+    load_tn_from_disk,
+    read_tn_file_info,
     Tensor,
     TensorNetwork,
     TNLinearOperator1D,
     PTensor,
+    CompiledContraction,
+    HyperOptimizer,
 )
 from .tensor_gen import (
     rand_tensor,
@@ -46,6 +59,7 @@ from .tensor_gen import (
     MPO_ham_XY,
     MPO_ham_heis,
     MPO_ham_mbl,
+    MPO_evolution_operator,
     NNI_ham_ising,
     NNI_ham_XY,
     NNI_ham_heis,
@@ -53,6 +67,7 @@ from .tensor_gen import (
 )
 from .tensor_1d import (
     MatrixProductState,
+    MPSEnvironments,
     MatrixProductOperator,
     Dense1D,
     SuperOperator1D,
@@ -66,6 +81,7 @@ from .tensor_dmrg import (
     DMRG,
     DMRG1,
     DMRG2,
+    DMRGParallel,
     DMRGX,
 )
 from .tensor_mera import (
@@ -74,6 +90,9 @@ from .tensor_mera import (
 from .tensor_tebd import (
     TEBD,
 )
+from .tensor_tdvp import (
+    TDVP,
+)
 from .circuit import (
     Circuit,
     CircuitMPS,
@@ -95,7 +114,15 @@ __all__ = (
     "tensor_linop_backend",
     "get_tensor_linop_backend",
     "set_tensor_linop_backend",
+    "get_contract_path_cache",
+    "set_contract_path_cache",
+    "contract_path_cache",
+    "get_contraction_cache_info",
+    "set_contraction_cache_size",
+    "clear_contraction_cache",
     "tensor_contract",
+    "find_slice_inds",
+    "tensor_contraction_cost",
     "tensor_split",
     "tensor_canonize_bond",
     "tensor_compress_bond",
@@ -105,10 +132,15 @@ __all__ = (
     "bonds_size",
     "connect",
     "new_bond",
+    "save_tn_to_disk",
+    "load_tn_from_disk",
+    "read_tn_file_info",
     "Tensor",
     "TensorNetwork",
     "TNLinearOperator1D",
     "PTensor",
+    "CompiledContraction",
+    "HyperOptimizer",
     "rand_tensor",
     "rand_phased",
     "MPS_rand_state",
@@ -131,11 +163,13 @@ __all__ = (
     "MPO_ham_XY",
     "MPO_ham_heis",
     "MPO_ham_mbl",
+    "MPO_evolution_operator",
     "NNI_ham_ising",
     "NNI_ham_XY",
     "NNI_ham_heis",
     "NNI_ham_mbl",
     "MatrixProductState",
+    "MPSEnvironments",
     "MatrixProductOperator",
     "Dense1D",
     "SuperOperator1D",
@@ -147,9 +181,11 @@ __all__ = (
     "DMRG",
     "DMRG1",
     "DMRG2",
+    "DMRGParallel",
     "DMRGX",
     "MERA",
     "TEBD",
+    "TDVP",
     "Circuit",
     "CircuitMPS",
     "CircuitDense",
@@ -1,10 +1,21 @@
 import numbers
 
 import cytoolz
+import numpy as np
 from autoray import do
 
 import quimb as qu
-from .tensor_core import get_tags, PTensor
+from .tensor_core import (
+    get_tags,
+    PTensor,
+    Tensor,
+    TensorNetwork,
+    rand_uuid,
+    tensor_contract,
+    get_contraction,
+    get_contract_backend,
+    _tensors_to_eq,
+)
 from .tensor_gen import MPS_computational_state
 from .tensor_1d import TensorNetwork1DVector
 from . import array_ops as ops
@@ -273,6 +284,17 @@ GATE_FUNCTIONS = {
 ONE_QUBIT_PARAM_GATES = {'RX', 'RY', 'RZ', 'U3'}
 TWO_QUBIT_PARAM_GATES = {'FS', 'FSIM'}
 ALL_PARAM_GATES = ONE_QUBIT_PARAM_GATES | TWO_QUBIT_PARAM_GATES
+TWO_QUBIT_GATES = {'CNOT', 'CX', 'CY', 'CZ', 'IS', 'ISWAP', 'SWAP',
+                   *TWO_QUBIT_PARAM_GATES}
+
+
+def _gate_qubits(gate):
+    """Get the qubits that ``gate``, as stored in ``Circuit.gates``, acts on
+    - these are always the final arguments.
+    """
+    gate_id, *gate_args = gate
+    nq = 2 if gate_id in TWO_QUBIT_GATES else 1
+    return tuple(map(int, gate_args[-nq:]))
 
 
 # --------------------------- main circuit class ---------------------------- #
@@ -644,6 +666,217 @@ class Circuit:
         p_dense = self.to_dense(reverse=reverse, **contract_opts)
         return qu.simulate_counts(p_dense, C=C, seed=seed)
 
+    def _parse_bitstring(self, b):
+        b = tuple(map(int, b))
+        if len(b) != self.N:
+            raise ValueError(f"Bitstring {b} should have length {self.N}.")
+        return b
+
+    def amplitude(self, b, **contract_opts):
+        """Get the amplitude ``<b|psi>`` of computational basis state ``b``,
+        by closing every output index with a product state rather than
+        forming the full wavefunction.
+
+        Parameters
+        ----------
+        b : str or sequence of int
+            The bitstring, e.g. ``'0101'``, with qubit ``0`` first.
+        contract_opts
+            Supplied to :func:`~quimb.tensor.tensor_core.tensor_contract`.
+
+        Returns
+        -------
+        scalar
+        """
+        b = self._parse_bitstring(b)
+        psi = self.psi
+        basis = np.eye(2, dtype=psi.dtype)
+        projectors = (Tensor(basis[x], inds=(psi.site_ind(i),))
+                      for i, x in enumerate(b))
+        return tensor_contract(*psi, *projectors, output_inds=(),
+                               **contract_opts)
+
+    def amplitudes(self, bitstrings, **contract_opts):
+        """Lazily generate the amplitudes ``<b|psi>`` for each bitstring
+        ``b`` in ``bitstrings``.
+
+        Since the bitstrings only change the data of the projecting product
+        state, a single contraction expression is built, with the circuit
+        tensors treated as constants - i.e. any parts of the contraction that
+        only involve gate tensors are performed once and then reused.
+
+        Parameters
+        ----------
+        bitstrings : iterable of str or sequence of int
+            The bitstrings, e.g. ``['0101', '1100', ...]``, with qubit ``0``
+            first.
+        contract_opts
+            Supplied to :func:`~quimb.tensor.tensor_core.get_contraction`.
+
+        Yields
+        ------
+        scalar
+        """
+        psi = self.psi
+        basis = np.eye(2, dtype=psi.dtype)
+        projectors = tuple(Tensor(basis[0], inds=(psi.site_ind(i),))
+                           for i in range(self.N))
+
+        tensors = (*psi, *projectors)
+        eq, _, _ = _tensors_to_eq(tensors, output_inds=())
+        constants = range(psi.num_tensors)
+        backend = contract_opts.pop('backend', get_contract_backend())
+        expr = get_contraction(eq, *(t.data for t in psi),
+                               *(t.shape for t in projectors),
+                               constants=constants, **contract_opts)
+
+        for b in bitstrings:
+            b = self._parse_bitstring(b)
+            x = expr(*(basis[i] for i in b), backend=backend)
+            if isinstance(x, np.ndarray):
+                x = x.item()
+            yield x
+
+    def marginal(self, qubits, **contract_opts):
+        """Compute the probabilities of measuring ``qubits`` in the
+        computational basis, marginalized over all other qubits, by
+        contracting ``<psi|psi>`` with only the indices of ``qubits`` open.
+
+        Parameters
+        ----------
+        qubits : sequence of int
+            The qubits to compute the marginal distribution of.
+        contract_opts
+            Supplied to :func:`~quimb.tensor.tensor_core.tensor_contract`.
+
+        Returns
+        -------
+        p : array
+            The probabilities, with shape ``(2,) * len(qubits)``, such that
+            e.g. ``p[0, 1]`` is the probability of measuring ``qubits[0]`` in
+            state 0 and ``qubits[1]`` in state 1.
+        """
+        psi = self.psi
+        bra = psi.H
+        bra.reindex_({ix: rand_uuid() for ix in bra.inner_inds()})
+
+        # each kept index appears on both bra and ket -> diagonal
+        output_inds = tuple(psi.site_ind(q) for q in qubits)
+        p = (bra | psi).contract(all, output_inds=output_inds,
+                                 **contract_opts)
+
+        if not output_inds:
+            return do('real', p)
+
+        return do('real', p.data)
+
+    def get_reverse_lightcone_tags(self, where):
+        """Get the tags of the gates in the reverse lightcone of the qubits
+        ``where``, i.e. all the gates that can affect the reduced state of
+        ``where``, in the order they were applied.
+
+        Parameters
+        ----------
+        where : int or sequence of int
+            The qubit(s).
+
+        Returns
+        -------
+        tuple[str]
+        """
+        if isinstance(where, numbers.Integral):
+            where = (where,)
+
+        cone = set(where)
+        tags = []
+
+        for k in reversed(range(len(self.gates))):
+            gate = self.gates[k]
+            qubits = _gate_qubits(gate)
+
+            if gate[0] == 'SWAP':
+                # no tensor, but the qubits are relabelled
+                i, j = qubits
+                cone = {j if q == i else i if q == j else q for q in cone}
+            elif cone.intersection(qubits):
+                cone.update(qubits)
+                tags.append(f'GATE_{k}')
+
+        return tuple(reversed(tags))
+
+    def get_psi_reverse_lightcone(self, where):
+        """Get a view of the wavefunction tensor network with only the gates
+        in the reverse lightcone of ``where`` (and the initial state) kept.
+        Every other gate would cancel with its conjugate in a local quantity
+        such as ``<psi|G|psi>``, where ``G`` acts only on ``where``.
+
+        If gates have been contracted into each other or into the initial
+        state, such that they cannot be removed, the whole wavefunction is
+        returned instead.
+
+        Parameters
+        ----------
+        where : int or sequence of int
+            The qubit(s).
+
+        Returns
+        -------
+        TensorNetwork
+        """
+        psi = self.psi
+        lc_tags = set(self.get_reverse_lightcone_tags(where))
+
+        gate_tags = [{tag for tag in t.tags if tag.startswith('GATE_')}
+                     for t in psi]
+        if (any(len(gtags) > 1 for gtags in gate_tags) or
+                sum(not gtags for gtags in gate_tags) != self.N):
+            return psi
+
+        # the initial state tensors have no gate tags so are always kept
+        ts = (t for t, gtags in zip(psi, gate_tags) if gtags <= lc_tags)
+        return TensorNetwork(ts, virtual=True)
+
+    def local_expectation(self, G, where, **contract_opts):
+        """Compute the local expectation value ``<psi|G|psi>`` of operator
+        ``G`` acting on qubits ``where``, using only the gates in the reverse
+        lightcone of ``where`` - all others cancel. The cost thus depends on
+        the depth of the circuit rather than the number of qubits.
+
+        Since lightcones of the same shape produce the same contraction
+        equation, e.g. for every bulk site of a translationally invariant
+        ansatz, the contraction expression and path are cached and reused.
+
+        Parameters
+        ----------
+        G : array
+            The operator, either as a matrix or with shape ``(2,) * 2 * n``
+            where ``n = len(where)``.
+        where : int or sequence of int
+            The qubit(s) ``G`` acts on.
+        contract_opts
+            Supplied to :func:`~quimb.tensor.tensor_core.tensor_contract`.
+
+        Returns
+        -------
+        scalar
+        """
+        if isinstance(where, numbers.Integral):
+            where = (where,)
+
+        ket = self.get_psi_reverse_lightcone(where)
+        bra = ket.H
+
+        kix = tuple(map(self._psi.site_ind, where))
+        bix = tuple(rand_uuid() for _ in where)
+        bra.reindex_({**{ix: rand_uuid() for ix in bra.inner_inds()},
+                      **dict(zip(kix, bix))})
+
+        G = do('reshape', G, (2,) * 2 * len(where))
+        TG = Tensor(G, inds=(*bix, *kix))
+
+        return tensor_contract(*ket, TG, *bra, output_inds=(),
+                               **contract_opts)
+
     def schrodinger_contract(self, *args, **contract_opts):
         ntensor = self._psi.num_tensors
         path = [(0, 1)] + [(0, i) for i in reversed(range(1, ntensor - 1))]
@@ -711,6 +944,36 @@ class CircuitMPS(Circuit):
         # no squeeze so that bond dims of 1 preserved
         return self._psi
 
+    def simulate_counts(self, C, seed=None, reverse=False, chunksize=2**14,
+                        **contract_opts):
+        """Simulate measuring each qubit in the computational basis, by
+        sampling directly from the MPS without forming the full wavefunction.
+        See :meth:`~quimb.tensor.tensor_1d.MatrixProductState.sample`.
+
+        Parameters
+        ----------
+        C : int
+            The number of 'experimental runs', i.e. total counts.
+        seed : int, optional
+            A seed for reproducibility.
+        reverse : bool, optional
+            Whether to reverse the order of the subsystems, to match the
+            convention of qiskit for example.
+        chunksize : int, optional
+            How many samples to generate simultaneously.
+        contract_opts
+            Ignored, accepted for compatibility with
+            :meth:`Circuit.simulate_counts`, since no full contraction is
+            performed.
+
+        Returns
+        -------
+        results : dict[str, int]
+            The number of recorded counts for each
+        """
+        return self.psi.simulate_counts(C, seed=seed, reverse=reverse,
+                                        chunksize=chunksize)
+
 
 class CircuitDense(Circuit):
     """Quantum circuit simulation keeping the state in full dense form.
@@ -723,4 +986,9 @@ class CircuitDense(Circuit):
 
     @property
     def psi(self):
-        return self._psi ^ all
+        # contract all tensors into one, but keep the 1D site information
+        psi = TensorNetwork([self._psi ^ all], structure=self._psi.structure,
+                            nsites=self._psi.nsites, sites=self._psi.sites)
+        return psi.view_as_(TensorNetwork1DVector,
+                            site_ind_id=self._psi.site_ind_id,
+                            site_tag_id=self._psi.site_tag_id)
@@ -21,6 +21,7 @@ from .tensor_core import (
     tags2set,
     get_tags,
     PTensor,
+    tensor_contract,
 )
 from ..linalg.base_linalg import norm_trace_dense
 from . import array_ops as ops
@@ -1252,6 +1253,327 @@ class TensorNetwork1DFlat(TensorNetwork1D,
         print_multi_line(l1, l2, l3, max_width=max_width)
 
 
+class MPSEnvironments:
+    r"""Lazily computed, cached left and right environments of the norm
+    network ``<psi|psi>`` of an open boundary matrix product state::
+
+        L[i]                    R[j]
+        +--o-o-o-   ...   -o-o-o--+
+        |  | | |           | | |  |
+        +--o-o-o-   ...   -o-o-o--+
+
+        sites < i             sites >= j
+
+    Once built, each local expectation value only requires contracting the
+    sites the operator acts on with the relevant pair of environments, and a
+    correlation between sites ``i`` and ``j`` only the sites in between.
+
+    Parameters
+    ----------
+    psi : MatrixProductState
+        The state. It is shallow copied, sharing its arrays, so the
+        environments remain consistent with the state at the time of creation
+        - if ``psi`` is subsequently modified, create a new
+        ``MPSEnvironments``.
+
+    Examples
+    --------
+    >>> psi = MPS_rand_state(100, 16)
+    >>> envs = psi.environments()
+    >>> mzs = [envs.local_expectation(pauli('Z'), i) for i in range(100)]
+    """
+
+    def __init__(self, psi):
+        if psi.cyclic:
+            raise NotImplementedError("``MPSEnvironments`` currently only "
+                                      "supports open boundary conditions.")
+
+        self.psi = psi.copy()
+        self.n = psi.nsites
+        self._kets = tuple(self.psi[i] for i in range(self.n))
+        self._bra_bonds = {ix: rand_uuid() for ix in self.psi.inner_inds()}
+        self._bras = {}
+        self._left = [None]
+        self._right = [None]
+        self._norm = None
+
+    def ket_site(self, i):
+        return self._kets[i]
+
+    def bra_site(self, i, phys_ind=None):
+        """The conjugated tensor at site ``i``, with bonds renamed and
+        optionally its physical index renamed to ``phys_ind``.
+        """
+        try:
+            bra = self._bras[i]
+        except KeyError:
+            bra = self._bras[i] = self._kets[i].H.reindex_(self._bra_bonds)
+
+        if phys_ind is not None:
+            bra = bra.reindex({self.psi.site_ind(i): phys_ind})
+
+        return bra
+
+    def left(self, i):
+        """The environment of sites ``range(0, i)``, or ``None`` if ``i=0``.
+        """
+        while len(self._left) <= i:
+            j = len(self._left) - 1
+            ts = (self._left[j], self.ket_site(j), self.bra_site(j))
+            self._left.append(
+                tensor_contract(*(t for t in ts if t is not None)))
+        return self._left[i]
+
+    def right(self, i):
+        """The environment of sites ``range(i, n)``, or ``None`` if ``i=n``.
+        """
+        # stored in reverse: ``self._right[k]`` covers sites >= n - k
+        k = self.n - i
+        while len(self._right) <= k:
+            j = self.n - len(self._right)
+            ts = (self._right[-1], self.ket_site(j), self.bra_site(j))
+            self._right.append(
+                tensor_contract(*(t for t in ts if t is not None)))
+        return self._right[k]
+
+    @property
+    def norm(self):
+        """The norm squared, ``<psi|psi>``.
+        """
+        if self._norm is None:
+            self._norm = self._sandwich(())
+        return self._norm
+
+    def _sandwich(self, terms):
+        """Contract ``<psi|G_1 G_2 ...|psi>`` where ``terms`` is a sequence
+        of ``(G, where)`` pairs acting on non-overlapping sites.
+        """
+        # each operator is added to the contraction at its first site
+        ops, sites_ops = {}, {}
+        for G, where in terms:
+            where = (where,) if isinstance(where, Integral) else tuple(where)
+            where = tuple(w % self.n for w in where)
+            if any(w in sites_ops for w in where):
+                raise ValueError("Operators must act on distinct sites.")
+
+            kix = tuple(map(self.psi.site_ind, where))
+            bix = tuple(rand_uuid() for _ in where)
+            sites_ops.update(zip(where, bix))
+
+            dims = tuple(map(self.psi.phys_dim, where))
+            G = reshape(G, dims * 2)
+            ops[min(where)] = Tensor(G, inds=(*bix, *kix))
+
+        if sites_ops:
+            start, stop = min(sites_ops), max(sites_ops) + 1
+        else:
+            # the norm - use the left most site
+            start, stop = 0, 1
+
+        # sweep the left environment through the sites, one at a time
+        env = self.left(start)
+        for i in range(start, stop):
+            ts = (env, ops.get(i, None), self.ket_site(i),
+                  self.bra_site(i, sites_ops.get(i, None)))
+            env = tensor_contract(*(t for t in ts if t is not None))
+
+        R = self.right(stop)
+        if R is None:
+            return env
+        return tensor_contract(env, R)
+
+    def local_expectation(self, G, where, normalized=True):
+        """Compute the expectation value of operator ``G`` acting on sites
+        ``where``, ``<psi|G|psi>``.
+
+        Parameters
+        ----------
+        G : array
+            The operator, either as a matrix or with shape ``dims * 2``.
+        where : int or sequence of int
+            The site(s) ``G`` acts on, need not be contiguous.
+        normalized : bool, optional
+            Whether to divide by ``<psi|psi>``.
+
+        Returns
+        -------
+        scalar
+        """
+        x = self._sandwich(((G, where),))
+        if normalized:
+            x = x / self.norm
+        return x
+
+    def correlation(self, A, i, j, B=None, normalized=True):
+        """Correlation of operator ``A`` at sites ``i`` with operator ``B``
+        (default: ``A``) at sites ``j``, ``<A(i)B(j)> - <A(i)><B(j)>``. This
+        only requires contracting the sites between ``i`` and ``j``.
+
+        Parameters
+        ----------
+        A : array
+            The first operator.
+        i : int or sequence of int
+            The site(s) ``A`` acts on.
+        j : int or sequence of int
+            The site(s) ``B`` acts on.
+        B : array, optional
+            The second operator, defaults to ``A``.
+        normalized : bool, optional
+            Whether the state should be normalized first.
+
+        Returns
+        -------
+        C : scalar
+        """
+        if B is None:
+            B = A
+
+        cA = self.local_expectation(A, i, normalized=normalized)
+        cB = self.local_expectation(B, j, normalized=normalized)
+
+        if isinstance(i, Integral) and isinstance(j, Integral) and (
+                i % self.n == j % self.n):
+            # same site -> single operator, B applied after A
+            cAB = self.local_expectation(B @ A, i, normalized=normalized)
+        else:
+            cAB = self._sandwich(((A, i), (B, j)))
+            if normalized:
+                cAB = cAB / self.norm
+
+        return cAB - cA * cB
+
+    def _stacked_site(self, i, ops_ix, stacked):
+        """The ket and bra tensors of site ``i`` sandwiching ``stacked``, an
+        operator with a leading batch index ``ops_ix``.
+        """
+        bix = rand_uuid()
+        kix = self.psi.site_ind(i)
+        return (self.ket_site(i), self.bra_site(i, bix),
+                Tensor(stacked, inds=(ops_ix, bix, kix)))
+
+    def _stacked_local_expectations(self, stacked, sites):
+        ops_ix = rand_uuid()
+        return [
+            tensor_contract(*(
+                t for t in (self.left(i), self.right(i + 1),
+                            *self._stacked_site(i, ops_ix, stacked))
+                if t is not None
+            ), output_inds=(ops_ix,)).data / self.norm
+            for i in sites
+        ]
+
+    def correlation_matrix(self, A, B=None, sites=None, connected=True):
+        """Compute the matrix of correlations between operator ``A`` at
+        every site ``i`` and operator ``B`` at every site ``j``, for one or
+        many pairs of single site operators at once.
+
+        Rather than contracting each pair separately, for each ``i`` the
+        left environment with ``A`` inserted is swept once to the right,
+        being closed with ``B`` and the right environment at each ``j``. Many
+        operator pairs are handled simultaneously by stacking them along an
+        extra batch index.
+
+        Parameters
+        ----------
+        A : array or sequence of array
+            The first single site operator, or a sequence of them.
+        B : array or sequence of array, optional
+            The second single site operator(s), defaults to ``A``.
+        sites : sequence of int, optional
+            Which distinct sites to compute the correlations between, defaults
+            to all. The output is ordered by increasing site.
+        connected : bool, optional
+            Whether to compute the connected correlations,
+            ``<A(i)B(j)> - <A(i)><B(j)>``, (the default), or simply
+            ``<A(i)B(j)>``. On the diagonal ``B`` is applied after ``A``.
+
+        Returns
+        -------
+        C : array
+            The correlation matrix, with shape ``(len(sites), len(sites))``,
+            or if sequences of operators were given, with a leading dimension
+            for each pair.
+        """
+        single = np.ndim(A) == 2
+        if B is None:
+            B = A
+        if single:
+            A, B = (A,), (B,)
+        if len(A) != len(B):
+            raise ValueError("``A`` and ``B`` should have the same number "
+                             "of operators.")
+
+        As, Bs = np.stack(A), np.stack(B)
+        BAs = np.stack([b @ a for a, b in zip(A, B)])
+        symmetric = all(a is b for a, b in zip(A, B))
+
+        if sites is None:
+            sites = range(self.n)
+        sites = sorted(i % self.n for i in sites)
+        if not sites:
+            raise ValueError("``sites`` should not be empty.")
+        if len(set(sites)) != len(sites):
+            raise ValueError(f"``sites`` should be distinct, got {sites}.")
+        pos = {i: x for x, i in enumerate(sites)}
+        m = len(sites)
+
+        # the diagonal
+        C = [[None] * m for _ in range(m)]
+        for x, c in enumerate(self._stacked_local_expectations(BAs, sites)):
+            C[x][x] = c
+
+        def sweep(X, Y, transpose):
+            ops_ix = rand_uuid()
+            for x, i in enumerate(sites[:-1]):
+                # left environment with the stacked operator X at site i
+                env = tensor_contract(*(
+                    t for t in (self.left(i),
+                                *self._stacked_site(i, ops_ix, X))
+                    if t is not None))
+
+                for j in range(i + 1, sites[-1] + 1):
+                    if j in pos:
+                        ts = (env, self.right(j + 1),
+                              *self._stacked_site(j, ops_ix, Y))
+                        c = tensor_contract(
+                            *(t for t in ts if t is not None),
+                            output_inds=(ops_ix,)).data / self.norm
+
+                        if transpose:
+                            C[pos[j]][x] = c
+                        else:
+                            C[x][pos[j]] = c
+
+                    if j < sites[-1]:
+                        # move the environment to the next site
+                        env = tensor_contract(
+                            env, self.ket_site(j), self.bra_site(j))
+
+        sweep(As, Bs, transpose=False)
+        if symmetric:
+            for x in range(m):
+                for y in range(x):
+                    C[x][y] = C[y][x]
+        else:
+            # operators at different sites commute, so the lower triangle
+            # is given by sweeping with ``B`` on the left instead
+            sweep(Bs, As, transpose=True)
+
+        # shape (m, m, nops) -> (nops, m, m)
+        C = np.moveaxis(np.array(C), -1, 0)
+
+        if connected:
+            cA = np.stack(self._stacked_local_expectations(As, sites), -1)
+            cB = (cA if symmetric else
+                  np.stack(self._stacked_local_expectations(Bs, sites), -1))
+            C = C - cA[:, :, None] * cB[:, None, :]
+
+        if single:
+            return C[0]
+        return C
+
+
 class MatrixProductState(TensorNetwork1DVector,
                          TensorNetwork1DFlat,
                          TensorNetwork1D,
@@ -1682,6 +2004,154 @@ class MatrixProductState(TensorNetwork1DVector,
 
         return mps
 
+    def environments(self):
+        """Get the cached left and right environments of ``<psi|psi>``, for
+        efficiently computing many local expectation values and correlations.
+
+        Returns
+        -------
+        MPSEnvironments
+        """
+        return MPSEnvironments(self)
+
+    def correlation_matrix(self, A, B=None, sites=None, connected=True,
+                           envs=None):
+        """Compute the matrix of correlations between single site operator(s)
+        ``A`` and ``B`` at all pairs of ``sites`` in a single sweep per site.
+        See :meth:`MPSEnvironments.correlation_matrix`.
+
+        Parameters
+        ----------
+        A : array or sequence of array
+            The first single site operator, or a sequence of them.
+        B : array or sequence of array, optional
+            The second single site operator(s), defaults to ``A``.
+        sites : sequence of int, optional
+            Which sites to compute the correlations between, defaults to all.
+        connected : bool, optional
+            Whether to subtract ``<A(i)><B(j)>``.
+        envs : MPSEnvironments, optional
+            Already computed environments of this state to use, i.e. from
+            ``self.environments()``.
+
+        Returns
+        -------
+        C : array
+        """
+        if envs is None:
+            envs = self.environments()
+        elif (envs.n != self.nsites) or any(
+                envs.ket_site(i).data is not self[i].data
+                for i in range(self.nsites)):
+            raise ValueError("``envs`` should have been created from this "
+                             "state, with ``self.environments()``.")
+        return envs.correlation_matrix(A, B=B, sites=sites,
+                                       connected=connected)
+
+    def sample(self, C, seed=None, chunksize=2**14):
+        """Perfectly sample ``C`` configurations of this MPS, in the basis
+        defined by its physical indices, with probabilities ``|<x|psi>|^2``.
+
+        A right canonical copy of the state is made, so that the right
+        environment of every site is the identity, and then each site is
+        sampled in turn conditioned on the previous outcomes. This is
+        vectorized over shots, processed ``chunksize`` at a time to bound
+        memory. The cost is linear in both ``C`` and the number of sites.
+
+        Parameters
+        ----------
+        C : int
+            The number of samples to draw.
+        seed : int or numpy.random.Generator, optional
+            A seed or generator for reproducibility.
+        chunksize : int, optional
+            How many samples to generate simultaneously.
+
+        Returns
+        -------
+        configs : array
+            Integer array of shape ``(C, nsites)``, each row a configuration.
+        """
+        if self.cyclic:
+            raise NotImplementedError("Sampling is currently only supported "
+                                      "for open boundary conditions.")
+
+        rng = np.random.default_rng(seed)
+
+        psi = self.copy()
+        psi.right_canonize()
+
+        # gather raw arrays in 'lpr' order, with dummy bonds at the ends
+        arrays = []
+        for i in range(psi.nsites):
+            T = psi[i]
+            bl = (psi.bond(i - 1, i),) if i > 0 else ()
+            br = (psi.bond(i, i + 1),) if i < psi.nsites - 1 else ()
+            A = np.asarray(T.transpose(*bl, psi.site_ind(i), *br).data)
+            if not bl:
+                A = A[None, ...]
+            if not br:
+                A = A[..., None]
+            arrays.append(A)
+
+        dmax = max(A.shape[1] for A in arrays)
+        dtype = np.result_type(*arrays)
+        iscomplex = np.issubdtype(dtype, np.complexfloating)
+        configs = np.empty((C, psi.nsites), dtype=np.min_scalar_type(dmax))
+
+        for c0 in range(0, C, chunksize):
+            c1 = min(c0 + chunksize, C)
+            nc = c1 - c0
+            L = np.ones((nc, 1), dtype=dtype)
+            for i, A in enumerate(arrays):
+                # conditional amplitudes for each shot and outcome
+                dl, d, dr = A.shape
+                M = (L @ A.reshape(dl, d * dr)).reshape(nc, d, dr)
+                p = np.einsum('csr,csr->cs', M, M.conj() if iscomplex else M)
+                p = p.real if iscomplex else p
+                cp = np.cumsum(p, axis=-1)
+
+                # inverse transform sample an outcome for each shot
+                r = rng.random((nc, 1)) * cp[:, -1:]
+                x = np.minimum(np.sum(cp <= r, axis=-1), d - 1)
+                configs[c0:c1, i] = x
+
+                # condition the left environments on the outcomes
+                shots = np.arange(nc)
+                L = M[shots, x] / np.sqrt(p[shots, x])[:, None]
+
+        return configs
+
+    def simulate_counts(self, C, seed=None, reverse=False, chunksize=2**14):
+        """Simulate measuring each site of this MPS in the computational
+        basis, producing output like :func:`~quimb.calc.simulate_counts` but
+        without forming the dense state, see
+        :meth:`~quimb.tensor.tensor_1d.MatrixProductState.sample`.
+
+        Parameters
+        ----------
+        C : int
+            The number of counts to perform.
+        seed : int, optional
+            A seed for reproducibility.
+        reverse : bool, optional
+            Whether to reverse the order of the subsystems, to match the
+            convention of qiskit for example.
+        chunksize : int, optional
+            How many samples to generate simultaneously.
+
+        Returns
+        -------
+        results : dict[str, int]
+            The counts for each bit string measured.
+        """
+        configs = self.sample(C, seed=seed, chunksize=chunksize)
+        if reverse:
+            configs = configs[:, ::-1]
+
+        unique, counts = np.unique(configs, axis=0, return_counts=True)
+        return {''.join(map(str, x)): int(c) for x, c in zip(unique, counts)}
+
     def magnetization(self, i, direction='Z', cur_orthog=None):
         """Compute the magnetization at site ``i``.
         """
@@ -2579,8 +3049,58 @@ class MatrixProductOperator(TensorNetwork1DFlat,
 
         return summed
 
-    def _apply_mps(self, other, compress=True, **compress_opts):
-        # import pdb; pdb.set_trace()
+    def _apply_mps_zipup(self, other, **compress_opts):
+        if self.cyclic or other.cyclic:
+            raise ValueError("The zip-up algorithm only supports open "
+                             "boundary conditions.")
+
+        A, x = self.copy(), other.copy()
+
+        # the zip-up truncations are only controlled with a right canonical
+        #     state, in which case the environment to the right is trivial
+        x.right_canonize()
+
+        # align the indices
+        A.lower_ind_id = "__tmp{}__"
+        A.upper_ind_id = x.site_ind_id
+        x.reindex_sites("__tmp{}__", inplace=True)
+
+        # sweep from left to right, splitting off a single new site tensor
+        #     and carrying the remainder on to be absorbed into the next site
+        C = None
+        for i in range(x.nsites):
+            ts = (x[i], A[i]) if C is None else (C, x[i], A[i])
+            T = tensor_contract(*ts)
+
+            if i == x.nsites - 1:
+                x[i].modify(data=T.data, inds=T.inds)
+                break
+
+            rix = (x.bond(i, i + 1), A.bond(i, i + 1))
+            lix = tuple(ix for ix in T.inds if ix not in rix)
+            U, C = T.split(lix, right_inds=rix, get='tensors', absorb='right',
+                           bond_ind=rand_uuid(), **compress_opts)
+            x[i].modify(data=U.data, inds=U.inds)
+
+        return x
+
+    def _apply_mps(self, other, compress=True, method='direct',
+                   **compress_opts):
+        check_opt('method', method, ('direct', 'zipup'))
+
+        if method == 'zipup':
+            form = compress_opts.pop('form', None)
+            x = self._apply_mps_zipup(other, **compress_opts)
+
+            # the state is now left canonical -> a single backwards sweep
+            #     performs the final, properly canonical, compression
+            if form in (None, 'right'):
+                x.right_compress(**compress_opts)
+            else:
+                x.compress(form=form, **compress_opts)
+
+            return x
+
         A, x = self.copy(), other.copy()
 
         # align the indices
@@ -2627,7 +3147,7 @@ class MatrixProductOperator(TensorNetwork1DFlat,
 
         return out
 
-    def apply(self, other, compress=False, **compress_opts):
+    def apply(self, other, compress=False, method='direct', **compress_opts):
         r"""Act with this MPO on another MPO or MPS, such that the resulting
         object has the same tensor network structure/indices as ``other``.
 
@@ -2667,6 +3187,15 @@ class MatrixProductOperator(TensorNetwork1DFlat,
             The object to act on.
         compress : bool, optional
             Whether to compress the resulting object.
+        method : {'direct', 'zipup'}, optional
+            How to apply this MPO to an MPS. ``'direct'`` contracts each site
+            exactly, giving bond dimension ``D * chi``, before optionally
+            compressing. ``'zipup'`` instead sweeps from left to right, with
+            ``other`` in right canonical form, truncating the new bonds on the
+            fly (with ``compress_opts``), and then performs a final
+            compression sweep back - the large bond dimension is never formed.
+            This always compresses, regardless of ``compress``, and is only
+            supported for open boundary conditions.
         compress_opts
             Supplied to :meth:`TensorNetwork1DFlat.compress`.
 
@@ -2675,8 +3204,12 @@ class MatrixProductOperator(TensorNetwork1DFlat,
         MatrixProductOperator or MatrixProductState
         """
         if isinstance(other, MatrixProductState):
-            return self._apply_mps(other, compress=compress, **compress_opts)
+            return self._apply_mps(other, compress=compress, method=method,
+                                   **compress_opts)
         elif isinstance(other, MatrixProductOperator):
+            if method != 'direct':
+                raise ValueError("Only the 'direct' method is supported when "
+                                 "applying to another MPO.")
             return self._apply_mpo(other, compress=compress, **compress_opts)
         else:
             raise TypeError("Can only Dot with a MatrixProductOperator or a "
@@ -2,27 +2,34 @@
 """
 import os
 import re
+import sys
 import copy
 import uuid
 import math
+import time
 import string
 import weakref
+import threading
 import operator
 import functools
 import itertools
 import contextlib
+import random
 import collections
 from numbers import Integral
+from concurrent.futures import as_completed
 
 from cytoolz import (unique, concat, frequencies,
                      partition_all, merge_with, valmap)
 import numpy as np
 import opt_einsum as oe
+import opt_einsum.path_random as opr
 import scipy.sparse.linalg as spla
 from autoray import do, conj, reshape, transpose
 
-from ..core import qarray, prod, realify_scalar, vdot, common_type
-from ..utils import check_opt, functions_equal
+from ..core import (qarray, prod, realify_scalar, vdot, common_type,
+                    get_thread_pool, _NUM_THREAD_WORKERS)
+from ..utils import check_opt, functions_equal, find_library, atomic_write
 from ..gen.rand import randn, seed_rand
 from . import decomp
 from .array_ops import (iscomplex, norm_fro, unitize, ndim, asarray, PArray,
@@ -43,6 +50,177 @@ greedy_rank = functools.partial(oe.paths.greedy, cost_fn=cost_rank)
 oe.paths.register_path_fn('greedy-rank', greedy_rank)
 
 
+def _partition_ssa_path(inputs, output, size_dict, seed=None, cutoff=8):
+    """Find a contraction path by recursively bisecting the tensor network
+    graph, using a randomized Kernighan-Lin partitioner weighted by log bond
+    size, then greedily contracting groups of at most ``cutoff`` tensors.
+    """
+    import networkx as nx
+
+    rng = random.Random(seed)
+    ssa_ids = itertools.count(len(inputs))
+    ssa_path = []
+    total_counts = frequencies(concat(inputs))
+
+    def get_legs(nodes):
+        inner_counts = frequencies(concat(inputs[n] for n in nodes))
+        return {ix for ix, cnt in inner_counts.items()
+                if (ix in output) or (total_counts[ix] > cnt)}
+
+    def contract_group(nodes):
+        if len(nodes) == 1:
+            return nodes[0]
+
+        if len(nodes) <= cutoff:
+            ids = list(nodes)
+            sub_path = oe.paths.ssa_greedy_optimize(
+                [inputs[n] for n in nodes], get_legs(nodes), size_dict)
+            for i, j in sub_path:
+                ssa_path.append((ids[i], ids[j]))
+                ids.append(next(ssa_ids))
+            return ids[-1]
+
+        # build the weighted graph of just these nodes
+        ind_nodes = collections.defaultdict(list)
+        for n in nodes:
+            for ix in inputs[n]:
+                ind_nodes[ix].append(n)
+
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        for ix, ix_nodes in ind_nodes.items():
+            w = math.log2(size_dict[ix])
+            for u, v in itertools.combinations(ix_nodes, 2):
+                if G.has_edge(u, v):
+                    G[u][v]['weight'] += w
+                else:
+                    G.add_edge(u, v, weight=w)
+
+        group_a, group_b = nx.algorithms.community.kernighan_lin_bisection(
+            G, weight='weight', seed=rng.randrange(2**32))
+
+        ssa_a = contract_group(sorted(group_a))
+        ssa_b = contract_group(sorted(group_b))
+        ssa_path.append((ssa_a, ssa_b))
+        return next(ssa_ids)
+
+    contract_group(list(range(len(inputs))))
+    return ssa_path
+
+
+class HyperOptimizer(oe.paths.PathOptimizer):
+    """A path optimizer that runs many trials of randomized greedy and
+    (if ``networkx`` is installed) recursive partitioning based path finders,
+    keeping the best path found, within a budget of time and/or repeats.
+    Every trial is seeded, so results are deterministic for a fixed
+    ``max_repeats`` and no ``max_time``.
+
+    Parameters
+    ----------
+    max_repeats : int, optional
+        The maximum number of trials to run.
+    max_time : float, optional
+        The maximum time in seconds to spend searching, after the first trial
+        of each method.
+    minimize : {'flops', 'size'}, optional
+        Whether to minimize the total contraction cost, or the size of the
+        largest intermediate (i.e. peak memory) first.
+    methods : sequence of {'greedy', 'partition'}, optional
+        Which trial methods to cycle through.
+    partition_cutoff : int, optional
+        The maximum size of groups of tensors left after partitioning, which
+        are then greedily contracted.
+    seed : int, optional
+        An offset for the seed of each trial.
+
+    Attributes
+    ----------
+    best : dict
+        The ``'flops'``, ``'size'``, ``'method'`` and ``'path'`` of the best
+        trial of the last search.
+    """
+
+    _VALID_METHODS = {'greedy', 'partition'}
+
+    def __init__(self, max_repeats=128, max_time=None, minimize='flops',
+                 methods=('greedy', 'partition'), partition_cutoff=8,
+                 seed=0):
+        check_opt('minimize', minimize, ('flops', 'size'))
+        for method in methods:
+            check_opt('method', method, self._VALID_METHODS)
+
+        # partitioning requires networkx
+        if not find_library('networkx'):
+            methods = tuple(m for m in methods if m != 'partition')
+            if not methods:
+                raise ImportError("The library networkx is not installed.")
+
+        self.max_repeats = max_repeats
+        self.max_time = max_time
+        self.minimize = minimize
+        self.methods = tuple(methods)
+        self.partition_cutoff = partition_cutoff
+        self.seed = seed
+        self.best = None
+
+    def _score(self, flops, size):
+        if self.minimize == 'flops':
+            return flops, size
+        return size, flops
+
+    def _trial(self, method, r, inputs, output, size_dict):
+        if method == 'greedy':
+            # trial zero is plain greedy, the rest are randomized
+            ssa_path, _, _ = opr._trial_greedy_ssa_path_and_cost(
+                r, inputs, output, size_dict,
+                choose_fn=functools.partial(opr.thermal_chooser,
+                                            temperature=1.0, nbranch=8,
+                                            rel_temperature=True),
+                cost_fn='memory-removed' if r == 0 else
+                        'memory-removed-jitter')
+        else:
+            ssa_path = _partition_ssa_path(inputs, output, size_dict,
+                                           seed=r,
+                                           cutoff=self.partition_cutoff)
+
+        flops, size = opr.ssa_path_compute_cost(
+            ssa_path, inputs, output, size_dict)
+
+        return ssa_path, flops, size
+
+    def __call__(self, inputs, output, size_dict, memory_limit=None):
+        if len(inputs) <= 2:
+            return [tuple(range(len(inputs)))]
+
+        t0 = time.time()
+        self.best = None
+
+        for r in range(self.max_repeats):
+            method = self.methods[r % len(self.methods)]
+
+            # make sure every method gets one trial before timing out
+            if ((self.max_time is not None) and (r >= len(self.methods)) and
+                    (time.time() - t0 > self.max_time)):
+                break
+
+            trial_seed = self.seed + r // len(self.methods)
+            ssa_path, flops, size = self._trial(
+                method, trial_seed, inputs, output, size_dict)
+
+            if (self.best is None) or (self._score(flops, size) <
+                                       self._score(self.best['flops'],
+                                                   self.best['size'])):
+                self.best = {'flops': flops, 'size': size,
+                             'method': method, 'path': ssa_path}
+
+        return oe.paths.ssa_to_linear(self.best['path'])
+
+
+oe.paths.register_path_fn('hyper', HyperOptimizer(max_repeats=64))
+oe.paths.register_path_fn('hyper-size', HyperOptimizer(max_repeats=64,
+                                                       minimize='size'))
+
+
 def get_contract_strategy():
     """Get the default contraction strategy - the option supplied as
     ``optimize`` to ``opt_einsum``.
@@ -52,7 +230,13 @@ def get_contract_strategy():
 
 def set_contract_strategy(strategy):
     """Get the default contraction strategy - the option supplied as
-    ``optimize`` to ``opt_einsum``.
+    ``optimize`` to ``opt_einsum``. As well as the ``opt_einsum`` strategies,
+    ``'greedy-rank'``, ``'hyper'`` and ``'hyper-size'`` are available, the
+    latter two using :class:`HyperOptimizer` to minimize total cost and peak
+    memory respectively. Custom budgets can be registered like::
+
+        oe.paths.register_path_fn('hyper-10s', HyperOptimizer(max_time=10))
+
     """
     global _DEFAULT_CONTRACTION_STRATEGY
     _DEFAULT_CONTRACTION_STRATEGY = strategy
@@ -70,16 +254,253 @@ def contract_strategy(strategy):
         set_contract_strategy(orig_strategy)
 
 
+_CONTRACT_PATH_DISK_CACHE = None
+
+
+def get_contract_path_cache():
+    """Get the persistent, on-disk cache of contraction paths, if one has
+    been set, else ``None``.
+
+    See Also
+    --------
+    set_contract_path_cache, contract_path_cache
+    """
+    return _CONTRACT_PATH_DISK_CACHE
+
+
+def set_contract_path_cache(directory=None, size_limit=2**28,
+                            eviction_policy='least-recently-used',
+                            **cache_opts):
+    """Set a persistent, on-disk cache for contraction paths, keyed by the
+    equation, the shapes and the path optimizer. This means that many separate
+    (and possibly concurrent) processes can share the results of path finding.
+    Requires the package ``diskcache``.
+
+    Parameters
+    ----------
+    directory : str or None, optional
+        Where to store the cache. If ``None``, the default, turn the
+        persistent cache off (the in-memory caches are unaffected).
+    size_limit : int, optional
+        The approximate maximum size of the cache on disk in bytes, beyond
+        which entries will be evicted.
+    eviction_policy : str, optional
+        Which ``diskcache`` eviction policy to use.
+    cache_opts
+        Supplied to :class:`diskcache.Cache`.
+
+    See Also
+    --------
+    get_contract_path_cache, contract_path_cache
+    """
+    global _CONTRACT_PATH_DISK_CACHE
+
+    if _CONTRACT_PATH_DISK_CACHE is not None:
+        _CONTRACT_PATH_DISK_CACHE.close()
+
+    if directory is None:
+        _CONTRACT_PATH_DISK_CACHE = None
+    else:
+        import diskcache
+        _CONTRACT_PATH_DISK_CACHE = diskcache.Cache(
+            directory, size_limit=size_limit,
+            eviction_policy=eviction_policy, **cache_opts)
+
+    return _CONTRACT_PATH_DISK_CACHE
+
+
+@contextlib.contextmanager
+def contract_path_cache(directory, **cache_opts):
+    """A context manager to temporarily use a persistent, on-disk cache of
+    contraction paths located at ``directory``. Any previously set cache is
+    restored afterwards, as is, with its original settings.
+    """
+    global _CONTRACT_PATH_DISK_CACHE
+
+    # detach rather than close the original cache, so it can be restored
+    orig_cache = _CONTRACT_PATH_DISK_CACHE
+    _CONTRACT_PATH_DISK_CACHE = None
+    try:
+        yield set_contract_path_cache(directory, **cache_opts)
+    finally:
+        set_contract_path_cache(None)
+        _CONTRACT_PATH_DISK_CACHE = orig_cache
+
+
+if 'QUIMB_CONTRACT_PATH_CACHE' in os.environ:
+    set_contract_path_cache(os.environ['QUIMB_CONTRACT_PATH_CACHE'])
+
+
+_PATH_CACHE_KEY_TYPES = (str, Integral, float, type(None))
+
+
+def _get_path_cache_key(eq, shapes, kwargs):
+    """Get a key suitable for the persistent path cache, or ``None`` if the
+    contraction options are not simple enough to be safely stored.
+    """
+    if not isinstance(kwargs.get('optimize', None), str):
+        # explicit paths don't need caching, path optimizers aren't hashable
+        return None
+
+    opts = tuple(sorted((k, v) for k, v in kwargs.items()
+                        if k not in ('constants', 'use_blas')))
+    if not all(isinstance(v, _PATH_CACHE_KEY_TYPES) for _, v in opts):
+        return None
+
+    return (eq, tuple(tuple(map(int, s)) for s in shapes), opts)
+
+
+def _find_contract_path(eq, *shapes, **kwargs):
+    """Find the contraction path for ``eq``, first checking the persistent
+    cache if it has been set.
+    """
+    cache = _CONTRACT_PATH_DISK_CACHE
+    key = None if cache is None else _get_path_cache_key(eq, shapes, kwargs)
+
+    if key is not None:
+        path = cache.get(key, None)
+        if path is not None:
+            return path
+
+    path = oe.contract_path(eq, *shapes, shapes=True, **kwargs)[1].path
+
+    if key is not None:
+        cache.set(key, path)
+
+    return path
+
+
 def _get_contract_expr(eq, *shapes, **kwargs):
+    if (_CONTRACT_PATH_DISK_CACHE is not None) and (
+            kwargs.get('constants', None) is None):
+        kwargs['optimize'] = _find_contract_path(eq, *shapes, **kwargs)
     return oe.contract_expression(eq, *shapes, **kwargs)
 
 
 def _get_contract_path(eq, *shapes, **kwargs):
+    if _CONTRACT_PATH_DISK_CACHE is not None:
+        kwargs['optimize'] = _find_contract_path(eq, *shapes, **kwargs)
     return oe.contract_path(eq, *shapes, shapes=True, **kwargs)[1]
 
 
-_get_contract_expr_cached = functools.lru_cache(4096)(_get_contract_expr)
-_get_contract_path_cached = functools.lru_cache(1024)(_get_contract_path)
+def _contraction_cost(x):
+    """The 'cost' of storing a contraction expression or path info, taken as
+    the number of pairwise contractions it stores.
+    """
+    return max(len(getattr(x, 'contraction_list', ())), 1)
+
+
+class ContractionCache:
+    """A least-recently-used cache of contraction expressions or paths that
+    also tracks its hits, misses, and the time spent generating entries. As
+    well as a maximum number of entries, a maximum total 'cost' can be set,
+    where the cost of an entry is the number of pairwise contractions it
+    stores, so that large expressions are evicted sooner.
+
+    Parameters
+    ----------
+    fn : callable
+        The function to cache, e.g. ``fn(eq, *shapes, **kwargs)``.
+    maxsize : int or None, optional
+        The maximum number of entries, ``None`` for no limit.
+    max_cost : int or None, optional
+        The maximum total cost of entries, ``None`` for no limit.
+    cost_fn : callable, optional
+        Function to compute the cost of each result.
+    """
+
+    def __init__(self, fn, maxsize=None, max_cost=None,
+                 cost_fn=_contraction_cost):
+        self.fn = fn
+        self.maxsize = maxsize
+        self.max_cost = max_cost
+        self.cost_fn = cost_fn
+        self._lock = threading.RLock()
+        self.clear()
+        functools.update_wrapper(self, fn)
+
+    def __call__(self, *args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            try:
+                result, cost = self._cache[key]
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return result
+            except KeyError:
+                self.misses += 1
+
+        t0 = time.perf_counter()
+        result = self.fn(*args, **kwargs)
+        self.time += time.perf_counter() - t0
+
+        cost = self.cost_fn(result)
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = (result, cost)
+                self.cost += cost
+            self._evict()
+
+        return result
+
+    def _evict(self):
+        """Remove least recently used entries until within limits.
+        """
+        while self._cache and (
+            ((self.maxsize is not None) and
+             (len(self._cache) > self.maxsize)) or
+            ((self.max_cost is not None) and (self.cost > self.max_cost))
+        ):
+            _, (_, cost) = self._cache.popitem(last=False)
+            self.cost -= cost
+            self.evictions += 1
+
+    def resize(self, maxsize=None, max_cost=None):
+        """Change the limits of this cache, evicting entries if necessary.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            self.max_cost = max_cost
+            self._evict()
+
+    def clear(self):
+        """Remove all entries and reset the statistics.
+        """
+        with self._lock:
+            self._cache = collections.OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.cost = 0
+            self.time = 0.0
+
+    cache_clear = clear
+
+    def __len__(self):
+        return len(self._cache)
+
+    def info(self):
+        """Get a dict of statistics about this cache.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._cache),
+            'maxsize': self.maxsize,
+            'cost': self.cost,
+            'max_cost': self.max_cost,
+            'time': self.time,
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.info()})"
+
+
+_get_contract_expr_cached = ContractionCache(_get_contract_expr, 4096)
+_get_contract_path_cached = ContractionCache(_get_contract_path, 1024)
 
 
 _CONTRACT_FNS = {
@@ -90,6 +511,81 @@ _CONTRACT_FNS = {
 }
 
 
+_CONTRACT_CACHES = {
+    'expression': _get_contract_expr_cached,
+    'path': _get_contract_path_cached,
+}
+
+
+def _parse_contraction_caches(which):
+    if which is None:
+        return _CONTRACT_CACHES
+    check_opt('which', which, _CONTRACT_CACHES)
+    return {which: _CONTRACT_CACHES[which]}
+
+
+def get_contraction_cache_info(which=None):
+    """Get statistics about the in-memory caches of contraction expressions
+    and paths.
+
+    Parameters
+    ----------
+    which : {None, 'expression', 'path'}, optional
+        Which cache to get information about, ``None`` for all.
+
+    Returns
+    -------
+    dict[str, dict]
+        For each cache, the number of hits, misses and evictions, the current
+        ``size`` and ``maxsize`` in number of entries, the current ``cost``
+        and ``max_cost`` in number of stored pairwise contractions, and the
+        total ``time`` in seconds spent finding paths / building expressions.
+
+    See Also
+    --------
+    set_contraction_cache_size, clear_contraction_cache
+    """
+    return {k: c.info() for k, c in _parse_contraction_caches(which).items()}
+
+
+def set_contraction_cache_size(which, maxsize=None, max_cost=None):
+    """Resize one of the in-memory caches of contraction expressions or paths.
+
+    Parameters
+    ----------
+    which : {'expression', 'path'}
+        Which cache to resize.
+    maxsize : int or None, optional
+        The maximum number of entries, ``None`` for no limit.
+    max_cost : int or None, optional
+        The maximum total number of pairwise contractions stored across all
+        entries, ``None`` for no limit. Since the memory usage of an entry
+        is roughly proportional to this, large expressions are evicted sooner.
+
+    See Also
+    --------
+    get_contraction_cache_info, clear_contraction_cache
+    """
+    _parse_contraction_caches(which)[which].resize(maxsize, max_cost)
+
+
+def clear_contraction_cache(which=None):
+    """Clear the in-memory caches of contraction expressions and paths, and
+    reset their statistics.
+
+    Parameters
+    ----------
+    which : {None, 'expression', 'path'}, optional
+        Which cache to clear, ``None`` for all.
+
+    See Also
+    --------
+    get_contraction_cache_info, set_contraction_cache_size
+    """
+    for c in _parse_contraction_caches(which).values():
+        c.clear()
+
+
 def get_contraction(eq, *shapes, cache=True, path=False, **kwargs):
     """Get an callable expression that will evaluate ``eq`` based on
     ``shapes``. Cache the result if no constant tensors are involved.
@@ -204,7 +700,7 @@ def tensor_linop_backend(backend):
 def set_union(sets):
     """Non variadic version of set.union.
     """
-    return set.union(*sets)
+    return set().union(*sets)
 
 
 class OrderedCounter(collections.Counter, collections.OrderedDict):
@@ -252,11 +748,264 @@ def _maybe_map_indices_to_alphabet(a_ix, i_ix, o_ix):
     return ",".join(in_str) + "->" + out_str
 
 
+def _tensors_to_eq(tensors, output_inds=None):
+    """Get the ``opt_einsum`` equation for contracting ``tensors``, along
+    with all the indices, in symbol order, and the output indices.
+    """
+    i_ix = tuple(t.inds for t in tensors)
+    total_ix = tuple(concat(i_ix))
+    all_ix = tuple(unique(total_ix))
+
+    if output_inds is None:
+        o_ix = tuple(_gen_output_inds(total_ix))
+    else:
+        o_ix = tuple(output_inds)
+
+    eq = _maybe_map_indices_to_alphabet(all_ix, i_ix, o_ix)
+    return eq, all_ix, o_ix
+
+
+def _find_slice_chars(inputs, output, size_dict, max_size, sliced=(),
+                      **contract_opts):
+    """Greedily choose which indices (as ``opt_einsum`` symbols) to slice
+    over, such that the largest intermediate produced when contracting the
+    remaining equation has at most ``max_size`` elements.
+    """
+    sliced = list(sliced)
+
+    while True:
+        eq = _remove_chars_from_eq(inputs, output, sliced)
+        shapes = [tuple(size_dict[c] for c in term if c not in sliced)
+                  for term in inputs]
+        info = get_contraction(eq, *shapes, path=True, **contract_opts)
+
+        if info.largest_intermediate <= max_size:
+            return tuple(sliced)
+
+        # score indices by how much of the oversized intermediates they span
+        scores = collections.defaultdict(float)
+        for _, _, einsum_str, _, _ in info.contraction_list:
+            term = einsum_str.split('->')[1]
+            size = prod(size_dict[c] for c in term)
+            if size > max_size:
+                for c in term:
+                    if c not in output:
+                        scores[c] += math.log2(size)
+
+        if not scores:
+            raise ValueError(
+                f"Can't slice the contraction so that the largest "
+                f"intermediate has at most {max_size} elements, since the "
+                "oversized intermediates only contain output indices.")
+
+        sliced.append(max(scores, key=lambda c: (scores[c], size_dict[c])))
+
+
+def _remove_chars_from_eq(inputs, output, chars):
+    return ",".join("".join(c for c in term if c not in chars)
+                    for term in inputs) + "->" + output
+
+
+class SlicedContraction:
+    """Contract some arrays according to ``eq`` by explicitly summing over
+    every combination of values that the sliced indices, ``slice_chars``,
+    can take. A single contraction expression, for the equation with these
+    indices removed, is reused for every slice, and each slice only requires
+    taking views of the input arrays, such that the peak memory is reduced.
+
+    Parameters
+    ----------
+    eq : str
+        The ``opt_einsum`` equation to contract.
+    shapes : sequence of tuple[int]
+        The shapes of each array.
+    slice_chars : sequence of str
+        The symbols of the indices to slice over, these cannot appear in the
+        output.
+    contract_opts
+        Supplied to :func:`get_contraction` for the sliced equation.
+    """
+
+    def __init__(self, eq, shapes, slice_chars, **contract_opts):
+        lhs, self.output = eq.split('->')
+        self.inputs = lhs.split(',')
+        self.slice_chars = tuple(slice_chars)
+
+        if any(c in self.output for c in self.slice_chars):
+            raise ValueError("Can't slice over output indices.")
+
+        size_dict = {}
+        for term, shape in zip(self.inputs, shapes):
+            size_dict.update(zip(term, map(int, shape)))
+        self.slice_sizes = tuple(size_dict[c] for c in self.slice_chars)
+        self.nslices = prod(self.slice_sizes)
+
+        # the locations, for each input array, of each sliced index
+        self.locs = tuple(
+            tuple((ax, self.slice_chars.index(c))
+                  for ax, c in enumerate(term) if c in self.slice_chars)
+            for term in self.inputs
+        )
+
+        self.eq = _remove_chars_from_eq(
+            self.inputs, self.output, self.slice_chars)
+        self.shapes = tuple(
+            tuple(size_dict[c] for c in term if c not in self.slice_chars)
+            for term in self.inputs
+        )
+        self.expression = get_contraction(self.eq, *self.shapes,
+                                          **contract_opts)
+
+    def slice_values(self, i):
+        """Get the value of each sliced index for the ``i``th slice.
+        """
+        return tuple(int(x) for x in np.unravel_index(i, self.slice_sizes))
+
+    def get_sliced_arrays(self, arrays, i):
+        """Get the views of ``arrays`` corresponding to the ``i``th slice.
+        """
+        values = self.slice_values(i)
+        sliced_arrays = []
+        for x, locs in zip(arrays, self.locs):
+            if locs:
+                selector = [slice(None)] * ndim(x)
+                for ax, j in locs:
+                    selector[ax] = values[j]
+                x = x[tuple(selector)]
+            sliced_arrays.append(x)
+        return sliced_arrays
+
+    def contract_slice(self, arrays, i, backend=None):
+        """Contract just the ``i``th slice of ``arrays``.
+        """
+        if backend is None:
+            backend = _CONTRACT_BACKEND
+        return self.expression(*self.get_sliced_arrays(arrays, i),
+                               backend=backend)
+
+    def contract_slices(self, arrays, start, stop, backend=None):
+        """Contract and sum the slices in ``range(start, stop)``.
+        """
+        result = self.contract_slice(arrays, start, backend=backend)
+        for i in range(start + 1, stop):
+            result = result + self.contract_slice(arrays, i, backend=backend)
+        return result
+
+    def contract(self, arrays, backend=None, executor=None, chunksize=None):
+        """Contract ``arrays`` by summing over every slice.
+
+        Parameters
+        ----------
+        arrays : sequence of array
+            The arrays to contract.
+        backend : str, optional
+            The backend to perform each contraction with.
+        executor : None, str or executor, optional
+            If given, spread the slices over this pool, which should have a
+            ``submit`` method returning futures. The partial sums are reduced
+            as they are completed. Can also be one of:
+
+            - ``'threads'``: use :func:`~quimb.core.get_thread_pool`.
+            - ``'processes'``: use a new
+              :class:`~concurrent.futures.ProcessPoolExecutor`.
+            - ``'mpi'``: use :func:`~quimb.linalg.mpi_launcher.get_mpi_pool`.
+
+        chunksize : int, optional
+            How many slices each submitted task should contract, defaults to
+            spreading the slices over four times the number of workers. Larger
+            chunks reduce the overhead of sending arrays to other processes.
+        """
+        if executor is None:
+            return self.contract_slices(arrays, 0, self.nslices, backend)
+
+        pool, shutdown = _get_contract_executor(executor)
+
+        if chunksize is None:
+            chunksize = max(1, self.nslices // (4 * _NUM_THREAD_WORKERS))
+        starts = range(0, self.nslices, chunksize)
+
+        try:
+            result = None
+            fs = (pool.submit(self.contract_slices, arrays, start,
+                              min(start + chunksize, self.nslices), backend)
+                  for start in starts)
+            # sum the partial results in whichever order they finish
+            for f in as_completed(tuple(fs)):
+                if result is None:
+                    result = f.result()
+                else:
+                    result = result + f.result()
+        finally:
+            if shutdown:
+                pool.shutdown()
+
+        return result
+
+
+def _get_contract_executor(executor):
+    """Parse ``executor`` into an actual pool and whether it needs to be
+    shutdown after use.
+    """
+    if executor == 'threads':
+        return get_thread_pool(), False
+
+    if executor == 'processes':
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(), True
+
+    if executor == 'mpi':
+        from ..linalg.mpi_launcher import get_mpi_pool
+        return get_mpi_pool(), False
+
+    if not hasattr(executor, 'submit'):
+        raise ValueError(
+            "``executor`` should be one of {'threads', 'processes', 'mpi'} "
+            f"or have a ``submit`` method, but got {executor}.")
+
+    return executor, False
+
+
 _VALID_CONTRACT_GET = {None, 'expression', 'path-info', 'symbol-map'}
 
 
-def tensor_contract(*tensors, output_inds=None, get=None,
-                    backend=None, **contract_opts):
+def find_slice_inds(*tensors, max_size, output_inds=None, **contract_opts):
+    """Find the indices of ``tensors`` to slice over, such that when the rest
+    of the network is contracted the largest intermediate tensor has at most
+    ``max_size`` elements. Indices are added greedily, favoring those that
+    appear in the most and largest oversized intermediates.
+
+    Parameters
+    ----------
+    tensors : sequence of Tensor
+        The tensors to contract.
+    max_size : int
+        The maximum allowed number of elements in any intermediate tensor.
+    output_inds : sequence of str, optional
+        The desired output indices, which will not be sliced.
+    contract_opts
+        Supplied to :func:`get_contraction` when finding paths.
+
+    Returns
+    -------
+    tuple[str]
+    """
+    eq, all_ix, _ = _tensors_to_eq(tensors, output_inds)
+    lhs, output = eq.split('->')
+    inputs = lhs.split(',')
+
+    size_dict = {}
+    for term, t in zip(inputs, tensors):
+        size_dict.update(zip(term, t.shape))
+
+    slice_chars = _find_slice_chars(inputs, output, size_dict, max_size,
+                                    **contract_opts)
+    char_to_ind = {oe.get_symbol(i): ix for i, ix in enumerate(all_ix)}
+    return tuple(char_to_ind[c] for c in slice_chars)
+
+
+def tensor_contract(*tensors, output_inds=None, get=None, backend=None,
+                    slice_inds=None, slice_max_size=None, executor=None,
+                    max_memory=None, **contract_opts):
     """Efficiently contract multiple tensors, combining their tags.
 
     Parameters
@@ -281,6 +1030,22 @@ def tensor_contract(*tensors, output_inds=None, get=None,
     backend : {'numpy', 'cupy', 'tensorflow', 'theano', 'dask', ...}, optional
         Which backend to use to perform the contraction. Must be a valid
         ``opt_einsum`` backend with the relevant library installed.
+    slice_inds : sequence of str, optional
+        If given, perform a sliced contraction, explicitly summing over every
+        value of these (non-output) indices, reusing a single contraction
+        expression for the rest of the network. This reduces the peak
+        memory required at the cost of some extra computation.
+    slice_max_size : int, optional
+        If given, automatically find (further) indices to slice over such
+        that no intermediate tensor has more than this many elements - see
+        :func:`find_slice_inds`.
+    executor : {None, 'threads', 'processes', 'mpi'} or executor, optional
+        If given, contract the slices in parallel using this pool, see
+        :meth:`SlicedContraction.contract`.
+    max_memory : int, optional
+        If given, first estimate the peak memory in bytes that the
+        contraction requires, see :func:`tensor_contraction_cost`, and raise
+        a ``MemoryError`` rather than contract if it is larger than this.
     contract_opts
         Passed to ``opt_einsum.contract_expression`` or
         ``opt_einsum.contract_path``.
@@ -291,6 +1056,25 @@ def tensor_contract(*tensors, output_inds=None, get=None,
     """
     check_opt('get', get, _VALID_CONTRACT_GET)
 
+    if (max_memory is not None) and (get is None):
+        cost = tensor_contraction_cost(
+            *tensors, output_inds=output_inds, slice_inds=slice_inds,
+            slice_max_size=slice_max_size, **contract_opts)
+        if cost['peak_memory'] > max_memory:
+            raise MemoryError(
+                f"The contraction requires an estimated {cost['peak_memory']}"
+                f" bytes, larger than the ``max_memory`` of {max_memory}.")
+        # make sure the same slicing is used
+        slice_inds, slice_max_size = cost['slice_inds'] or None, None
+
+    if any(x is not None for x in (slice_inds, slice_max_size, executor)):
+        if get is not None:
+            raise ValueError("Can't use ``get`` with a sliced contraction.")
+        return _tensor_contract_sliced(
+            *tensors, output_inds=output_inds, backend=backend,
+            slice_inds=slice_inds, slice_max_size=slice_max_size,
+            executor=executor, **contract_opts)
+
     if backend is None:
         backend = _CONTRACT_BACKEND
 
@@ -341,6 +1125,220 @@ def tensor_contract(*tensors, output_inds=None, get=None,
     return Tensor(data=o_array, inds=o_ix, tags=o_tags)
 
 
+def _parse_sliced_eq(tensors, output_inds=None, slice_inds=None,
+                     slice_max_size=None, **contract_opts):
+    """Get the full equation, shapes, output indices, and symbols to slice
+    over for contracting ``tensors``.
+    """
+    eq, all_ix, o_ix = _tensors_to_eq(tensors, output_inds)
+    lhs, output = eq.split('->')
+    inputs = lhs.split(',')
+    shapes = tuple(t.shape for t in tensors)
+
+    ind_to_char = {ix: oe.get_symbol(i) for i, ix in enumerate(all_ix)}
+    slice_chars = tuple(ind_to_char[ix] for ix in unique(slice_inds or ()))
+
+    if slice_max_size is not None:
+        size_dict = {}
+        for term, shape in zip(inputs, shapes):
+            size_dict.update(zip(term, shape))
+        slice_chars = _find_slice_chars(inputs, output, size_dict,
+                                        slice_max_size, sliced=slice_chars,
+                                        **contract_opts)
+
+    return eq, shapes, o_ix, slice_chars
+
+
+def _get_sliced_contraction(*tensors, output_inds=None, slice_inds=None,
+                            slice_max_size=None, **contract_opts):
+    """Get the :class:`SlicedContraction` and output indices for contracting
+    ``tensors``.
+    """
+    eq, shapes, o_ix, slice_chars = _parse_sliced_eq(
+        tensors, output_inds, slice_inds, slice_max_size, **contract_opts)
+    sc = SlicedContraction(eq, shapes, slice_chars, **contract_opts)
+    return sc, o_ix
+
+
+def _path_peak_size(path_info):
+    """Compute the peak total number of elements held in memory at once, i.e.
+    all live input and intermediate tensors, for the contraction described by
+    ``path_info``.
+    """
+    size_dict = path_info.size_dict
+    lhs = path_info.eq.split('->')[0]
+    sizes = [prod(size_dict[c] for c in term) for term in lhs.split(',')]
+
+    peak = sum(sizes)
+    for contract_inds, _, einsum_str, _, _ in path_info.contraction_list:
+        # the total including the inputs and output of this contraction
+        removed = [sizes.pop(i) for i in contract_inds]
+        new_size = prod(size_dict[c] for c in einsum_str.split('->')[1])
+        peak = max(peak, sum(sizes) + sum(removed) + new_size)
+        sizes.append(new_size)
+
+    return peak
+
+
+def tensor_contraction_cost(*tensors, output_inds=None, slice_inds=None,
+                            slice_max_size=None, dtype=None,
+                            **contract_opts):
+    """Estimate the cost of contracting ``tensors``, without performing the
+    contraction, i.e. a 'dry run'.
+
+    Parameters
+    ----------
+    tensors : sequence of Tensor
+        The tensors to contract.
+    output_inds : sequence of str, optional
+        The desired output indices.
+    slice_inds : sequence of str, optional
+        Estimate the cost of a sliced contraction over these indices.
+    slice_max_size : int, optional
+        Estimate the cost of a sliced contraction with automatically chosen
+        indices, see :func:`tensor_contract`.
+    dtype : str or numpy.dtype, optional
+        The data type to compute memory with, defaults to the common type of
+        ``tensors``.
+    contract_opts
+        Supplied to :func:`get_contraction`.
+
+    Returns
+    -------
+    dict
+        With the following keys:
+
+            - ``'flops'``: the total number of scalar operations.
+            - ``'largest_intermediate'``: the number of elements in the
+              largest intermediate tensor.
+            - ``'peak_size'``: the peak total number of elements held at once,
+              including the input tensors.
+            - ``'peak_memory'``: ``peak_size`` in bytes.
+            - ``'path'``: the contraction path.
+            - ``'slice_inds'``: the indices sliced over, if any.
+            - ``'nslices'``: the number of slices.
+    """
+    eq, shapes, _, slice_chars = _parse_sliced_eq(
+        tensors, output_inds, slice_inds, slice_max_size, **contract_opts)
+
+    lhs, output = eq.split('->')
+    inputs = lhs.split(',')
+    size_dict = {}
+    for term, shape in zip(inputs, shapes):
+        size_dict.update(zip(term, map(int, shape)))
+
+    sliced_shapes = [tuple(size_dict[c] for c in term if c not in slice_chars)
+                     for term in inputs]
+    info = get_contraction(_remove_chars_from_eq(inputs, output, slice_chars),
+                           *sliced_shapes, path=True, **contract_opts)
+
+    nslices = prod(size_dict[c] for c in slice_chars)
+    # the full input tensors need to be held in memory as well as slices
+    peak_size = (_path_peak_size(info) + sum(map(prod, shapes)) -
+                 sum(map(prod, sliced_shapes)))
+
+    if dtype is None:
+        dtype = common_type(*(t.data for t in tensors))
+    itemsize = np.dtype(dtype).itemsize
+
+    char_to_ind = dict(zip(concat(inputs), concat(t.inds for t in tensors)))
+    slice_inds = tuple(char_to_ind[c] for c in slice_chars)
+
+    return {
+        'flops': int(info.opt_cost) * nslices,
+        'largest_intermediate': int(info.largest_intermediate),
+        'peak_size': int(peak_size),
+        'peak_memory': int(peak_size) * itemsize,
+        'path': tuple(info.path),
+        'slice_inds': slice_inds,
+        'nslices': nslices,
+    }
+
+
+def _tensor_contract_sliced(*tensors, output_inds=None, backend=None,
+                            slice_inds=None, slice_max_size=None,
+                            executor=None, **contract_opts):
+    sc, o_ix = _get_sliced_contraction(
+        *tensors, output_inds=output_inds, slice_inds=slice_inds,
+        slice_max_size=slice_max_size, **contract_opts)
+
+    o_array = sc.contract([t.data for t in tensors], backend=backend,
+                          executor=executor)
+
+    if not o_ix:
+        if isinstance(o_array, np.ndarray):
+            o_array = realify_scalar(o_array.item(0))
+        return o_array
+
+    o_tags = set_union(t.tags for t in tensors)
+    return Tensor(data=o_array, inds=o_ix, tags=o_tags)
+
+
+class CompiledContraction:
+    """The contraction of some tensors with a fixed structure - i.e. index
+    labels and shapes - frozen into a single ``opt_einsum`` expression, so
+    that it can be repeatedly called on new raw arrays with minimal overhead.
+
+    Parameters
+    ----------
+    tensors : sequence of Tensor
+        Tensors with the structure of the contraction. Arrays should be
+        supplied in the same order when calling.
+    output_inds : sequence of str, optional
+        The desired output indices, defaults to the outer indices in the order
+        they appear.
+    backend : str, optional
+        The default backend to perform the contraction with.
+    contract_opts
+        Supplied to :func:`get_contraction`.
+
+    Examples
+    --------
+
+        >>> psi = MPS_rand_state(10, 7)
+        >>> norm = psi.H & psi
+        >>> fn = norm.compile_contraction()
+        >>> fn(*(t.data for t in norm))
+        0.9999999999999999
+
+    """
+
+    def __init__(self, tensors, output_inds=None, backend=None,
+                 **contract_opts):
+        self.eq, _, self.output_inds = _tensors_to_eq(tensors, output_inds)
+        self.shapes = tuple(t.shape for t in tensors)
+        self.backend = backend
+        self.expression = get_contraction(self.eq, *self.shapes,
+                                          **contract_opts)
+
+    def __call__(self, *arrays, backend=None):
+        if backend is None:
+            backend = (_CONTRACT_BACKEND if self.backend is None else
+                       self.backend)
+
+        o_array = self.expression(*arrays, backend=backend)
+
+        if not self.output_inds and isinstance(o_array, np.ndarray):
+            o_array = realify_scalar(o_array.item(0))
+
+        return o_array
+
+    def contract_tensors(self, *tensors, backend=None):
+        """Contract tensors with the same structure as this contraction,
+        returning a scalar or ``Tensor`` just like :func:`tensor_contract`.
+        """
+        o_array = self(*(t.data for t in tensors), backend=backend)
+
+        if not self.output_inds:
+            return o_array
+
+        return Tensor(data=o_array, inds=self.output_inds,
+                      tags=set_union(t.tags for t in tensors))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(eq='{self.eq}')"
+
+
 # generate a random base to avoid collisions on difference processes ...
 r_bs_str = str(uuid.uuid4())[:6]
 # but then make the list orderable to help contraction caching
@@ -809,9 +1807,29 @@ def tags2set(tags):
     elif tags is None:
         return set()
     elif isinstance(tags, str):
-        return {tags}
+        return {sys.intern(tags)}
     else:
-        return set(tags)
+        return set(intern_labels(tags))
+
+
+def _intern(x):
+    return sys.intern(x) if type(x) is str else x
+
+
+def intern_labels(labels):
+    """Convert ``labels``, a sequence of indices or tags, to a tuple, interning
+    any strings so that many tensors sharing labels share the same objects.
+    """
+    try:
+        return tuple(map(sys.intern, labels))
+    except TypeError:
+        # non-string labels
+        return tuple(map(_intern, labels))
+
+
+@functools.lru_cache(None)
+def _get_all_slots(cls):
+    return tuple(concat(c.__dict__.get('__slots__', ()) for c in cls.__mro__))
 
 
 # --------------------------------------------------------------------------- #
@@ -855,6 +1873,9 @@ class Tensor(object):
 
     """
 
+    # tensor networks can contain very many small tensors, so keep them compact
+    __slots__ = ('_data', '_inds', '_tags', '_left_inds', 'owners')
+
     def __init__(self, data=1.0, inds=(), tags=None, left_inds=None):
         # a new or copied Tensor always has no owners
         self.owners = {}
@@ -868,7 +1889,7 @@ class Tensor(object):
             return
 
         self._data = asarray(data)
-        self._inds = tuple(inds)
+        self._inds = intern_labels(inds)
         self._tags = tags2set(tags)
         self._left_inds = tuple(left_inds) if left_inds is not None else None
 
@@ -888,8 +1909,15 @@ class Tensor(object):
         """
         if deep:
             return copy.deepcopy(self)
-        else:
-            return Tensor(self, None)
+
+        # fast path which shares the data and avoids re-checking indices
+        new = object.__new__(Tensor)
+        new.owners = {}
+        new._data = self._data
+        new._inds = self._inds
+        new._tags = self._tags.copy()
+        new._left_inds = self._left_inds
+        return new
 
     __copy__ = copy
 
@@ -1124,6 +2152,32 @@ class Tensor(object):
 
     astype_ = functools.partialmethod(astype, inplace=True)
 
+    def to_memmap(self, fname, inplace=False):
+        """Write the data of this tensor to ``fname``, in ``.npy`` format,
+        and replace it with a memory-map of that file. The data is then only
+        paged into memory when it is actually used, e.g. contracted, and can be
+        evicted again by the operating system under memory pressure. The
+        mapping is copy-on-write, so changes are never written back to disk.
+
+        Parameters
+        ----------
+        fname : str
+            The file to write to, should end in ``'.npy'``.
+        inplace : bool, optional
+            Whether to perform the operation inplace.
+        """
+        T = self if inplace else self.copy()
+        np.save(fname, do('to_numpy', self.data))
+        T.modify(data=np.load(fname, mmap_mode='c'))
+        return T
+
+    to_memmap_ = functools.partialmethod(to_memmap, inplace=True)
+
+    def is_memmapped(self):
+        """Whether the data of this tensor is a memory-mapped file.
+        """
+        return isinstance(self._data, np.memmap)
+
     def ind_size(self, ind):
         """Return the size of dimension corresponding to ``ind``.
         """
@@ -1588,11 +2642,17 @@ class Tensor(object):
         TensorNetwork((self,)).graph(*args, **kwargs)
 
     def __getstate__(self):
-        # This allows pickling, since the copy has no weakrefs.
-        return self.copy().__dict__
+        # This allows pickling, by removing the owner weakrefs.
+        state = {k: getattr(self, k) for k in _get_all_slots(type(self))
+                 if (k != 'owners') and hasattr(self, k)}
+        state.update(getattr(self, '__dict__', {}))
+        return state
 
-    def __setstate(self, state):
-        self.__dict__ = state.copy()
+    def __setstate__(self, state):
+        self.owners = {}
+        for k, v in state.items():
+            if k != 'owners':
+                setattr(self, k, v)
 
     def __repr__(self):
         return (f"{self.__class__.__name__}(shape={self.data.shape}, "
@@ -1738,8 +2798,12 @@ class TensorNetwork(object):
             self.nsites = ts.nsites
             self.sites = ts.sites
             self.structure_bsz = ts.structure_bsz
-            self.tag_map = valmap(lambda tid: tid.copy(), ts.tag_map)
-            self.ind_map = valmap(lambda tid: tid.copy(), ts.ind_map)
+            # the tag and ind maps are copied lazily, on first modification
+            self.tag_map = ts.tag_map
+            self.ind_map = ts.ind_map
+            self._shared_maps = ts._shared_maps = True
+            # queries are valid for both networks until either is modified
+            self._tids_cache = ts._tids_cache
             self.tensor_map = {}
             for tid, t in ts.tensor_map.items():
                 self.tensor_map[tid] = t if virtual else t.copy()
@@ -1870,6 +2934,24 @@ class TensorNetwork(object):
 
     # ------------------------------- Methods ------------------------------- #
 
+    # whether ``tag_map`` and ``ind_map`` might be shared with another network
+    _shared_maps = False
+
+    # cached results of tag and index queries, reset on any modification
+    _tids_cache = None
+    _TIDS_CACHE_MAXSIZE = 4096
+
+    def _own_maps(self):
+        """Copy-on-write: make sure this network has its own copy of
+        ``tag_map`` and ``ind_map`` before they are modified. Since this is
+        called before every modification, also invalidate any cached queries.
+        """
+        self._tids_cache = None
+        if self._shared_maps:
+            self.tag_map = valmap(lambda tids: tids.copy(), self.tag_map)
+            self.ind_map = valmap(lambda tids: tids.copy(), self.ind_map)
+            self._shared_maps = False
+
     def copy(self, virtual=False, deep=False):
         """Copy this ``TensorNetwork``. If ``deep=False``, (the default), then
         everything but the actual numeric data will be copied.
@@ -1885,10 +2967,11 @@ class TensorNetwork(object):
         """Add tid to the relevant map.
         """
         for x in xs:
-            if x in x_map:
-                x_map[x].add(tid)
-            else:
+            tids = x_map.get(x, None)
+            if tids is None:
                 x_map[x] = {tid}
+            else:
+                tids.add(tid)
 
     @staticmethod
     def _remove_tid(xs, x_map, tid):
@@ -1918,6 +3001,7 @@ class TensorNetwork(object):
         T.add_owner(self, tid)
 
         # add its tid to the relevant tags and inds, or create new entries
+        self._own_maps()
         self._add_tid(T.tags, self.tag_map, tid)
         self._add_tid(T.inds, self.ind_map, tid)
 
@@ -1957,8 +3041,11 @@ class TensorNetwork(object):
                 self.tensor_map[tid] = T
                 T.add_owner(self, tid)
 
+            # n.b. this creates new maps and sets
             self.tag_map = merge_with(set_union, self.tag_map, tn.tag_map)
             self.ind_map = merge_with(set_union, self.ind_map, tn.ind_map)
+            self._shared_maps = False
+            self._tids_cache = None
 
     def add(self, t, virtual=False, check_collisions=True, inner_inds=None):
         """Add Tensor, TensorNetwork or sequence thereof to self.
@@ -1999,10 +3086,12 @@ class TensorNetwork(object):
         return self
 
     def _modify_tensor_tags(self, old, new, tid):
+        self._own_maps()
         self._remove_tid((o for o in old if o not in new), self.tag_map, tid)
         self._add_tid((n for n in new if n not in old), self.tag_map, tid)
 
     def _modify_tensor_inds(self, set_old, set_new, tid):
+        self._own_maps()
         self._remove_tid(set_old - set_new, self.ind_map, tid)
         self._add_tid(set_new - set_old, self.ind_map, tid)
 
@@ -2063,6 +3152,7 @@ class TensorNetwork(object):
         t = self.tensor_map.pop(tid)
 
         # remove the tid from the tag and ind maps
+        self._own_maps()
         self._remove_tid(t.tags, self.tag_map, tid)
         self._remove_tid(t.inds, self.ind_map, tid)
 
@@ -2380,6 +3470,35 @@ class TensorNetwork(object):
 
         return tids
 
+    def _get_tids_from_cached(self, kind, xs, which):
+        """Cached version of ``_get_tids_from``, ``kind`` being either
+        ``'tags'`` or ``'inds'``. The cache lives until this network is next
+        modified (see ``_own_maps``), and is shared with any copies made in
+        the meantime. A fresh ``set`` is always returned.
+        """
+        # single labels can be used directly as (part of) the key
+        key = (kind, xs if isinstance(xs, str) else frozenset(xs), which)
+
+        cache = self._tids_cache
+        if cache is None:
+            cache = self._tids_cache = {}
+
+        try:
+            return set(cache[key])
+        except KeyError:
+            pass
+
+        if isinstance(xs, str):
+            xs = (xs,)
+        xmap = self.tag_map if kind == 'tags' else self.ind_map
+        tids = self._get_tids_from(xmap, xs, which)
+
+        if len(cache) >= self._TIDS_CACHE_MAXSIZE:
+            cache.clear()
+        cache[key] = frozenset(tids)
+
+        return tids
+
     def _get_tids_from_tags(self, tags, which='all'):
         """Return the set of tensor ids that match ``tags``.
 
@@ -2401,18 +3520,21 @@ class TensorNetwork(object):
         """
         if tags in (None, ..., all):
             return set(self.tensor_map)
-        elif isinstance(tags, (Integral, slice)):
+        elif isinstance(tags, Integral):
+            tags = self.site_tag(tags)
+        elif isinstance(tags, slice):
             tags = self.sites2tags(tags)
-        else:
+        elif not isinstance(tags, str):
             tags = tags2set(tags)
 
-        return self._get_tids_from(self.tag_map, tags, which)
+        return self._get_tids_from_cached('tags', tags, which)
 
     def _get_tids_from_inds(self, inds, which='all'):
         """Like ``_get_tids_from_tags`` but specify inds instead.
         """
-        inds = tags2set(inds)
-        return self._get_tids_from(self.ind_map, inds, which)
+        if not isinstance(inds, str):
+            inds = tags2set(inds)
+        return self._get_tids_from_cached('inds', inds, which)
 
     def select_tensors(self, tags, which='all'):
         """Return the sequence of tensors that match ``tags``. If
@@ -2974,9 +4096,13 @@ class TensorNetwork(object):
             >>> sum(tn ^ all for tn in norm.cut_iter(*bnds))
             1.0
 
+        For full contractions, passing ``slice_inds`` or ``slice_max_size``
+        to :meth:`TensorNetwork.contract` is much more efficient since it
+        doesn't copy the network for every slice.
+
         See Also
         --------
-        TensorNetwork.isel, TensorNetwork.cut_between
+        TensorNetwork.isel, TensorNetwork.cut_between, find_slice_inds
         """
         ranges = [range(self.ind_size(ix)) for ix in inds]
         for which in itertools.product(*ranges):
@@ -3227,6 +4353,64 @@ class TensorNetwork(object):
         # Else just contract those tensors specified by tags.
         return self.contract_tags(tags, inplace=inplace, **opts)
 
+    def compile_contraction(self, output_inds=None, **contract_opts):
+        """Freeze the structure of the full contraction of this network into
+        a callable, :class:`CompiledContraction`, which then only needs the
+        raw arrays (in the order of ``self.tensors``). This avoids repeatedly
+        re-processing indices and looking up cached expressions when
+        contracting networks with the same structure but new data many times.
+
+        Parameters
+        ----------
+        output_inds : sequence of str, optional
+            The desired output indices.
+        contract_opts
+            Supplied to :class:`CompiledContraction`.
+
+        Returns
+        -------
+        CompiledContraction
+        """
+        return CompiledContraction(self.tensors, output_inds=output_inds,
+                                   **contract_opts)
+
+    def contraction_cost(self, output_inds=None, max_memory=None,
+                         **contract_opts):
+        """Estimate the cost of fully contracting this tensor network without
+        actually doing so.
+
+        Parameters
+        ----------
+        output_inds : sequence of str, optional
+            The desired output indices.
+        max_memory : int, optional
+            If given, raise a ``MemoryError`` if the estimated peak memory
+            in bytes is larger than this.
+        contract_opts
+            Supplied to :func:`tensor_contraction_cost`, for example
+            ``optimize``, ``slice_inds`` or ``slice_max_size``.
+
+        Returns
+        -------
+        dict
+            The ``'flops'``, ``'largest_intermediate'``, ``'peak_size'``,
+            ``'peak_memory'`` in bytes for the current dtype, ``'path'``,
+            ``'slice_inds'`` and ``'nslices'`` of the contraction.
+
+        See Also
+        --------
+        contraction_width, tensor_contraction_cost
+        """
+        cost = tensor_contraction_cost(*self, output_inds=output_inds,
+                                       **contract_opts)
+
+        if (max_memory is not None) and (cost['peak_memory'] > max_memory):
+            raise MemoryError(
+                f"The contraction requires an estimated {cost['peak_memory']}"
+                f" bytes, larger than the ``max_memory`` of {max_memory}.")
+
+        return cost
+
     def contraction_width(self, **contract_opts):
         """Compute the 'contraction width' of this tensor network. This
         is defined as log2 of the maximum tensor size produced during the
@@ -4008,6 +5192,7 @@ class TensorNetwork(object):
         d['tensor_map'] = {
             k: t.copy() for k, t in d['tensor_map'].items()
         }
+        d.pop('_tids_cache', None)
         return d
 
     def __setstate__(self, state):
@@ -4016,6 +5201,12 @@ class TensorNetwork(object):
         for t in self.__dict__['tensor_map'].values():
             t.add_owner(self, tid=rand_uuid(base="_T"))
 
+    def save(self, fname, compress=False):
+        """Save this tensor network to ``fname`` in a native binary format,
+        see :func:`~quimb.tensor.tensor_core.save_tn_to_disk`.
+        """
+        return save_tn_to_disk(self, fname, compress=compress)
+
     def __str__(self):
         return "{}([{}{}{}]{}{})".format(
             self.__class__.__name__,
@@ -4038,6 +5229,252 @@ class TensorNetwork(object):
         return rep + ")>"
 
 
+# -------------------------- native binary format --------------------------- #
+
+_TN_FILE_MAGIC = b'\x93QUIMBTN'
+_TN_FILE_VERSION = 1
+_TN_FILE_ALIGN = 64
+
+
+def _tn_file_props(tn):
+    """Get the JSON-serializable properties needed to reconstruct ``tn``.
+    """
+    sites = tn.sites
+    if isinstance(sites, range):
+        sites = {'start': sites.start, 'stop': sites.stop}
+    elif sites is not None:
+        sites = list(sites)
+
+    return {
+        'module': tn.__class__.__module__,
+        'class': tn.__class__.__qualname__,
+        'structure': tn.structure,
+        'structure_bsz': tn.structure_bsz,
+        'nsites': tn.nsites,
+        'sites': sites,
+        'extra_props': {ep.lstrip('_'): getattr(tn, ep)
+                        for ep in tn._EXTRA_PROPS},
+    }
+
+
+def save_tn_to_disk(tn, fname, compress=False):
+    """Save a tensor network to disk in a native binary format. Unlike
+    pickling, the raw array data of each tensor is written contiguously
+    (and aligned) to the file, one tensor after another, followed by a
+    small JSON footer describing the network, such that the file can be
+    streamed to disk and any subset of the tensors memory-mapped or read
+    back individually with :func:`~quimb.tensor.tensor_core.load_tn_from_disk`.
+
+    Parameters
+    ----------
+    tn : TensorNetwork
+        The tensor network to save, which can be any subclass, e.g.
+        ``MatrixProductState``, whose extra properties will be restored.
+    fname : str
+        The file to save to. This is written atomically, i.e. via a temporary
+        file, so an interrupted save leaves any existing file intact.
+    compress : bool or int, optional
+        Whether to compress each tensor's data with ``zlib``. If an integer,
+        the compression level to use. Compressed tensors can still be loaded
+        individually, but not memory-mapped.
+    """
+    import json
+    import zlib
+
+    if compress is True:
+        level = zlib.Z_DEFAULT_COMPRESSION
+    else:
+        level = None if compress is False else int(compress)
+
+    tensors = []
+    with atomic_write(fname) as tmp_fname:
+        with open(tmp_fname, 'wb') as f:
+            f.write(_TN_FILE_MAGIC)
+
+            for t in tn:
+                x = np.ascontiguousarray(do('to_numpy', t.data))
+
+                # pad so each array starts on an aligned offset
+                offset = -(-f.tell() // _TN_FILE_ALIGN) * _TN_FILE_ALIGN
+                f.write(b'\x00' * (offset - f.tell()))
+
+                if level is None:
+                    x.tofile(f)
+                else:
+                    f.write(zlib.compress(x, level))
+
+                tensors.append({
+                    'inds': list(t.inds),
+                    'tags': list(t.tags),
+                    'left_inds': (None if t.left_inds is None else
+                                  list(t.left_inds)),
+                    'shape': list(x.shape),
+                    'dtype': x.dtype.str,
+                    'offset': offset,
+                    'nbytes': f.tell() - offset,
+                    'compression': None if level is None else 'zlib',
+                })
+
+            header = json.dumps({
+                'version': _TN_FILE_VERSION,
+                'props': _tn_file_props(tn),
+                'tensors': tensors,
+            }).encode('utf-8')
+
+            f.write(header)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(_TN_FILE_MAGIC)
+
+
+def read_tn_file_info(fname):
+    """Read the description of a tensor network saved with
+    :func:`~quimb.tensor.tensor_core.save_tn_to_disk`, without loading any of
+    the array data.
+
+    Parameters
+    ----------
+    fname : str
+        The file to read.
+
+    Returns
+    -------
+    info : dict
+        With keys ``'props'`` - the tensor network class and properties - and
+        ``'tensors'`` - a list of the indices, tags, shape, dtype and location
+        in the file of each tensor.
+    """
+    import json
+
+    nmagic = len(_TN_FILE_MAGIC)
+
+    with open(fname, 'rb') as f:
+        if f.read(nmagic) != _TN_FILE_MAGIC:
+            raise ValueError(f"'{fname}' is not a saved tensor network.")
+
+        f.seek(-(8 + nmagic), os.SEEK_END)
+        nheader = int.from_bytes(f.read(8), 'little')
+        if f.read(nmagic) != _TN_FILE_MAGIC:
+            raise ValueError(f"'{fname}' is truncated or corrupted.")
+
+        f.seek(-(8 + nmagic + nheader), os.SEEK_END)
+        info = json.loads(f.read(nheader).decode('utf-8'))
+
+    if info['version'] > _TN_FILE_VERSION:
+        raise ValueError(f"'{fname}' was saved with a newer version of the "
+                         "format than this version of quimb supports.")
+
+    return info
+
+
+def _tn_file_tensor_matches(tags, which, t_info):
+    """Check whether the tensor described by ``t_info`` is selected by
+    ``tags`` and ``which``, as for :meth:`TensorNetwork.select`.
+    """
+    inverse = which[0] == '!'
+    combine = {'all': all, 'any': any}[which.lstrip('!')]
+    t_tags = set(t_info['tags'])
+    return combine(tag in t_tags for tag in tags) != inverse
+
+
+def _load_tn_file_tensor(fname, f, t_info, mmap):
+    """Load the data of a single tensor from an open tensor network file.
+    """
+    import zlib
+
+    dtype = np.dtype(t_info['dtype'])
+    shape = tuple(t_info['shape'])
+
+    if t_info['compression'] == 'zlib':
+        f.seek(t_info['offset'])
+        raw = zlib.decompress(f.read(t_info['nbytes']))
+        return np.frombuffer(raw, dtype=dtype).reshape(shape).copy()
+
+    if mmap:
+        # copy-on-write: inplace changes are never written back to the file
+        return np.memmap(fname, dtype=dtype, mode='c', shape=shape,
+                         offset=t_info['offset'])
+
+    f.seek(t_info['offset'])
+    return np.fromfile(f, dtype=dtype, count=prod(shape)).reshape(shape)
+
+
+def load_tn_from_disk(fname, tags=None, which='all', mmap=False):
+    """Load a tensor network saved with
+    :func:`~quimb.tensor.tensor_core.save_tn_to_disk`, or any subset of its
+    tensors.
+
+    Parameters
+    ----------
+    fname : str
+        The file to load.
+    tags : str, int or sequence of str, optional
+        If given, only load the tensors matching these tags, e.g. ``'I3'`` or
+        ``['I3', 'I4']`` with ``which='any'`` to load two sites of an MPS. An
+        integer is interpreted as a site number if the network was saved with
+        a ``structure``.
+    which : {'all', 'any', '!all', '!any'}, optional
+        How to select tensors based on ``tags``, as for
+        :meth:`~quimb.tensor.tensor_core.TensorNetwork.select`.
+    mmap : bool, optional
+        Whether to memory-map the uncompressed array data rather than read it
+        into memory, such that only those parts actually used are paged in.
+        The mapping is copy-on-write, so the file is never modified.
+
+    Returns
+    -------
+    TensorNetwork
+        The loaded network, of the same class as the saved one if every tensor
+        is loaded, else a generic ``TensorNetwork`` inheriting the structure
+        like :meth:`~quimb.tensor.tensor_core.TensorNetwork.select`.
+    """
+    import importlib
+
+    check_opt('which', which, ('all', 'any', '!all', '!any'))
+
+    info = read_tn_file_info(fname)
+    props = info['props']
+    t_infos = info['tensors']
+
+    if tags is not None:
+        if isinstance(tags, Integral):
+            tags = props['structure'].format(tags)
+        tags = tags2set(tags)
+        t_infos = [t_info for t_info in t_infos
+                   if _tn_file_tensor_matches(tags, which, t_info)]
+
+    ts = []
+    with open(fname, 'rb') as f:
+        for t_info in t_infos:
+            data = _load_tn_file_tensor(fname, f, t_info, mmap)
+            ts.append(Tensor(data, inds=t_info['inds'], tags=t_info['tags'],
+                             left_inds=t_info['left_inds']))
+
+    sites = props['sites']
+    if isinstance(sites, dict):
+        sites = range(sites['start'], sites['stop'])
+
+    if len(t_infos) < len(info['tensors']):
+        tn = TensorNetwork(ts, check_collisions=False, virtual=True,
+                           structure=props['structure'],
+                           nsites=props['nsites'],
+                           structure_bsz=props['structure_bsz'])
+        if (tn.structure is not None) and ts:
+            tn.sites = tn.calc_sites()
+        return tn
+
+    tn = TensorNetwork(ts, check_collisions=False, virtual=True,
+                       structure=props['structure'], nsites=props['nsites'],
+                       sites=sites, structure_bsz=props['structure_bsz'])
+
+    cls = getattr(importlib.import_module(props['module']), props['class'])
+    if not (isinstance(cls, type) and issubclass(cls, TensorNetwork)):
+        raise ValueError(f"'{fname}' does not describe a tensor network.")
+    if cls is not TensorNetwork:
+        tn.view_as_(cls, **props['extra_props'])
+
+    return tn
+
+
 class TNLinearOperator(spla.LinearOperator):
     r"""Get a linear operator - something that replicates the matrix-vector
     operation - for an arbitrary uncontracted TensorNetwork, e.g::
@@ -4423,6 +5860,8 @@ class PTensor(Tensor):
     PTensor
     """
 
+    __slots__ = ('_parray', 'is_conj')
+
     def __init__(self, fn, params, inds=(), tags=None,
                  left_inds=None, conj=False):
 
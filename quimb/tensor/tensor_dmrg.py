@@ -1,18 +1,26 @@
 """DMRG-like variational algorithms, but in tensor network language.
 """
 
+import os
+import math
+import shutil
+import weakref
+import tempfile
 import itertools
 import numpy as np
 
-from ..utils import progbar
-from ..core import prod
+from ..utils import progbar, save_to_disk, load_from_disk
+from ..core import prod, _NUM_THREAD_WORKERS
 from ..linalg.base_linalg import eigh, IdentityLinearOperator
+from ..linalg.scipy_linalg import eigs_davidson
 from .tensor_core import (
     Tensor,
     TensorNetwork,
     tensor_contract,
     TNLinearOperator,
     asarray,
+    rand_uuid,
+    _get_contract_executor,
 )
 
 
@@ -27,6 +35,19 @@ def get_default_opts(cyclic=False):
         Method used to compress sites after update.
     bond_compress_cutoff_mode : {'sum2', 'abs', 'rel'}
         How to perform compression truncation.
+    bond_expand_method : {'rand', 'subspace'}
+        In DMRG1, how to grow the bond dimension. ``'rand'`` (the default)
+        pads every bond with noise before each sweep. ``'subspace'`` enriches
+        each site after it is updated with the action of the energy
+        environment on the side being swept from (3S subspace expansion), then
+        truncates back to the current maximum bond dimension. Only ``'rand'``
+        is supported for periodic systems.
+    bond_expand_subspace_factor : float
+        In DMRG1 with subspace expansion, the initial mixing factor with which
+        the enrichment term is added. It is then adapted at each step, being
+        decreased if the truncation of the enriched bond raises the energy by
+        more than a fraction of what the previous optimization gained, and
+        increased otherwise.
     bond_expand_rand_strength : float
         In DMRG1, strength of randomness to expand bonds with. Needed to avoid
         singular matrices after expansion.
@@ -37,19 +58,39 @@ def get_default_opts(cyclic=False):
         previous state, and the overall accuracy comes from multiple sweeps.
     local_eig_ncv : int
         Number of inner eigenproblem lanczos vectors. Smaller can mean quicker.
-    local_eig_backend : {None, 'AUTO', 'SCIPY', 'SLEPC'}
+    local_eig_backend : {None, 'AUTO', 'SCIPY', 'SLEPC', 'DAVIDSON'}
         Which to backend to use for the inner eigenproblem. None or 'AUTO' to
         choose best. Generally ``'SLEPC'`` best if available for large
         problems, but it can't currently handle ``LinearOperator`` Neff as well
-        as ``'lobpcg'``.
+        as ``'lobpcg'``. ``'DAVIDSON'`` uses
+        :func:`~quimb.linalg.scipy_linalg.eigs_davidson`, warm-started not just
+        with the current local state but with the best Ritz vectors found the
+        last time the same site was optimized.
     local_eig_maxiter : int
         Maximum number of inner eigenproblem iterations.
+    local_eig_tol_adaptive : bool
+        Whether to adapt the inner eigenproblem tolerance to the convergence
+        of the energy, rather than solve every sweep to ``local_eig_tol``.
+        Each sweep after the second uses the relative change in energy of the
+        last sweep times ``local_eig_tol_adaptive_factor``, clipped to between
+        ``local_eig_tol_min`` and ``local_eig_tol``. The maximum number of
+        iterations, ``local_eig_maxiter`` or 100 if not set, is increased in
+        proportion to the extra digits required.
+    local_eig_tol_adaptive_factor : float
+        See ``local_eig_tol_adaptive``.
+    local_eig_tol_min : float
+        See ``local_eig_tol_adaptive``.
     local_eig_ham_dense : bool
         Force dense representation of the effective hamiltonian.
     local_eig_EPSType : {'krylovschur', 'gd', 'jd', ...}
         Eigensovler tpye if ``local_eig_backend='slepc'``.
     local_eig_norm_dense : bool
         Force dense representation of the effective norm.
+    env_spill_dir : str or None
+        If given, a directory in which to store memory-mapped copies of the
+        environment tensors not currently needed during each sweep, rather
+        than keeping them all in memory. See
+        :class:`~quimb.tensor.tensor_dmrg.MovingEnvironment`.
     periodic_segment_size : float or int
         How large (as a proportion if float) to make the 'segments' in periodic
         DMRG. During a sweep everything outside this (the 'long way round') is
@@ -83,14 +124,20 @@ def get_default_opts(cyclic=False):
         'default_sweep_sequence': 'R',
         'bond_compress_method': 'svd',
         'bond_compress_cutoff_mode': 'rel' if cyclic else 'sum2',
+        'bond_expand_method': 'rand',
+        'bond_expand_subspace_factor': 1e-3,
         'bond_expand_rand_strength': 1e-6,
         'local_eig_tol': 1e-3,
         'local_eig_ncv': 4,
         'local_eig_backend': None,
         'local_eig_maxiter': None,
+        'local_eig_tol_adaptive': False,
+        'local_eig_tol_adaptive_factor': 0.1,
+        'local_eig_tol_min': 1e-10,
         'local_eig_EPSType': None,
         'local_eig_ham_dense': None,
         'local_eig_norm_dense': None,
+        'env_spill_dir': None,
         'periodic_segment_size': 1 / 2,
         'periodic_compress_method': 'isvd',
         'periodic_compress_norm_eps': 1e-6,
@@ -209,6 +256,15 @@ class MovingEnvironment:
     norm : bool, optional
         If True, treat this ``MovingEnvironment`` as the state overlap, which
         enables a few extra checks.
+    spill_dir : str, optional
+        If given, the contracted environment tensors of every position except
+        the current one and its neighbours are written to memory-mapped files
+        in a temporary sub-directory of ``spill_dir``, see
+        :meth:`~quimb.tensor.tensor_core.Tensor.to_memmap`. They are then only
+        paged back into memory when the environment is moved next to them,
+        allowing sweeps where all the environments would not fit in memory.
+        The files are removed once this ``MovingEnvironment`` is garbage
+        collected.
 
     Notes
     -----
@@ -219,13 +275,22 @@ class MovingEnvironment:
     """
 
     def __init__(self, tn, begin, bsz, *, cyclic=False, segment_callbacks=None,
-                 ssz=0.5, eps=1e-8, method='isvd', max_bond=-1, norm=False):
+                 ssz=0.5, eps=1e-8, method='isvd', max_bond=-1, norm=False,
+                 spill_dir=None):
 
         self.tn = tn.copy(virtual=True)
         self.begin = begin
         self.bsz = bsz
         self.cyclic = cyclic
 
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self.spill_dir = tempfile.mkdtemp(prefix='qtn-env-', dir=spill_dir)
+            weakref.finalize(self, shutil.rmtree, self.spill_dir,
+                             ignore_errors=True)
+        else:
+            self.spill_dir = None
+
         if callable(segment_callbacks):
             self.segment_callbacks = (segment_callbacks,)
         else:
@@ -267,6 +332,31 @@ class MovingEnvironment:
     def site_tag(self, i):
         return self.structure.format(i % self.n)
 
+    def _spill(self, i):
+        """Move the contracted environment tensors at position ``i`` to disk,
+        if ``spill_dir`` was given.
+        """
+        if (self.spill_dir is None) or (i not in self.envs):
+            return
+
+        env = self.envs[i]
+        for tag in ('_LEFT', '_RIGHT'):
+            # the environment might not have both end pieces yet
+            if tag not in env.tag_map:
+                continue
+
+            for t in env.select_tensors(tag):
+                if t.is_memmapped():
+                    continue
+
+                # reuse one file per position and end piece - unlink rather
+                #     than overwrite so that any older tensors still mapping
+                #     the superseded file remain valid
+                fname = os.path.join(self.spill_dir, f"env{i}{tag}.npy")
+                if os.path.exists(fname):
+                    os.remove(fname)
+                t.to_memmap_(fname)
+
     def init_segment(self, begin, start, stop):
         """Initialize the environments in ``range(start, stop)`` so that one
         can start sweeping from the side defined by ``begin``.
@@ -288,6 +378,8 @@ class MovingEnvironment:
                 self.envs[i] = self.envs[i + 1].copy(virtual=True)
                 self.envs[i] |= self.tnc.select(i)
                 self.envs[i] ^= ('_RIGHT', self.site_tag(i + self.bsz))
+                if i + 1 > start + 1:
+                    self._spill(i + 1)
 
             self.envs[start] |= self.tnc['_LEFT']
             self.pos = start
@@ -303,6 +395,8 @@ class MovingEnvironment:
                 self.envs[i] = self.envs[i - 1].copy(virtual=True)
                 self.envs[i] |= self.tnc.select(i + self.bsz - 1)
                 self.envs[i] ^= ('_LEFT', self.site_tag(i - 1))
+                if i - 1 < stop - 2:
+                    self._spill(i - 1)
 
             self.envs[i] |= self.tnc['_RIGHT']
             self.pos = stop - 1
@@ -386,6 +480,9 @@ class MovingEnvironment:
                 ['_LEFT', self.site_tag(i - 1)], which='any')
             self.envs[i] |= new_left ^ all
 
+        # the environment two sites back is no longer needed
+        self._spill(i - 2)
+
     def move_left(self):
         i = (self.pos - 1) % self.n
 
@@ -406,6 +503,9 @@ class MovingEnvironment:
                 ['_RIGHT', self.site_tag(i + self.bsz)], which='any')
             self.envs[i] |= new_right ^ all
 
+        # the environment two sites on is no longer needed
+        self._spill(i + 2)
+
     def move_to(self, i):
         """Move this effective environment to site ``i``.
         """
@@ -563,6 +663,9 @@ class DMRG:
         self.energies = []
         self.local_energies = []
         self.total_energies = []
+        self._eig_subspaces = {}
+        self._subspace_alpha = None
+        self._subspace_prev_en = None
 
         # if cyclic need to keep track of normalization
         if self.cyclic:
@@ -578,11 +681,18 @@ class DMRG:
     def _set_bond_dim_seq(self, bond_dims):
         bds = (bond_dims,) if isinstance(bond_dims, int) else tuple(bond_dims)
         self._bond_dim0 = bds[0]
-        self._bond_dims = itertools.chain(bds, itertools.repeat(bds[-1]))
+        # keep as a plain list so the remaining schedule can be checkpointed
+        self._bond_dims = list(bds)
 
     def _set_cutoff_seq(self, cutoffs):
         bds = (cutoffs,) if isinstance(cutoffs, float) else tuple(cutoffs)
-        self._cutoffs = itertools.chain(bds, itertools.repeat(bds[-1]))
+        self._cutoffs = list(bds)
+
+    @staticmethod
+    def _next_in_seq(seq):
+        """Get the next value of a schedule, repeating the final value.
+        """
+        return seq.pop(0) if len(seq) > 1 else seq[0]
 
     @property
     def energy(self):
@@ -605,21 +715,140 @@ class DMRG:
         elif (direction == 'left') and ((i > 0) or self.cyclic):
             self._k.right_canonize_site(i, bra=self._b)
 
-    def _eigs(self, A, B=None, v0=None):
-        """Find single eigenpair, using all the internal settings.
+    def _expand_after_1site_update(self, direction, i, **compress_opts):
+        r"""Enrich site ``i`` having updated it, then truncate and move the
+        orthogonality center to the next site, ``j``. The site tensor ``M`` is
+        concatenated along the bond to ``j`` with the 'mixing' term ``P`` -
+        the environment on the side being swept from and the hamiltonian
+        acting on ``M``, with the open hamiltonian bond to ``j`` fused into
+        the bond::
+
+            M -> [M, alpha * P],    B -> [B, 0]
+
+        where ``B`` is the tensor at ``j``. This allows the bond dimension to
+        grow, in the directions that the hamiltonian couples the site to (3S
+        subspace expansion), at the cost of a single site update.
+        """
+        k, b = self._k, self._b
+
+        if direction == 'right':
+            j, env = i + 1, self._eff_ham['_LEFT']
+        else:
+            j, env = i - 1, self._eff_ham['_RIGHT']
+
+        if self._subspace_alpha is None:
+            self._subspace_alpha = self.opts['bond_expand_subspace_factor']
+
+        bond, bra_bond = k.bond(i, j), b.bond(i, j)
+        ket_inds = dict(zip(b[i].inds, k[i].inds))
+        bra_inds = dict(zip(k[i].inds, b[i].inds))
+
+        P = tensor_contract(env, self.ham[i], k[i])
+        P.reindex_({ix: ket_inds[ix] for ix in P.inds if ix in ket_inds})
+        P.fuse_({bond: (bond, self.ham.bond(i, j))})
+        P.transpose_like_(k[i])
+
+        # concatenate along the bond, then truncate only to the maximum bond
+        #     dimension, since a cutoff would remove the small mixing term
+        ax = k[i].inds.index(bond)
+        data = np.concatenate((k[i].data, self._subspace_alpha * P.data),
+                              axis=ax)
+        outer_inds = tuple(ix for ix in k[i].inds if ix != bond)
+        U, SV = Tensor(data, k[i].inds).split(
+            left_inds=outer_inds, get='arrays', absorb='right',
+            max_bond=compress_opts.get('max_bond', None),
+            method=compress_opts.get('method', 'svd'),
+            cutoff=1e-14, cutoff_mode='rel')
+
+        k[i].modify(data=U, inds=(*outer_inds, bond))
+        b[i].modify(data=U.conj(),
+                    inds=(*(bra_inds[ix] for ix in outer_inds), bra_bond))
+
+        # the next site is padded with zeros, so only the original part of
+        #     the expanded bond contributes
+        tmp = rand_uuid()
+        SV = Tensor(SV[:, :k[j].ind_size(bond)], inds=(bond, tmp))
+        T = SV.contract(k[j].reindex({bond: tmp}))
+        T.transpose_like_(k[j])
+        k[j].modify(data=T.data)
+        b[j].modify(data=T.data.conj())
+
+    def _adapt_subspace_factor(self, en_before, en_after):
+        """Adapt the subspace expansion mixing factor, given the local energy
+        before and after the current optimization, by comparing the energy
+        raised by truncating the previous expansion with the energy lowered
+        by the previous optimization.
+        """
+        en_prev = self._subspace_prev_en
+        if en_prev is None:
+            return
+
+        de_trunc = en_before - en_prev
+        de_opt = en_after - en_before
+
+        if de_trunc > -0.3 * de_opt:
+            # truncation undoes too much of the optimization
+            self._subspace_alpha *= 0.5
+        else:
+            self._subspace_alpha *= 1.2
+
+        self._subspace_alpha = min(max(self._subspace_alpha, 1e-12), 1.0)
+
+    def _get_local_eig_tol_maxiter(self):
+        """Get the tolerance and maximum iterations for the local eigensolves
+        of the next sweep, possibly adapted to the energy convergence so far.
+        """
+        tol = self.opts['local_eig_tol']
+        maxiter = self.opts['local_eig_maxiter']
+
+        if (not self.opts['local_eig_tol_adaptive']) or (
+                len(self.energies) < 2):
+            return tol, maxiter
+
+        e_prev, e_cur = self.energies[-2:]
+        rel_change = abs(e_cur - e_prev) / max(abs(e_cur), 1e-14)
+        new_tol = rel_change * self.opts['local_eig_tol_adaptive_factor']
+        new_tol = min(tol, max(new_tol, self.opts['local_eig_tol_min']))
+
+        if maxiter is None:
+            maxiter = 100
+        maxiter = int(maxiter * (1 + math.log10(tol / new_tol)))
+
+        return new_tol, maxiter
+
+    def _eigs(self, A, B=None, v0=None, key=None):
+        """Find single eigenpair, using all the internal settings. ``key``
+        identifies the local problem, e.g. the site, so that the davidson
+        solver can store and reuse its subspace.
         """
+        tol, maxiter = self._get_local_eig_tol_maxiter()
+
         # intercept generalized eigen
         backend = self.opts['local_eig_backend']
         if (backend is None) and (B is not None):
             backend = 'LOBPCG'
 
+        if (backend is not None) and (backend.upper() == 'DAVIDSON') and (
+                B is None):
+            subspace = self._eig_subspaces.get(key, None)
+            if (subspace is not None) and (subspace.shape[0] != A.shape[0]):
+                subspace = None
+
+            lk, vk, subspace = eigs_davidson(
+                A, k=1, which=self.which, v0=v0, subspace=subspace,
+                tol=tol, maxiter=maxiter, return_subspace=True)
+
+            if key is not None:
+                self._eig_subspaces[key] = subspace
+            return lk, vk
+
         return eigh(
             A, k=1, B=B, which=self.which, v0=v0,
             backend=backend,
             EPSType=self.opts['local_eig_EPSType'],
             ncv=self.opts['local_eig_ncv'],
-            tol=self.opts['local_eig_tol'],
-            maxiter=self.opts['local_eig_maxiter'],
+            tol=tol,
+            maxiter=maxiter,
             fallback_to_scipy=True)
 
     def print_energy_info(self, Heff=None, loc_gs=None):
@@ -745,12 +974,22 @@ class DMRG:
         # get the old local groundstate to use as initial guess
         loc_gs_old = self._k[i].data.ravel()
 
+        subspace = (self.opts['bond_expand_method'] == 'subspace') and (
+            not self.cyclic)
+        if subspace:
+            # energy of the state as truncated after the previous expansion
+            en_before = np.real(np.vdot(loc_gs_old, Heff @ loc_gs_old) /
+                                np.vdot(loc_gs_old, loc_gs_old))
+
         # find the local energy and groundstate
-        loc_en, loc_gs = self._eigs(Heff, B=Neff, v0=loc_gs_old)
+        loc_en, loc_gs = self._eigs(Heff, B=Neff, v0=loc_gs_old, key=i)
 
         # perform some minor checks and corrections
         loc_en, loc_gs = self.post_check(i, Neff, loc_gs, loc_en, loc_gs_old)
 
+        if subspace:
+            self._adapt_subspace_factor(en_before, loc_en.item())
+
         # insert back into state and all tensor networks viewing it
         loc_gs = loc_gs.A.reshape(dims)
         self._k[i].modify(data=loc_gs)
@@ -764,7 +1003,14 @@ class DMRG:
 
         tot_en = self._eff_ham ^ all
 
-        self._canonize_after_1site_update(direction, i)
+        expand = subspace and (
+            (i < self.n - 1) if direction == 'right' else (i > 0))
+        if expand:
+            self._expand_after_1site_update(direction, i, **compress_opts)
+            self._subspace_prev_en = loc_en.item()
+        else:
+            self._canonize_after_1site_update(direction, i)
+            self._subspace_prev_en = None
 
         return loc_en.item(), tot_en
 
@@ -791,7 +1037,7 @@ class DMRG:
         loc_gs_old = self._k[i].contract(self._k[i + 1]).to_dense(uix)
 
         # find the 2-site local groundstate and energy
-        loc_en, loc_gs = self._eigs(Heff, B=Neff, v0=loc_gs_old)
+        loc_en, loc_gs = self._eigs(Heff, B=Neff, v0=loc_gs_old, key=i)
 
         # perform some minor checks and corrections
         loc_en, loc_gs = self.post_check(i, Neff, loc_gs, loc_en, loc_gs_old)
@@ -890,7 +1136,8 @@ class DMRG:
         env_opts = {'begin': begin, 'bsz': bsz, 'cyclic': self.cyclic,
                     'ssz': self.opts['periodic_segment_size'],
                     'method': self.opts['periodic_compress_method'],
-                    'max_bond': self.opts['periodic_compress_max_bond']}
+                    'max_bond': self.opts['periodic_compress_max_bond'],
+                    'spill_dir': self.opts['env_spill_dir']}
 
         if self.cyclic:
             # setup moving norm environment
@@ -965,6 +1212,97 @@ class DMRG:
             return False
         return abs(self.energies[-2] - self.energies[-1]) < tol
 
+    # ---------------------------- checkpointing ---------------------------- #
+
+    def save_checkpoint(self, fname, **solve_info):
+        """Save the current state, energies, remaining bond dimension and
+        cutoff schedules, and options to ``fname``, such that an interrupted
+        :meth:`~quimb.tensor.tensor_dmrg.DMRG.solve` can be resumed. The file
+        is replaced atomically, so a crash mid-save leaves the previous
+        checkpoint intact.
+
+        Parameters
+        ----------
+        fname : str
+            Where to save the checkpoint.
+        solve_info
+            Extra information about the progress of the current solve.
+        """
+        checkpoint = {
+            'state': self.state,
+            'energies': self.energies,
+            'local_energies': self.local_energies,
+            'total_energies': self.total_energies,
+            'bond_dims': self._bond_dims,
+            'cutoffs': self._cutoffs,
+            'opts': self.opts,
+            'solve_info': solve_info,
+        }
+        if self.cyclic:
+            checkpoint['bond_sizes_ham'] = self.bond_sizes_ham
+            checkpoint['bond_sizes_norm'] = self.bond_sizes_norm
+
+        save_to_disk(checkpoint, fname)
+
+    def load_checkpoint(self, fname):
+        """Load a checkpoint saved with
+        :meth:`~quimb.tensor.tensor_dmrg.DMRG.save_checkpoint`, inserting the
+        saved state into the current optimization in-place. The saved options
+        are restored, apart from any that have been changed from their
+        defaults on this instance, which take precedence.
+
+        Parameters
+        ----------
+        fname : str
+            The checkpoint file.
+
+        Returns
+        -------
+        solve_info : dict
+            The extra information about the progress of the solve.
+        """
+        checkpoint = load_from_disk(fname)
+        psi = checkpoint['state']
+        k, b = self._k, self._b
+
+        if psi.nsites != self.n:
+            raise DMRGError(f"Checkpoint state has {psi.nsites} sites, but "
+                            f"this DMRG instance has {self.n}.")
+
+        # map the saved index names onto the current ones
+        pairs = [(i, i + 1) for i in range(self.n - 1)]
+        if self.cyclic:
+            pairs.append((0, self.n - 1))
+        ind_map = {psi.bond(i, j): k.bond(i, j) for i, j in pairs}
+        ind_map.update({psi.site_ind(i): k.site_ind(i)
+                        for i in range(self.n)})
+        psi.reindex_(ind_map)
+
+        for i in range(self.n):
+            bra_map = dict(zip(k[i].inds, b[i].inds))
+            inds = psi[i].inds
+            k[i].modify(data=psi[i].data, inds=inds)
+            b[i].modify(data=psi[i].data.conj(),
+                        inds=tuple(bra_map[ix] for ix in inds))
+
+        self.energies = checkpoint['energies']
+        self.local_energies = checkpoint['local_energies']
+        self.total_energies = checkpoint['total_energies']
+        self._bond_dims = checkpoint['bond_dims']
+        self._cutoffs = checkpoint['cutoffs']
+
+        # options explicitly set on this instance take precedence
+        defaults = get_default_opts(self.cyclic)
+        user_set = {k: v for k, v in self.opts.items()
+                    if (k not in defaults) or (defaults[k] != v)}
+        self.opts = {**checkpoint['opts'], **user_set}
+
+        if self.cyclic:
+            self.bond_sizes_ham = checkpoint['bond_sizes_ham']
+            self.bond_sizes_norm = checkpoint['bond_sizes_norm']
+
+        return checkpoint['solve_info']
+
     # -------------------------- main solve driver -------------------------- #
 
     def solve(self,
@@ -973,7 +1311,9 @@ class DMRG:
               cutoffs=None,
               sweep_sequence=None,
               max_sweeps=10,
-              verbosity=0):
+              verbosity=0,
+              checkpoint=None,
+              checkpoint_every=1):
         """Solve the system with a sequence of sweeps, up to a certain
         absolute tolerance in the energy or maximum number of sweeps.
 
@@ -992,6 +1332,13 @@ class DMRG:
             The maximum number of sweeps to perform.
         verbosity : {0, 1, 2}, optional
             How much information to print about progress.
+        checkpoint : str, optional
+            If given, a file to periodically save the progress of the solve
+            to. If the file already exists, the solve is first resumed from
+            it, with ``max_sweeps`` counting the sweeps already performed.
+        checkpoint_every : int, optional
+            If ``checkpoint`` is given, how many sweeps to perform between
+            each save.
 
         Returns
         -------
@@ -1010,17 +1357,32 @@ class DMRG:
 
         RLs = itertools.cycle(sweep_sequence)
         previous_LR = '0'
+        start = 0
+        converged = False
+
+        if (checkpoint is not None) and os.path.exists(checkpoint):
+            info = self.load_checkpoint(checkpoint)
+            start, previous_LR = info['sweep'], info['previous_LR']
+            converged = info['converged']
+            if converged:
+                return converged
+            # pick the sweep sequence back up where it was
+            for _ in range(start):
+                next(RLs)
 
-        for _ in range(max_sweeps):
+        for sweep_num in range(start, max_sweeps):
             # Get the next direction, bond dimension and cutoff
-            LR, bd, ctf = next(RLs), next(self._bond_dims), next(self._cutoffs)
+            LR = next(RLs)
+            bd = self._next_in_seq(self._bond_dims)
+            ctf = self._next_in_seq(self._cutoffs)
             self._print_pre_sweep(len(self.energies), LR,
                                   bd, ctf, verbosity=verbosity)
 
             # if last sweep was in opposite direction no need to canonize
             canonize = False if LR + previous_LR in {'LR', 'RL'} else True
             # need to manually expand bond dimension for DMRG1
-            if self.bsz == 1:
+            expand = self.opts['bond_expand_method'] == 'rand'
+            if (self.bsz == 1) and expand:
                 self._k.expand_bond_dimension(
                     bd, bra=self._b,
                     rand_strength=self.opts['bond_expand_rand_strength'])
@@ -1042,11 +1404,18 @@ class DMRG:
             # check convergence
             converged = self._check_convergence(tol)
             self._print_post_sweep(converged, verbosity=verbosity)
-            if converged:
-                break
 
             previous_LR = LR
 
+            if (checkpoint is not None) and (
+                    converged or ((sweep_num + 1) % checkpoint_every == 0)):
+                self.save_checkpoint(checkpoint, sweep=sweep_num + 1,
+                                     previous_LR=previous_LR,
+                                     converged=converged)
+
+            if converged:
+                break
+
         return converged
 
 
@@ -1078,6 +1447,386 @@ class DMRG2(DMRG):
                          which=which, p0=p0, bsz=2)
 
 
+# --------------------------------------------------------------------------- #
+#                              Real-space parallel                            #
+# --------------------------------------------------------------------------- #
+
+def _dmrg2_segment_sweep(kets, hams, L, R, bra_map, direction, eigh_opts,
+                         dense=None, **compress_opts):
+    r"""Perform a single two site DMRG sweep in ``direction`` over an open
+    segment of a chain, with fixed left and right energy environments::
+
+          /o-o-o-o-o-o\
+         L | | | | | | R
+          \H-H-H-H-H-H/
+         L | | | | | | R
+          \o-o-o-o-o-o/
+
+    This only involves tensors and arrays so that it can be run in another
+    thread or process.
+
+    Parameters
+    ----------
+    kets : sequence of Tensor
+        The ket tensors of the segment, with the orthogonality center at the
+        end the sweep starts from.
+    hams : sequence of Tensor
+        The hamiltonian MPO tensors of the segment.
+    L : Tensor or None
+        The left environment, ``None`` if the segment starts the chain.
+    R : Tensor or None
+        The right environment, ``None`` if the segment ends the chain.
+    bra_map : dict[str, str]
+        Mapping of every ket index to the corresponding bra index.
+    direction : {'right', 'left'}
+        Which way to sweep.
+    eigh_opts : dict
+        Supplied to :func:`~quimb.linalg.base_linalg.eigh`.
+    dense : bool, optional
+        Whether to form the dense effective hamiltonian, if ``None`` decide
+        based on its size.
+    compress_opts
+        Supplied to :meth:`~quimb.tensor.tensor_core.Tensor.split`.
+
+    Returns
+    -------
+    kets : list[Tensor]
+        The updated ket tensors.
+    local_energies : list[float]
+        The local energy found at each step.
+    """
+    m = len(kets)
+    kets = [t.copy() for t in kets]
+
+    def add_site(env, i):
+        ts = (env, kets[i], hams[i], kets[i].H.reindex(bra_map))
+        return tensor_contract(*(t for t in ts if t is not None))
+
+    lenvs, renvs = {0: L}, {m: R}
+    if direction == 'right':
+        sweep = range(m - 1)
+        for i in reversed(range(2, m)):
+            renvs[i] = add_site(renvs[i + 1], i)
+    else:
+        sweep = range(m - 2, -1, -1)
+        for i in range(m - 2):
+            lenvs[i + 1] = add_site(lenvs[i], i)
+
+    local_energies = []
+    for i in sweep:
+        TL, TR = kets[i], kets[i + 1]
+        bond, = TL.bonds(TR)
+        uix_L = tuple(ix for ix in TL.inds if ix != bond)
+        uix_R = tuple(ix for ix in TR.inds if ix != bond)
+        uix = uix_L + uix_R
+        lix = tuple(bra_map[ix] for ix in uix)
+        dims = (*(TL.ind_size(ix) for ix in uix_L),
+                *(TR.ind_size(ix) for ix in uix_R))
+
+        ts = tuple(t for t in (lenvs[i], hams[i], hams[i + 1], renvs[i + 2])
+                   if t is not None)
+
+        # choose per step, as the size can change greatly along the segment
+        dense_i = (prod(dims) < 800) if dense is None else dense
+
+        if dense_i:
+            Heff = tensor_contract(*ts).to_dense(lix, uix)
+        else:
+            Heff = TNLinearOperator(ts, left_inds=lix, right_inds=uix,
+                                    ldims=dims, rdims=dims)
+
+        loc_gs_old = TL.contract(TR).to_dense(uix)
+        loc_en, loc_gs = eigh(Heff, k=1, v0=loc_gs_old,
+                              fallback_to_scipy=True, **eigh_opts)
+
+        T_AB = Tensor(loc_gs.A.reshape(dims), uix)
+        dL, dR = T_AB.split(left_inds=uix_L, right_inds=uix_R, get='arrays',
+                            absorb=direction, **compress_opts)
+        TL.modify(data=dL, inds=(*uix_L, bond))
+        TR.modify(data=dR, inds=(bond, *uix_R))
+
+        # move the environment along with the orthogonality center
+        if direction == 'right':
+            lenvs[i + 1] = add_site(lenvs[i], i)
+        else:
+            renvs[i + 1] = add_site(renvs[i + 2], i + 1)
+
+        local_energies.append(loc_en.item())
+
+    return kets, local_energies
+
+
+class DMRGParallel(DMRG2):
+    r"""Real-space parallel two site DMRG [1]. The chain is cut into
+    ``nsegments`` segments which are each swept independently, and
+    concurrently, with environments fixed by the state at the start of the
+    sweep::
+
+           L0       R0  L1       R1  L2       R2
+            o-o-o-o-o    o-o-o-o-o    o-o-o-o-o
+            | | | | |    | | | | |    | | | | |
+            H-H-H-H-H    H-H-H-H-H    H-H-H-H-H
+            | | | | |    | | | | |    | | | | |
+            o-o-o-o-o    o-o-o-o-o    o-o-o-o-o
+              --->         --->         --->
+
+    The left environments are formed from a left canonical copy of the
+    state, ``A``, and the right from a right canonical copy, ``B``. Segment
+    ``j`` then starts in the form ``C[s] B ... B`` (or ``A ... A C[e]`` if
+    sweeping left), where ``C[s]`` is the bond matrix relating the two gauges
+    at bond ``s``. Afterwards, the segments are merged by inserting the
+    inverse bond matrices, ``psi ~ Psi_0 C[s_1]^-1 Psi_1 C[s_2]^-1 ...``.
+    Since this is only approximate, a standard two site update is then
+    performed across each internal boundary in turn. The segment boundaries
+    are also shifted by half a segment every other sweep.
+
+    Only open boundary conditions are supported.
+
+    [1] Stoudenmire, E. M. & White, S. R. Real-space parallel density matrix
+    renormalization group. Phys. Rev. B 87, 155137 (2013).
+
+    Parameters
+    ----------
+    ham : MatrixProductOperator
+        The hamiltonian in MPO form.
+    which : {'SA', 'LA'}, optional
+        Whether to search for smallest or largest real part eigenvectors.
+    bond_dims : int or sequence of int
+        See :class:`DMRG`.
+    cutoffs : float or sequence of float
+        See :class:`DMRG`.
+    p0 : MatrixProductState, optional
+        If given, use as the initial state.
+    nsegments : int, optional
+        How many segments to split the chain into, each should have at least
+        four sites. Defaults to the number of thread workers, or fewer if the
+        chain is short.
+    executor : {'threads', 'processes', 'mpi', None} or executor, optional
+        Where to run the segment sweeps, see
+        :meth:`~quimb.tensor.tensor_core.SlicedContraction.contract`. If
+        ``None``, run them one after another in this process.
+    inv_tol : float, optional
+        Singular values of the bond matrices smaller than this, relative to
+        the largest, are discarded when inverting them.
+    """
+
+    def __init__(self, ham, which='SA', bond_dims=None, cutoffs=1e-8, p0=None,
+                 nsegments=None, executor='threads', inv_tol=1e-10):
+        super().__init__(ham, which=which, bond_dims=bond_dims,
+                         cutoffs=cutoffs, p0=p0)
+
+        if self.cyclic:
+            raise ValueError("``DMRGParallel`` only supports open boundary "
+                             "conditions.")
+
+        if nsegments is None:
+            nsegments = max(1, min(_NUM_THREAD_WORKERS, self.n // 4))
+        if self.n < 4 * nsegments:
+            raise ValueError(f"Can't split {self.n} sites into {nsegments} "
+                             "segments of at least four sites.")
+
+        self.nsegments = nsegments
+        self.executor = executor
+        self.inv_tol = inv_tol
+
+    def get_segments(self, shift=False):
+        """Get the ``(start, stop)`` of each segment, optionally with the
+        internal boundaries shifted right by half a segment.
+        """
+        m = self.nsegments
+        bounds = [round(j * self.n / m) for j in range(m + 1)]
+        if shift:
+            s = round(self.n / (2 * m))
+            bounds = [0, *(b + s for b in bounds[1:-1]), self.n]
+        return tuple(zip(bounds[:-1], bounds[1:]))
+
+    def sweep(self, direction, canonize=True, verbosity=0, **update_opts):
+        """Perform a parallel sweep over every segment, either rightwards
+        (``direction='R'``) or leftwards (``direction='L'``), then merge them
+        and re-optimize across each internal boundary. Like
+        :meth:`DMRG.sweep`, the state is left or right canonized respectively
+        afterwards.
+
+        Parameters
+        ----------
+        direction : {'R', 'L'}
+            Which way each segment is swept.
+        canonize : bool, optional
+            Canonize the state first, not needed if doing alternate sweeps.
+        verbosity : {0, 1, 2}, optional
+            Show a progress bar over the segments and boundaries.
+        update_opts
+            Supplied to :meth:`~quimb.tensor.tensor_core.Tensor.split`.
+        """
+        k, b, H, n = self._k, self._b, self.ham, self.n
+
+        if canonize:
+            {'R': k.right_canonize,
+             'L': k.left_canonize}[direction](bra=b)
+
+        # the state already supplies one gauge, so only canonize for the other
+        kA, kB = k.copy(), k.copy()
+        if direction == 'R':
+            kA.left_canonize(normalize=True)
+            kB[0] /= kB[0].norm()
+        else:
+            kB.right_canonize(normalize=True)
+            kA[-1] /= kA[-1].norm()
+
+        direction = {'R': 'right', 'L': 'left'}[direction]
+        segments = self.get_segments(shift=len(self.energies) % 2)
+        inner = [s for s, _ in segments[1:]]
+        if direction == 'left':
+            inner.reverse()
+
+        bonds = [k.bond(i, i + 1) for i in range(n - 1)]
+        bond_map = {ix: b.bond(i, i + 1) for i, ix in enumerate(bonds)}
+        bra_map = {**bond_map, **{k.site_ind(i): b.site_ind(i)
+                                  for i in range(n)}}
+
+        # energy environments and bond matrices at each segment boundary
+        boundaries = {s for s, _ in segments} | {e for _, e in segments}
+        lenvs, renvs, cmats = {}, {}, {}
+
+        L = C = None
+        for i in range(n):
+            if i in boundaries:
+                lenvs[i], cmats[i] = L, C
+            ts = (L, kA[i], H[i], kA[i].H.reindex(bra_map))
+            L = tensor_contract(*(t for t in ts if t is not None))
+            ts = (C, kA[i].H.reindex(bond_map), kB[i])
+            C = tensor_contract(*(t for t in ts if t is not None))
+
+        R = None
+        for i in reversed(range(n)):
+            if i + 1 in boundaries:
+                renvs[i + 1] = R
+            ts = (R, kB[i], H[i], kB[i].H.reindex(bra_map))
+            R = tensor_contract(*(t for t in ts if t is not None))
+
+        tol, maxiter = self._get_local_eig_tol_maxiter()
+        eigh_opts = {
+            'which': self.which,
+            'backend': self.opts['local_eig_backend'],
+            'EPSType': self.opts['local_eig_EPSType'],
+            'ncv': self.opts['local_eig_ncv'],
+            'tol': tol,
+            'maxiter': maxiter,
+        }
+
+        args = []
+        for s, e in segments:
+            if direction == 'right':
+                kets = [kB[i] for i in range(s, e)]
+                if s > 0:
+                    ix = bonds[s - 1]
+                    kets[0] = cmats[s].contract(kets[0]).reindex(
+                        {bond_map[ix]: ix})
+            else:
+                kets = [kA[i] for i in range(s, e)]
+                if e < n:
+                    ix = bonds[e - 1]
+                    kets[-1] = kets[-1].reindex(
+                        {ix: bond_map[ix]}).contract(cmats[e])
+
+            args.append((kets, [H[i] for i in range(s, e)],
+                         lenvs[s], renvs[e], bra_map, direction, eigh_opts,
+                         self.opts['local_eig_ham_dense']))
+
+        if verbosity:
+            pbar = progbar(ncols=80, total=len(args) + len(inner))
+
+        if self.executor is None:
+            results = []
+            for a in args:
+                results.append(_dmrg2_segment_sweep(*a, **update_opts))
+                if verbosity:
+                    pbar.update()
+        else:
+            pool, shutdown = _get_contract_executor(self.executor)
+            try:
+                fs = [pool.submit(_dmrg2_segment_sweep, *a, **update_opts)
+                      for a in args]
+                results = []
+                for f in fs:
+                    results.append(f.result())
+                    if verbosity:
+                        pbar.update()
+            finally:
+                if shutdown:
+                    pool.shutdown()
+
+        local_ens = []
+        for (s, e), (kets, seg_ens) in zip(segments, results):
+            if s > 0:
+                # join to the previous segment via the inverse bond matrix
+                ix = bonds[s - 1]
+                Cinv = np.linalg.pinv(cmats[s].to_dense([bond_map[ix]], [ix]),
+                                      rcond=self.inv_tol)
+                V = Tensor(Cinv, inds=(bond_map[ix], ix))
+                kets[0] = V.contract(kets[0]).reindex({bond_map[ix]: ix})
+
+            for i, t in zip(range(s, e), kets):
+                k[i].modify(data=t.data, inds=t.inds)
+                b[i].modify(data=t.data.conj(),
+                            inds=tuple(bra_map[ix] for ix in t.inds))
+
+            local_ens.extend(seg_ens)
+
+        # the merged state is only approximate around the internal boundaries,
+        #     so follow with a standard two site update across each of them
+        if inner:
+            k.left_canonize(stop=inner[0] - 1, bra=b)
+            k.right_canonize(stop=inner[0], bra=b)
+
+        for j, s in enumerate(inner):
+            if j > 0:
+                # move the orthogonality center to the next boundary
+                if direction == 'right':
+                    k.left_canonize(start=inner[j - 1], stop=s - 1, bra=b)
+                else:
+                    k.right_canonize(start=inner[j - 1] - 1, stop=s, bra=b)
+
+            L = R = None
+            for i in range(s - 1):
+                ts = (L, k[i], H[i], k[i].H.reindex(bra_map))
+                L = tensor_contract(*(t for t in ts if t is not None))
+            for i in reversed(range(s + 1, n)):
+                ts = (R, k[i], H[i], k[i].H.reindex(bra_map))
+                R = tensor_contract(*(t for t in ts if t is not None))
+
+            kets, seg_ens = _dmrg2_segment_sweep(
+                (k[s - 1], k[s]), (H[s - 1], H[s]), L, R, bra_map, direction,
+                eigh_opts, self.opts['local_eig_ham_dense'], **update_opts)
+
+            for i, t in zip((s - 1, s), kets):
+                k[i].modify(data=t.data, inds=t.inds)
+                b[i].modify(data=t.data.conj(),
+                            inds=tuple(bra_map[ix] for ix in t.inds))
+
+            local_ens.extend(seg_ens)
+            if verbosity:
+                pbar.update()
+
+        if verbosity:
+            pbar.close()
+
+        # finish canonized like a standard sweep, and undo any truncation
+        if direction == 'right':
+            k.left_canonize(start=inner[-1] if inner else 0, bra=b)
+            k.normalize(bra=b, insert=-1)
+        else:
+            k.right_canonize(start=inner[-1] - 1 if inner else n - 1, bra=b)
+            k.normalize(bra=b, insert=0)
+
+        tot_en = self.TN_energy ^ ...
+
+        self.local_energies.append(tuple(local_ens))
+        self.total_energies.append((tot_en,))
+
+        return tot_en
+
+
 # --------------------------------------------------------------------------- #
 #                                    DMRGX                                    #
 # --------------------------------------------------------------------------- #
@@ -1134,6 +1883,7 @@ class DMRGX(DMRG):
             'bond_compress_method': 'svd',
             'bond_compress_cutoff_mode': 'sum2',
             'default_sweep_sequence': 'RRLL',
+            'bond_expand_method': 'rand',
             'bond_expand_rand_strength': 1e-9,
         }
 
@@ -3,6 +3,7 @@
 from numbers import Integral
 
 import numpy as np
+import scipy.linalg as scla
 
 from ..core import make_immutable, ikron
 from ..gen.operators import spin_operator, eye, _gen_mbl_random_factors
@@ -868,6 +869,150 @@ class SpinHam:
 
         return NNI(H2=H2s, H1=H1s, n=n, cyclic=self.cyclic, **nni_opts)
 
+    def build_mpo_evolution(self, n, dt, method='WII', imag=False,
+                            **mpo_opts):
+        """Build an approximate time evolution operator MPO of this spin
+        hamiltonian of size ``n``. See also :func:`MPO_evolution_operator`.
+        """
+        return MPO_evolution_operator(self.build_mpo(n, **mpo_opts), dt,
+                                      method=method, imag=imag)
+
+
+def _evolution_operator_element(D, F, S, A, tau):
+    """Compute a single bond element of the :math:`W^{II}` evolution MPO,
+    by exponentiating the local generator with a hard-core boson for each of
+    the left and right bonds, and taking the element where both have been
+    created. The factor of ``tau`` for each interaction is put entirely on the
+    starting operator, ``S``, so that the elements remain real for real
+    ``tau``. ``F`` and ``S`` (and then ``A``) can be ``None`` to signify the
+    respective bond is idle.
+    """
+    d = D.shape[0]
+    I2 = np.eye(2)
+    up = np.array([[0.0, 0.0], [1.0, 0.0]])
+
+    M = np.kron(tau * D, np.kron(I2, I2))
+    if F is not None:
+        M = M + np.kron(F, np.kron(up, I2))
+    if S is not None:
+        M = M + tau * np.kron(S, np.kron(I2, up))
+    if A is not None:
+        M = M + np.kron(A, np.kron(up, up))
+
+    ia, ib = int(F is not None), int(S is not None)
+    return scla.expm(M).reshape(d, 2, 2, d, 2, 2)[:, ia, ib, :, 0, 0]
+
+
+def MPO_evolution_operator(H, dt, method='WII', imag=False, **mpo_opts):
+    r"""Build an approximate time evolution operator, :math:`e^{-i H \delta
+    t}`, directly from the MPO hamiltonian ``H``, using the :math:`W^{I}` or
+    :math:`W^{II}` constructions of [1]. Unlike a Trotter decomposition the
+    interactions can have any range - as long as ``H`` is in the lower
+    triangular form generated by :meth:`SpinHam.build_mpo`, with each site
+    tensor (as a matrix over its left and right bonds) looking like::
+
+        [[ I,   0,   0 ],
+         [ F,   A,   0 ],
+         [ D,   S,   I ]]
+
+    Here ``D`` is the single site term, ``S`` and ``F`` respectively start and
+    finish interactions, and ``A`` continues them. The evolution operator has
+    a bond dimension one less than ``H``. Both methods have an error of order
+    ``dt**2`` per step, but :math:`W^{II}` exactly captures many more of the
+    higher order terms and is generally much more accurate.
+
+    Parameters
+    ----------
+    H : MatrixProductOperator
+        The hamiltonian, with open boundary conditions.
+    dt : float
+        The time step.
+    method : {'WII', 'WI'}, optional
+        Which construction to use.
+    imag : bool, optional
+        If ``True``, build the imaginary time evolution operator,
+        :math:`e^{-H \delta t}`, instead.
+    mpo_opts
+        Supplied to :class:`~quimb.tensor.tensor_1d.MatrixProductOperator`,
+        by default the index and tag ids of ``H`` are used.
+
+    Returns
+    -------
+    MatrixProductOperator
+
+    References
+    ----------
+    .. [1] M. P. Zaletel, R. S. K. Mong, C. Karrasch, J. E. Moore and F.
+       Pollmann, "Time-evolving a matrix product state with long-ranged
+       interactions", Phys. Rev. B 91, 165112 (2015).
+    """
+    if method not in ('WI', 'WII'):
+        raise ValueError(f"``method`` should be 'WI' or 'WII', got {method}.")
+    if H.cyclic:
+        raise ValueError("Only open boundary condition hamiltonians are "
+                         "supported.")
+
+    tau = -dt if imag else -1j * dt
+    n = H.nsites
+
+    def gen_arrays():
+        for i in range(n):
+            lix = (H.bond(i - 1, i),) if i > 0 else ()
+            rix = (H.bond(i, i + 1),) if i < n - 1 else ()
+            W = np.asarray(H[i].transpose(*lix, *rix, H.upper_ind(i),
+                                          H.lower_ind(i)).data)
+
+            # add dummy bonds at the ends, where the left end is always
+            #     'not started', and the right end always 'done'
+            if i == 0:
+                W = W[None, ...]
+            if i == n - 1:
+                W = W[:, None, ...]
+
+            BL, BR, d, _ = W.shape
+            ns = BL - 1
+            mid_L = range(1, BL - 1) if i > 0 else range(0)
+            mid_R = range(1, BR - 1) if i < n - 1 else range(0)
+
+            if (i < n - 1) and not np.allclose(W[ns, BR - 1], np.eye(d)):
+                raise ValueError("``H`` should be in the lower triangular "
+                                 "form generated by ``SpinHam.build_mpo``.")
+
+            D = W[ns, 0]
+            Fs = [None] + [W[a, 0] for a in mid_L]
+            Ss = [None] + [W[ns, b] for b in mid_R]
+
+            Wn = np.empty((len(Fs), len(Ss), d, d), dtype=complex)
+            for a, F in enumerate(Fs):
+                for b, S in enumerate(Ss):
+                    A = (None if (F is None) or (S is None) else
+                         W[mid_L[a - 1], mid_R[b - 1]])
+
+                    if method == 'WII':
+                        Wn[a, b] = _evolution_operator_element(D, F, S, A, tau)
+                    elif F is None and S is None:
+                        Wn[a, b] = np.eye(d) + tau * D
+                    elif F is None:
+                        Wn[a, b] = tau * S
+                    elif S is None:
+                        Wn[a, b] = F
+                    else:
+                        Wn[a, b] = A
+
+            # remove the dummy bonds again
+            if i == n - 1:
+                Wn = Wn[:, 0]
+            if i == 0:
+                Wn = Wn[0]
+
+            yield maybe_make_real(Wn)
+
+    mpo_opts.setdefault('upper_ind_id', H.upper_ind_id)
+    mpo_opts.setdefault('lower_ind_id', H.lower_ind_id)
+    mpo_opts.setdefault('site_tag_id', H.site_tag_id)
+
+    return MatrixProductOperator(gen_arrays(), shape='lrud', **mpo_opts)
+
 
 def _ham_ising(j=1.0, bx=0.0, *, S=1 / 2, cyclic=False):
     H = SpinHam(S=1 / 2, cyclic=cyclic)
@@ -0,0 +1,342 @@
+"""Time-dependent variational principle (TDVP) evolution of matrix product
+states.
+"""
+
+import numpy as np
+
+import quimb as qu
+from ..core import prod
+from ..linalg.base_linalg import expm_multiply
+from .tensor_core import Tensor, TNLinearOperator, rand_uuid
+from .tensor_dmrg import MovingEnvironment, parse_2site_inds_dims
+
+
+class TDVP:
+    r"""Class implementing time evolution of a matrix product state with a
+    matrix product operator hamiltonian using the time-dependent variational
+    principle (TDVP) [1], in its second order, symmetrically split projector
+    form. Each step consists of a sweep rightwards and then leftwards, each of
+    half the time step. At each position the local state is evolved forwards
+    under the effective hamiltonian, then, after moving the orthogonality
+    centre on, the bond matrix (``bsz=1``) or single site (``bsz=2``) left
+    behind is evolved backwards::
+
+        bsz=1:  >->->-A-<-<-<      -->      >->->->-C-<-<-<     -->   ...
+                | | | | | | |   exp(-iHdt)   | | | |   | | |   exp(+iKdt)
+                H-H-H-H-H-H-H                H-H-H-H---H-H-H
+
+    Unlike :class:`~quimb.tensor.tensor_tebd.TEBD`, the hamiltonian can have
+    arbitrary range and there is no Trotter error, only the projection error,
+    which vanishes as the bond dimension grows. Single site TDVP conserves
+    energy and norm exactly but cannot grow the bond dimension, two site TDVP
+    grows the bond dimension according to ``split_opts``.
+
+    [1] Jutho Haegeman, Christian Lubich, Ivan Oseledets, Bart Vandereycken,
+    and Frank Verstraete, Unifying time evolution and optimization with matrix
+    product states, PRB 94, 165116 (2016).
+
+    Parameters
+    ----------
+    p0 : MatrixProductState
+        Initial state.
+    H : MatrixProductOperator
+        The hamiltonian, e.g. from
+        :meth:`~quimb.tensor.tensor_gen.SpinHam.build_mpo`.
+    dt : float, optional
+        Default time step.
+    t0 : float, optional
+        Initial time. Defaults to 0.0.
+    bsz : {1, 2}, optional
+        The number of sites to evolve at once.
+    split_opts : dict, optional
+        Compression options applied when splitting the evolved two site
+        tensors, if ``bsz=2``, see
+        :func:`~quimb.tensor.tensor_core.tensor_split`.
+    expm_opts : dict, optional
+        Options for the local exponentials, supplied to
+        :func:`~quimb.linalg.base_linalg.expm_multiply`. Defaults to the
+        Krylov backend,
+        :func:`~quimb.linalg.scipy_linalg.expm_multiply_krylov`.
+    local_ham_dense : bool, optional
+        Whether to form the local effective hamiltonians densely, rather than
+        as a :class:`~quimb.tensor.tensor_core.TNLinearOperator`. Defaults to
+        only doing so if they are small.
+    imag : bool, optional
+        Enable imaginary time evolution. Defaults to false.
+    progbar : bool, optional
+        Whether to show a progress bar when evolving.
+
+    See Also
+    --------
+    quimb.tensor.tensor_tebd.TEBD, quimb.tensor.tensor_dmrg.DMRG
+    """
+
+    def __init__(self, p0, H, dt=None, t0=0.0, bsz=2, split_opts=None,
+                 expm_opts=None, local_ham_dense=None, imag=False,
+                 progbar=True):
+        if p0.cyclic or H.cyclic:
+            raise ValueError("TDVP only supports open boundary conditions.")
+        if bsz not in (1, 2):
+            raise ValueError("``bsz`` should be 1 or 2.")
+
+        self.n = H.nsites
+        self.bsz = bsz
+
+        # create internal states and ham, as in DMRG
+        self._k = p0.copy()
+        self._b = self._k.H
+        self.ham = H.copy()
+        self._k.add_tag("_KET")
+        self._b.add_tag("_BRA")
+        self.ham.add_tag("_HAM")
+        self._k.align_(self.ham, self._b)
+        self.TN_energy = self._b | self.ham | self._k
+
+        # rightwards sweeps start with the orthogonality centre at site 0
+        self._k.right_canonize(bra=self._b)
+
+        self.t0 = self.t = t0
+        self.dt = dt
+        self.imag = imag
+        self.progbar = progbar
+        self.split_opts = {} if split_opts is None else dict(split_opts)
+        self.expm_opts = {'backend': 'KRYLOV'}
+        if expm_opts is not None:
+            self.expm_opts.update(expm_opts)
+        self.local_ham_dense = local_ham_dense
+
+    @property
+    def pt(self):
+        """The MPS state of the system at the current time.
+        """
+        copy = self._k.copy()
+        copy.drop_tags('_KET')
+        return copy
+
+    @property
+    def energy(self):
+        """The energy of the current state.
+        """
+        return (self.TN_energy ^ ...).real
+
+    def _evolve_local(self, tn, lix, uix, dims, x, sgn, tau):
+        """Evolve ``x`` by ``expm(sgn * -i * tau * Heff)``, where ``Heff`` is
+        the local effective hamiltonian with lower indices ``lix`` and upper
+        indices ``uix`` defined by the tensors of ``tn`` tagged ``'_HAM'``.
+        """
+        dense = self.local_ham_dense
+        if dense is None:
+            dense = prod(dims) < 800
+
+        if dense:
+            Heff = (tn.select('_HAM') ^ all).to_dense(lix, uix)
+        else:
+            Heff = TNLinearOperator(tn['_HAM'], ldims=dims, rdims=dims,
+                                    left_inds=lix, right_inds=uix)
+
+        factor = -sgn * tau * (1.0 if self.imag else 1.0j)
+        x = expm_multiply(factor * Heff, np.asarray(x).reshape(-1),
+                          **self.expm_opts)
+
+        if self.imag and sgn > 0:
+            x = x / np.linalg.norm(x)
+
+        return np.asarray(x).reshape(dims)
+
+    def _evolve_site(self, tn, i, sgn, tau):
+        """Evolve the single site ``i`` in-place, using the tensors of ``tn``
+        as its environment.
+        """
+        dims = self._k[i].shape
+        x = self._evolve_local(tn, self._b[i].inds, self._k[i].inds, dims,
+                               self._k[i].data, sgn, tau)
+        self._k[i].modify(data=x)
+        self._b[i].modify(data=x.conj())
+
+    def _evolve_bond(self, env, i, j, tau):
+        """Having evolved site ``i``, split off its bond matrix towards site
+        ``j``, evolve that backwards in time, then absorb it into site ``j``.
+        The environment ``env`` should have ``i`` as its only open site.
+        """
+        k, b = self._k, self._b
+        bond, bra_bond = k.bond(i, j), b.bond(i, j)
+        bra_inds = dict(zip(k[i].inds, b[i].inds))
+
+        outer_inds = tuple(ix for ix in k[i].inds if ix != bond)
+        Q, C = k[i].split(left_inds=outer_inds, method='qr', get='arrays')
+        k[i].modify(data=Q, inds=(*outer_inds, bond))
+        b[i].modify(data=Q.conj(),
+                    inds=(*(bra_inds[ix] for ix in outer_inds), bra_bond))
+
+        # the environment of the bond matrix: the side being swept from, now
+        #     including the isometry ``Q``, and the side being swept to
+        side, other = {
+            True: ('_LEFT', '_RIGHT'), False: ('_RIGHT', '_LEFT')}[j > i]
+        site_tag = self.ME_eff_ham.site_tag(i)
+        E = env.select((side, site_tag), which='any') ^ all
+        lk, lb = rand_uuid(), rand_uuid()
+        E.reindex_({bond: lk, bra_bond: lb})
+        tn = E | env[other]
+
+        C = self._evolve_local(tn, (lb, bra_bond), (lk, bond), C.shape, C,
+                               -1, tau)
+
+        # absorb into the next site
+        tmp = rand_uuid()
+        T = Tensor(C, inds=(bond, tmp)).contract(k[j].reindex({bond: tmp}))
+        T.transpose_like_(k[j])
+        k[j].modify(data=T.data)
+        b[j].modify(data=T.data.conj())
+
+    def _update_local_state_1site(self, i, direction, tau):
+        env = self.ME_eff_ham()
+        self._evolve_site(env, i, +1, tau)
+
+        j = i + 1 if direction == 'right' else i - 1
+        if 0 <= j < self.n:
+            self._evolve_bond(env, i, j, tau)
+
+    def _update_local_state_2site(self, i, direction, tau):
+        k, b = self._k, self._b
+        env = self.ME_eff_ham()
+
+        dims, lix_L, lix_R, lix, uix_L, uix_R, uix, l_bond_ind, u_bond_ind = \
+            parse_2site_inds_dims(k, b, i)
+
+        # evolve the two site tensor forwards
+        x = k[i].contract(k[i + 1]).to_dense(uix)
+        x = self._evolve_local(env, lix, uix, dims, x, +1, tau)
+
+        # split, moving the orthogonality centre in ``direction``
+        T_AB = Tensor(x.reshape(dims), uix)
+        L, R = T_AB.split(left_inds=uix_L, get='arrays', absorb=direction,
+                          right_inds=uix_R, **self.split_opts)
+        k[i].modify(data=L, inds=(*uix_L, u_bond_ind))
+        b[i].modify(data=L.conj(), inds=(*lix_L, l_bond_ind))
+        k[i + 1].modify(data=R, inds=(u_bond_ind, *uix_R))
+        b[i + 1].modify(data=R.conj(), inds=(l_bond_ind, *lix_R))
+
+        # evolve the new orthogonality centre backwards, unless at the end
+        fmt = self.ME_eff_ham.site_tag
+        if (direction == 'right') and (i < self.n - 2):
+            self._evolve_site(env ^ ('_LEFT', fmt(i)), i + 1, -1, tau)
+        elif (direction == 'left') and (i > 0):
+            self._evolve_site(env ^ ('_RIGHT', fmt(i + 1)), i, -1, tau)
+
+    def _update_local_state(self, i, **update_opts):
+        """Move envs to site ``i`` and dispatch to the correct local updater.
+        """
+        self.ME_eff_ham.move_to(i)
+
+        return {
+            1: self._update_local_state_1site,
+            2: self._update_local_state_2site,
+        }[self.bsz](i, **update_opts)
+
+    def sweep(self, direction, tau):
+        """Perform a single sweep of local evolutions, each of time ``tau``,
+        either rightwards (``'right'``), which requires and leaves the state
+        in right and left canonical form respectively, or vice versa
+        leftwards (``'left'``).
+
+        Parameters
+        ----------
+        direction : {'right', 'left'}
+            Which direction to sweep.
+        tau : float
+            The time to evolve each local state by.
+        """
+        n, bsz = self.n, self.bsz
+
+        begin, sweep = {
+            'right': ('left', range(0, n - bsz + 1)),
+            'left': ('right', range(n - bsz, -1, -1)),
+        }[direction]
+
+        self.ME_eff_ham = MovingEnvironment(self.TN_energy, begin=begin,
+                                            bsz=bsz)
+        for i in sweep:
+            self._update_local_state(i, direction=direction, tau=tau)
+
+    def step(self, dt=None, progbar=None):
+        """Perform a single, second order, step of time ``dt``, which defaults
+        to ``self.dt``.
+        """
+        dt = self.dt if dt is None else dt
+        if not dt:
+            raise ValueError("Must set ``dt``.")
+
+        self.sweep('right', dt / 2)
+        self.sweep('left', dt / 2)
+        self.t += dt
+
+        if progbar is not None:
+            progbar.cupdate(self.t)
+            self._set_progbar_desc(progbar)
+
+    TARGET_TOL = 1e-13  # tolerance to have 'reached' target time
+
+    def update_to(self, T, dt=None, progbar=None):
+        """Update the state to time ``T``.
+
+        Parameters
+        ----------
+        T : float
+            The time to evolve to.
+        dt : float, optional
+            Time step to use, defaults to ``self.dt``.
+        progbar : bool, optional
+            Manually turn the progress bar off.
+        """
+        if T < self.t - self.TARGET_TOL:
+            raise NotImplementedError
+
+        dt = self.dt if dt is None else dt
+        if not dt:
+            raise ValueError("Must set ``dt``.")
+
+        progbar = self.progbar if (progbar is None) else progbar
+        progbar = qu.utils.continuous_progbar(self.t, T) if progbar else None
+
+        while self.t < T - self.TARGET_TOL:
+            # take a shorter step if within one step of final time
+            self.step(dt=min(dt, T - self.t), progbar=progbar)
+
+        if progbar:
+            progbar.close()
+
+    def _set_progbar_desc(self, progbar):
+        msg = f"t={self.t:.4g}, max-bond={self._k.max_bond()}"
+        progbar.set_description(msg)
+
+    def at_times(self, ts, dt=None, progbar=None):
+        """Generate the time evolved state at each time in ``ts``.
+
+        Parameters
+        ----------
+        ts : sequence of float
+            The times to evolve to and yield the state at.
+        dt : float, optional
+            Time step to use, defaults to ``self.dt``.
+        progbar : bool, optional
+            Manually turn the progress bar off.
+
+        Yields
+        ------
+        pt : MatrixProductState
+            The state at each of the times in ``ts``. This is a copy of
+            internal state used, so inplace changes can be made to it.
+        """
+        ts = sorted(ts)
+
+        progbar = self.progbar if (progbar is None) else progbar
+        if progbar:
+            ts = qu.utils.progbar(ts)
+
+        for t in ts:
+            self.update_to(t, dt=dt, progbar=False)
+
+            if progbar:
+                self._set_progbar_desc(ts)
+
+            yield self.pt
@@ -1,6 +1,13 @@
+import os
+import math
+import warnings
+
 import numpy as np
+import scipy.linalg as scla
 
 import quimb as qu
+from .decomp import _trim_singular_vals
+from .tensor_core import _CUTOFF_MODES
 
 
 class NNI:
@@ -171,6 +178,163 @@ class NNI:
         return f"<NNI(n={self.n}, cyclic={self.cyclic})>"
 
 
+def _mps_to_vidal_arrays(psi):
+    """Convert the OBC matrix product state ``psi`` into raw arrays suitable
+    for :func:`_apply_gate_layer_vidal`.
+
+    Returns
+    -------
+    Bs : list[array]
+        The right canonical site arrays, each with shape ``(l, p, r)``, dummy
+        bonds of size 1 being inserted at the ends.
+    lams : list[array]
+        The singular values of each bond, such that ``lams[i]`` lives between
+        site ``i - 1`` and site ``i``. ``lams[0]`` and ``lams[-1]`` are the
+        trivial boundary values.
+    inds : list[tuple[str]]
+        The indices of each site of ``psi``, in the order they should be
+        given to the data of ``Bs`` with the dummy bonds removed.
+    """
+    N = psi.nsites
+
+    Bs, inds = [], []
+    for i in range(N):
+        lix = psi.bond(i - 1, i) if i > 0 else None
+        rix = psi.bond(i, i + 1) if i < N - 1 else None
+        ix = tuple(x for x in (lix, psi.site_ind(i), rix) if x is not None)
+        data = np.asarray(psi[i].transpose(*ix).data)
+        dl = data.shape[0] if i > 0 else 1
+        dr = data.shape[-1] if i < N - 1 else 1
+        Bs.append(data.reshape(dl, -1, dr))
+        inds.append(ix)
+
+    lams = _canonize_vidal_arrays(Bs)
+    return Bs, lams, inds
+
+
+def _canonize_vidal_arrays(Bs):
+    """Bring the raw site arrays ``Bs``, each with shape ``(l, p, r)``, into
+    normalized right canonical form, inplace, returning the singular values of
+    every bond (see :func:`_mps_to_vidal_arrays`).
+    """
+    N = len(Bs)
+
+    # left canonize ...
+    for i in range(N - 1):
+        dl, d, dr = Bs[i].shape
+        Q, R = np.linalg.qr(Bs[i].reshape(dl * d, dr))
+        Bs[i] = Q.reshape(dl, d, -1)
+        Bs[i + 1] = np.tensordot(R, Bs[i + 1], 1)
+
+    # ... then sweep back with SVDs to find every bonds singular values
+    lams = [None] * (N + 1)
+    for i in range(N - 1, 0, -1):
+        dl, d, dr = Bs[i].shape
+        U, s, VH = np.linalg.svd(Bs[i].reshape(dl, d * dr),
+                                 full_matrices=False)
+        Bs[i] = VH.reshape(-1, d, dr)
+        Bs[i - 1] = np.tensordot(Bs[i - 1], U * s.reshape(1, -1), 1)
+        lams[i] = s
+
+    nrm = np.linalg.norm(Bs[0])
+    Bs[0] = Bs[0] / nrm
+    for i in range(1, N):
+        lams[i] = lams[i] / nrm
+    lams[0] = lams[N] = np.ones(1)
+
+    return lams
+
+
+def _apply_gate_vidal(Bs, lams, i, G, cutoff=1e-10, cutoff_mode=2,
+                      max_bond=-1):
+    """Apply the two site gate ``G``, with shape ``(p1, p2, p1, p2)``, to
+    sites ``i`` and ``i + 1`` of the right canonical arrays ``Bs`` with bond
+    singular values ``lams``, updating ``Bs[i]``, ``Bs[i + 1]`` and
+    ``lams[i + 1]`` inplace. Since only these are touched (and ``lams[i]`` is
+    only read) gates acting on disjoint bonds can be applied concurrently.
+    The state is kept normalized.
+
+    The update assumes ``G`` is unitary, otherwise the result is still the
+    correct state but the arrays are no longer exactly canonical, and should
+    be restored with :func:`_canonize_vidal_arrays`.
+    """
+    B1, B2 = Bs[i], Bs[i + 1]
+    dl, d1, _ = B1.shape
+    _, d2, dr = B2.shape
+
+    # contract the two sites and gate -> (p1, p2, l, r)
+    theta = np.tensordot(B1, B2, 1)
+    theta = np.tensordot(G, theta, ((2, 3), (1, 2)))
+    theta = theta.transpose(2, 0, 1, 3).reshape(dl * d1, d2 * dr)
+
+    # absorb the singular values to the left to get the true schmidt values
+    x = theta * np.repeat(lams[i], d1).reshape(-1, 1)
+    try:
+        _, s, VH = np.linalg.svd(x, full_matrices=False)
+    except np.linalg.LinAlgError:  # pragma: no cover
+        _, s, VH = scla.svd(x, full_matrices=False, lapack_driver='gesvd')
+
+    n_chi = s.size
+    if cutoff > 0.0:
+        n_chi = _trim_singular_vals(s, s.dtype.type(cutoff), cutoff_mode)
+    if max_bond > 0:
+        n_chi = min(n_chi, max_bond)
+    if n_chi < s.size:
+        s, VH = s[:n_chi], VH[:n_chi, :]
+
+    nrm = np.linalg.norm(s)
+
+    # Hastings' trick: the new left site is G.B1.B2.B2'^H which avoids
+    #     dividing by (possibly tiny) singular values of the left bond
+    Bs[i] = (theta @ VH.conj().T).reshape(dl, d1, n_chi) / nrm
+    Bs[i + 1] = VH.reshape(n_chi, d2, dr)
+    lams[i + 1] = s / nrm
+
+
+def _apply_gate_layer_vidal(Bs, lams, gates, cutoff=1e-10, cutoff_mode='rel',
+                            max_bond=None, executor=None):
+    """Apply a whole layer of non-overlapping two site gates to the raw
+    right canonical arrays ``Bs`` and bond singular values ``lams`` (see
+    :func:`_mps_to_vidal_arrays`), inplace.
+
+    Parameters
+    ----------
+    Bs : list[array]
+        The right canonical site arrays, each with shape ``(l, p, r)``.
+    lams : list[array]
+        The singular values of each bond, including the trivial boundaries.
+    gates : dict[int, array]
+        Mapping of the left site, ``i``, to the gate to apply to sites
+        ``(i, i + 1)``. No two gates should act on the same site.
+    cutoff : float, optional
+        Singular value cutoff, see
+        :func:`~quimb.tensor.tensor_core.tensor_split`.
+    cutoff_mode : {'rel', 'abs', 'sum2', 'rsum2', 'sum1', 'rsum1'}, optional
+        How to apply the cutoff, see
+        :func:`~quimb.tensor.tensor_core.tensor_split`.
+    max_bond : int, optional
+        Maximum bond dimension.
+    executor : executor, optional
+        If given, a thread based pool with which to apply the gates
+        concurrently.
+    """
+    opts = {
+        'cutoff': {None: -1.0}.get(cutoff, cutoff),
+        'cutoff_mode': _CUTOFF_MODES[cutoff_mode],
+        'max_bond': {None: -1}.get(max_bond, max_bond),
+    }
+
+    if (executor is None) or (len(gates) < 2):
+        for i, G in gates.items():
+            _apply_gate_vidal(Bs, lams, i, G, **opts)
+        return
+
+    fs = [executor.submit(_apply_gate_vidal, Bs, lams, i, G, **opts)
+          for i, G in gates.items()]
+    for f in fs:
+        f.result()
+
+
 class TEBD:
     """Class implementing Time Evolving Block Decimation (TEBD) [1].
 
@@ -186,11 +350,13 @@ class TEBD:
         shape ``(d * d, d * d)``, where ``d`` is the physical dimension of
         ``p0``.
     dt : float, optional
-        Default time step, cannot be set as well as ``tol``.
+        Default time step, cannot be set as well as ``tol`` (unless
+        ``adaptive=True``, in which case it is the initial time step).
     tol : float, optional
         Default target error for each evolution, cannot be set as well as
         ``dt``, which will instead be calculated from the trotter orderm length
-        of time, and hamiltonian norm.
+        of time, and hamiltonian norm. If ``adaptive=True``, this is instead
+        the target error per unit time.
     t0 : float, optional
         Initial time. Defaults to 0.0.
     split_opts : dict, optional
@@ -198,6 +364,30 @@ class TEBD:
         :func:`~quimb.tensor.tensor_core.tensor_split`.
     imag : bool, optional
         Enable imaginary time evolution. Defaults to false.
+    fused : bool, optional
+        Whether to evolve with a specialised kernel that keeps the state as
+        raw right canonical arrays and bond singular values (a Vidal-like
+        canonical form), applying each layer of gates without any
+        intermediate tensor objects or re-canonicalization. Only open
+        boundary conditions are supported, only the ``cutoff``,
+        ``cutoff_mode`` and ``max_bond`` entries of ``split_opts`` are used
+        and the state is kept normalized. This greatly reduces the per-gate
+        overhead for small bond dimensions.
+    executor : {None, 'threads'} or executor, optional
+        If ``fused=True``, a thread pool with which to apply the (independent)
+        gates of each layer concurrently. ``'threads'`` uses the default
+        ``quimb`` thread pool.
+    adaptive : bool, optional
+        Whether to adapt the time step as the evolution proceeds. The error of
+        each step is estimated by comparing it to a single second order step
+        (for fourth order steps, or to two half second order steps for second
+        order steps). Steps with an error greater than ``tol * dt`` are
+        rejected and retried with a smaller time step, otherwise the time
+        step is grown or shrunk to match ``tol``. The time step is restricted
+        to powers of ``2**(1/4)`` so that the cached gates are rarely
+        recomputed, and never shrunk because of errors that a smaller step
+        fails to reduce, e.g. those due to truncation. The estimated errors
+        of the accepted steps are accumulated in ``err``.
 
     See Also
     --------
@@ -205,7 +395,8 @@ class TEBD:
     """
 
     def __init__(self, p0, H, dt=None, tol=None, t0=0.0,
-                 split_opts=None, progbar=True, imag=False):
+                 split_opts=None, progbar=True, imag=False, fused=False,
+                 executor=None, adaptive=False):
         # prepare initial state
         self._pt = p0.copy()
         self._pt.canonize(0)
@@ -230,20 +421,51 @@ class TEBD:
 
         # set time and tolerance defaults
         self.t0 = self.t = t0
-        if dt and tol:
+        if dt and tol and not adaptive:
             raise ValueError("Can't set default for both ``dt`` and ``tol``.")
         self.dt = self._dt = dt
         self.tol = tol
         self.imag = imag
+        self.adaptive = adaptive
 
         # misc other options
         self.progbar = progbar
         self.split_opts = {} if split_opts is None else dict(split_opts)
 
+        # options for the fused raw array kernel
+        if fused and self.cyclic:
+            raise ValueError("The fused TEBD kernel only supports OBC.")
+        self.fused = fused
+        if executor == 'threads':
+            executor = qu.get_thread_pool()
+        self.executor = executor
+        self._vidal = None
+        self._vidal_stale = False
+        # the initial state is canonized as if after a 'left' sweep
+        self._last_sweep = 'left'
+        # level below which adaptive step error estimates are just noise
+        self._adaptive_floor = 0.0
+
+    def _sync_pt(self):
+        """If the fused kernel has been used, write the raw arrays it has
+        evolved back into the MPS state.
+        """
+        if not self._vidal_stale:
+            return
+
+        Bs, _, inds = self._vidal
+        for i, (B, ix) in enumerate(zip(Bs, inds)):
+            # remove the dummy bonds at either end
+            shape = B.shape[int(i == 0):3 - int(i == self.N - 1)]
+            self._pt[i].modify(data=B.reshape(shape), inds=ix)
+
+        self._vidal_stale = False
+
     @property
     def pt(self):
         """The MPS state of the system at the current time.
         """
+        self._sync_pt()
         return self._pt.copy()
 
     @property
@@ -321,6 +543,18 @@ class TEBD:
 
         # ------------------------------------------------------------------- #
 
+        if self.fused:
+            return self._sweep_fused(direction, dt_frac)
+
+        # each sweep expects the orthogonality center where the opposite
+        #     sweep leaves it, which isn't the case e.g. after restoring a
+        #     snapshot, or two same direction sweeps that weren't combined
+        if (not self.cyclic) and (direction == self._last_sweep or
+                                  self._last_sweep is None):
+            {'right': self._pt.right_canonize,
+             'left': self._pt.left_canonize}[direction]()
+        self._last_sweep = direction
+
         if direction == 'right':
             final_site_ind = -1
             # Apply even gates:
@@ -365,6 +599,34 @@ class TEBD:
             factor = self._pt[final_site_ind].norm()
             self._pt[final_site_ind] /= factor
 
+    def _sweep_fused(self, direction, dt_frac):
+        """Apply a layer of gates using the raw array kernel. Since the
+        state is kept in Vidal-like canonical form, ``direction`` only
+        chooses between the even (``'right'``) and odd (``'left'``) bonds.
+        """
+        if self._vidal is None:
+            self._vidal = _mps_to_vidal_arrays(self._pt)
+        Bs, lams, _ = self._vidal
+
+        start = {'right': 0, 'left': 1}[direction]
+        gates = {}
+        for i in range(start, self.N - 1, 2):
+            U = self.get_gate(dt_frac, (i, i + 1))
+            d1, d2 = Bs[i].shape[1], Bs[i + 1].shape[1]
+            gates[i] = np.asarray(U).reshape(d1, d2, d1, d2)
+
+        _apply_gate_layer_vidal(
+            Bs, lams, gates, cutoff=self.split_opts.get('cutoff', 1e-10),
+            cutoff_mode=self.split_opts.get('cutoff_mode', 'rel'),
+            max_bond=self.split_opts.get('max_bond', None),
+            executor=self.executor)
+
+        if self.imag:
+            # imaginary time gates are not unitary, restore canonical form
+            lams[:] = _canonize_vidal_arrays(Bs)
+
+        self._vidal_stale = True
+
     def _step_order2(self, tau=1, **sweep_opts):
         """Perform a single, second order step.
         """
@@ -408,15 +670,271 @@ class TEBD:
             raise ValueError("Can't set both ``dt`` and ``tol``.")
 
         if dt is None:
-            self._dt = self.choose_time_step(tol, T - self.t, order)
+            self._set_dt(self.choose_time_step(tol, T - self.t, order))
         else:
-            self._dt = dt
+            self._set_dt(dt)
 
         return self._dt
 
+    def _set_dt(self, dt):
+        """Set the current time step, clearing any gates cached for a
+        different one.
+        """
+        if dt != self._dt:
+            self._dt = dt
+            self._U_ints.clear()
+
+    # ------------------------ adaptive time stepping ----------------------- #
+
+    ADAPTIVE_SAFETY = 0.9  # factor to under-shoot the ideal next time step by
+    ADAPTIVE_MIN_FACTOR = 0.1  # most that a step can shrink by
+    ADAPTIVE_MAX_FACTOR = 2.0  # most that a step can grow by
+    ADAPTIVE_MAX_REJECTS = 10  # times to retry a step before accepting anyway
+    ADAPTIVE_MIN_DT = 2.0**-20  # smallest time step to shrink to
+
+    @staticmethod
+    def _quantize_dt(dt):
+        """Round ``dt`` down to the nearest power of ``2**(1/4)``. A small
+        tolerance makes this idempotent, since otherwise floating point error
+        in ``log2`` can push exact grid points down a level.
+        """
+        if not dt > 0.0:
+            raise ValueError(f"The time step must be positive, got {dt}.")
+        return 2.0 ** (math.floor(4 * math.log2(dt) + 1e-9) / 4)
+
+    def _snapshot_state(self):
+        """Get a copy of the fully evolved current state that can later be
+        restored with ``_restore_state``.
+        """
+        self._drain_queued_sweep()
+
+        if self.fused:
+            if self._vidal is None:
+                self._vidal = _mps_to_vidal_arrays(self._pt)
+            # the kernel only ever replaces arrays, so shallow copies suffice
+            Bs, lams, inds = self._vidal
+            return list(Bs), list(lams), inds
+
+        return self._pt.copy(deep=True)
+
+    def _restore_state(self, state):
+        """Restore a state produced by ``_snapshot_state``.
+        """
+        self._queued_sweep = None
+
+        if self.fused:
+            Bs, lams, inds = state
+            self._vidal = list(Bs), list(lams), inds
+            self._vidal_stale = True
+        else:
+            self._pt = state.copy(deep=True)
+            self._last_sweep = None
+
+    def _state_overlap(self, state):
+        """Compute the overlap of a state produced by ``_snapshot_state``
+        with the current state.
+        """
+        self._drain_queued_sweep()
+
+        if not self.fused:
+            # unlike the fused kernel, the norm is free to drift slightly
+            nrm = (abs(state.H @ state) * abs(self._pt.H @ self._pt))**0.5
+            return (state.H @ self._pt) / nrm
+
+        E = np.ones((1, 1))
+        for x, y in zip(state[0], self._vidal[0]):
+            E = np.tensordot(E, x.conj(), ((0,), (0,)))
+            E = np.tensordot(E, y, ((0, 1), (0, 1)))
+        return E.item()
+
+    def estimate_step_error(self, order=4, dt=None):
+        """Take a single step of size ``dt`` and estimate its error, by
+        comparing it to a single second order step for ``order=4``, or to two
+        half second order steps for ``order=2``. The state is left at the
+        result of the more accurate step, but time is not advanced.
+
+        Parameters
+        ----------
+        order : {2, 4}, optional
+            Trotter order of the step to take.
+        dt : float, optional
+            Time step, defaults to the current one.
+
+        Returns
+        -------
+        state0 : MatrixProductState or tuple
+            The state before the step, which can be restored with
+            ``_restore_state``.
+        err : float
+            The estimated error of the lower order step, ``|| psi_lo - psi_hi
+            ||`` (ignoring any global phase), which is an upper bound for that
+            of the step taken.
+        """
+        dt = self._dt if dt is None else dt
+        state0 = self._snapshot_state()
+
+        self._step_order2(dt=dt, queue=True)
+        state_lo = self._snapshot_state()
+
+        self._restore_state(state0)
+        if order == 4:
+            self._step_order4(dt=dt, queue=True)
+        else:
+            self._step_order2(1 / 2, dt=dt, queue=True)
+            self._step_order2(1 / 2, dt=dt, queue=True)
+
+        overlap = self._state_overlap(state_lo)
+        err = (2 * abs(1 - abs(overlap))) ** 0.5
+        return state0, err
+
+    def _truncation_floor(self, order=4):
+        """Rough bound on the part of ``estimate_step_error`` that is due to
+        truncation rather than Trotter error, which no choice of time step
+        can remove. Only cutoff modes that bound the discarded weight of each
+        split are considered, else this is zero.
+        """
+        cutoff = self.split_opts.get('cutoff', 1e-10)
+        if self.fused or self.cyclic:
+            default_mode = 'rel'
+        else:
+            default_mode = 'rsum2'
+        cutoff_mode = self.split_opts.get('cutoff_mode', default_mode)
+        weight = {'sum2': cutoff, 'rsum2': cutoff,
+                  'sum1': cutoff**2, 'rsum1': cutoff**2}.get(cutoff_mode, 0.0)
+
+        # both steps together apply this many (combined) layers of gates
+        nsweeps = {2: 8, 4: 14}[order]
+        return (2 * weight * nsweeps * (self.N - 1) / 2) ** 0.5
+
+    def _init_adaptive_dt(self, T, dt, tol, order):
+        """Set the target error per unit time and initial time step for
+        adaptive time stepping.
+        """
+        tol = self.tol if (tol is None) else tol
+        if not tol:
+            raise ValueError("Adaptive time stepping requires ``tol``, the "
+                             "target error per unit time.")
+        self._adaptive_tol = tol
+
+        if dt is None:
+            dt = self._dt
+        if (dt is None) and (T > self.t):
+            dt = self.choose_time_step(tol, T - self.t, order)
+        if dt is not None:
+            self._set_dt(self._quantize_dt(dt))
+
+    def _step_adaptive(self, T, order=4, progbar=None):
+        """Take a single step towards time ``T``, with estimated error less
+        than ``tol * dt``, retrying with smaller time steps if necessary, then
+        choose the next time step.
+        """
+        err_prev = dt_prev = None
+
+        for nrejects in range(self.ADAPTIVE_MAX_REJECTS + 1):
+            dt = min(self._dt, T - self.t)
+            state0, err = self.estimate_step_error(order=order, dt=dt)
+
+            # error per step of the second order step scales as dt^3, but
+            #     can't be resolved below the noise floor of the estimate
+            floor = max(self._adaptive_floor, self._truncation_floor(order))
+            target = max(self._adaptive_tol * dt, floor)
+            factor = (self.ADAPTIVE_SAFETY * (target / err)**(1 / 2)
+                      if err > 0.0 else self.ADAPTIVE_MAX_FACTOR)
+            factor = min(max(factor, self.ADAPTIVE_MIN_FACTOR),
+                         self.ADAPTIVE_MAX_FACTOR)
+
+            if err <= target:
+                if err <= floor:
+                    # the true error can only be smaller, so grow the step
+                    factor = self.ADAPTIVE_MAX_FACTOR
+                break
+
+            if (err_prev is not None) and (err > err_prev * (dt / dt_prev)**2):
+                # a smaller step should reduce the error as ~dt^3, so if it
+                #     doesn't it must be dominated by e.g. truncation error
+                self._adaptive_floor = max(self._adaptive_floor, 2 * err)
+                factor = 1.0
+                break
+
+            if ((nrejects == self.ADAPTIVE_MAX_REJECTS) or
+                    (dt <= self.ADAPTIVE_MIN_DT)):
+                warnings.warn(
+                    f"Accepting TEBD step at t={self.t:.4g} with estimated "
+                    f"error {err:.4g} > {target:.4g} after {nrejects} "
+                    "rejections. Truncation error may dominate - try "
+                    "relaxing ``tol`` or tightening ``split_opts``.")
+                factor = 1.0
+                break
+
+            self._restore_state(state0)
+            err_prev, dt_prev = err, dt
+            self._set_dt(self._quantize_dt(
+                max(dt * factor, self.ADAPTIVE_MIN_DT)))
+
+        self.t += dt
+        self._err += err
+
+        # don't let a step shortened to hit ``T`` set the next time step
+        if dt == self._dt:
+            self._set_dt(self._quantize_dt(
+                max(dt * factor, self.ADAPTIVE_MIN_DT)))
+
+        if progbar is not None:
+            progbar.cupdate(self.t)
+            self._set_progbar_desc(progbar)
+
+    def _drain_queued_sweep(self):
+        """Apply any sweep that has been queued to be combined with the next,
+        so that the state is fully evolved to the current time.
+        """
+        if getattr(self, '_queued_sweep', None):
+            direction, dt_frac = self._queued_sweep
+            self._queued_sweep = None
+            self.sweep(direction, dt_frac, queue=False)
+
+    def save_checkpoint(self, fname):
+        """Save the current state, time and accumulated error to ``fname``,
+        such that the evolution can be resumed later with
+        :meth:`~quimb.tensor.tensor_tebd.TEBD.load_checkpoint`. The file is
+        replaced atomically, so a crash mid-save leaves the previous checkpoint
+        intact.
+
+        Parameters
+        ----------
+        fname : str
+            Where to save the checkpoint.
+        """
+        self._drain_queued_sweep()
+        self._sync_pt()
+        qu.utils.save_to_disk({
+            'pt': self._pt,
+            't': self.t,
+            'err': self._err,
+        }, fname)
+
+    def load_checkpoint(self, fname):
+        """Load a checkpoint saved with
+        :meth:`~quimb.tensor.tensor_tebd.TEBD.save_checkpoint`, replacing the
+        current state, time and accumulated error.
+
+        Parameters
+        ----------
+        fname : str
+            The checkpoint file.
+        """
+        checkpoint = qu.utils.load_from_disk(fname)
+        self._pt = checkpoint['pt']
+        self.t = checkpoint['t']
+        self._err = checkpoint['err']
+        self._queued_sweep = None
+        self._vidal = None
+        self._vidal_stale = False
+        self._last_sweep = None
+
     TARGET_TOL = 1e-13  # tolerance to have 'reached' target time
 
-    def update_to(self, T, dt=None, tol=None, order=4, progbar=None):
+    def update_to(self, T, dt=None, tol=None, order=4, progbar=None,
+                  checkpoint=None, checkpoint_every=1):
         """Update the state to time ``T``.
 
         Parameters
@@ -424,41 +942,73 @@ class TEBD:
         T : float
             The time to evolve to.
         dt : float, optional
-            Time step to use. Can't be set as well as ``tol``.
+            Time step to use. Can't be set as well as ``tol``, unless
+            ``adaptive=True``, in which case it is the initial time step.
         tol : float, optional
-            Tolerance for whole evolution. Can't be set as well as ``dt``.
+            Tolerance for whole evolution, or error per unit time if
+            ``adaptive=True``. Can't be set as well as ``dt``.
         order : int, optional
             Trotter order to use.
         progbar : bool, optional
             Manually turn the progress bar off.
+        checkpoint : str, optional
+            If given, a file to periodically save the state to. If the file
+            already exists, the evolution is first resumed from it.
+        checkpoint_every : int, optional
+            If ``checkpoint`` is given, how many steps to take between each
+            save.
         """
+        if (checkpoint is not None) and os.path.exists(checkpoint):
+            self.load_checkpoint(checkpoint)
+
         if T < self.t - self.TARGET_TOL:
             raise NotImplementedError
 
-        self._compute_sweep_dt_tol(T, dt, tol, order)
+        if self.adaptive:
+            self._init_adaptive_dt(T, dt, tol, order)
+        else:
+            self._compute_sweep_dt_tol(T, dt, tol, order)
 
         # set up progress bar and start evolution
         progbar = self.progbar if (progbar is None) else progbar
         progbar = qu.utils.continuous_progbar(self.t, T) if progbar else None
 
+        nsteps = 0
         while self.t < T - self.TARGET_TOL:
-            if (T - self.t < self._dt):
-                # set custom dt if within one step of final time
-                dt = T - self.t
-                # also make sure queued sweeps are drained
-                queue = False
+            if self.adaptive:
+                # perform a step, choosing dt as we go
+                self._step_adaptive(T, order=order, progbar=progbar)
+
             else:
-                dt = None
-                queue = True
+                if (T - self.t < self._dt):
+                    # set custom dt if within one step of final time
+                    dt = T - self.t
+                    # also make sure queued sweeps are drained
+                    queue = False
+                else:
+                    dt = None
+                    queue = True
+
+                # perform a step!
+                self.step(order=order, progbar=progbar, dt=dt, queue=queue)
+
+            nsteps += 1
 
-            # perform a step!
-            self.step(order=order, progbar=progbar, dt=dt, queue=queue)
+            if (checkpoint is not None) and (nsteps % checkpoint_every == 0):
+                self.save_checkpoint(checkpoint)
+
+        if (checkpoint is not None) and (nsteps % checkpoint_every != 0):
+            self.save_checkpoint(checkpoint)
 
         if progbar:
             progbar.close()
 
     def _set_progbar_desc(self, progbar):
-        msg = f"t={self.t:.4g}, max-bond={self._pt.max_bond()}"
+        if self._vidal_stale:
+            max_bond = max(lam.size for lam in self._vidal[1])
+        else:
+            max_bond = self._pt.max_bond()
+        msg = f"t={self.t:.4g}, max-bond={max_bond}"
         progbar.set_description(msg)
 
     def at_times(self, ts, dt=None, tol=None, order=4, progbar=None):
@@ -487,8 +1037,14 @@ class TEBD:
         ts = sorted(ts)
         T = ts[-1]
 
-        # need to use dt always so tol applies over whole T sweep
-        dt = self._compute_sweep_dt_tol(T, dt, tol, order)
+        if self.adaptive:
+            # carry on adapting the time step between each time
+            self._init_adaptive_dt(T, dt, tol, order)
+            dt, tol = None, self._adaptive_tol
+        else:
+            # need to use dt always so tol applies over whole T sweep
+            dt = self._compute_sweep_dt_tol(T, dt, tol, order)
+            tol = False
 
         # set up progress bar
         progbar = self.progbar if (progbar is None) else progbar
@@ -496,7 +1052,7 @@ class TEBD:
             ts = qu.utils.progbar(ts)
 
         for t in ts:
-            self.update_to(t, dt=dt, tol=False, order=order, progbar=False)
+            self.update_to(t, dt=dt, tol=tol, order=order, progbar=False)
 
             if progbar:
                 self._set_progbar_desc(ts)
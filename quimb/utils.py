@@ -1,7 +1,10 @@
 """Miscellenous
 """
+import os
+import tempfile
 import importlib
 import itertools
+import contextlib
 
 
 _CHECK_OPT_MSG = "Option `{}` should be one of {}, but got '{}'."
@@ -197,11 +200,46 @@ def functions_equal(fn1, fn2):
     return code1 == code2
 
 
+@contextlib.contextmanager
+def atomic_write(fname):
+    """Context manager yielding a unique temporary path, in the same
+    directory and with the same extension as ``fname``, to write to. If the
+    block completes, the temporary file atomically replaces ``fname``,
+    otherwise it is removed, so that an interrupted write can never leave a
+    partially written ``fname``. Concurrent writers each get their own
+    temporary file.
+    """
+    fname = os.fspath(fname)
+    root, ext = os.path.splitext(fname)
+    fd, tmp_fname = tempfile.mkstemp(
+        prefix=os.path.basename(root) + '.', suffix='.tmp' + ext,
+        dir=os.path.dirname(fname) or None)
+    os.close(fd)
+
+    try:
+        yield tmp_fname
+        os.replace(tmp_fname, fname)
+    finally:
+        if os.path.exists(tmp_fname):
+            os.remove(tmp_fname)
+
+
 def save_to_disk(obj, fname, **dump_opts):
-    """Save an object to disk using joblib.dump.
+    """Save an object to disk using joblib.dump. If ``fname`` is a path, the
+    object is written via :func:`atomic_write`, so that an interrupted save
+    can never leave a partially written file.
     """
     import joblib
-    return joblib.dump(obj, fname, **dump_opts)
+
+    if not isinstance(fname, (str, os.PathLike)):
+        return joblib.dump(obj, fname, **dump_opts)
+
+    # the temporary file keeps the extension, which joblib can use to choose
+    #     the compression
+    with atomic_write(fname) as tmp_fname:
+        joblib.dump(obj, tmp_fname, **dump_opts)
+
+    return [os.fspath(fname)]
 
 
 def load_from_disk(fname, **load_opts):
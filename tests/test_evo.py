@@ -1,4 +1,4 @@
-from pytest import fixture, mark, raises
+from pytest import fixture, mark, raises, approx, importorskip
 
 from math import pi, gcd, cos
 from functools import reduce
@@ -494,6 +494,25 @@ class TestEvolution:
                 checked = True
         assert checked
 
+    @mark.parametrize("method", ['solve', 'integrate', 'expm'])
+    def test_evo_checkpoint_resume(self, method, tmpdir):
+        importorskip("joblib")
+        fname = str(tmpdir.join('evo.dmp'))
+        ham = qu.ham_heis(4, cyclic=False)
+        p0 = qu.neel_state(4)
+
+        evo = qu.Evolution(p0, ham, method=method)
+        evo.update_to(0.5, checkpoint=fname, checkpoint_every=0.2)
+        assert evo.t == approx(0.5)
+
+        # a fresh evolution should pick up from the checkpoint
+        evo2 = qu.Evolution(p0, ham, method=method)
+        evo2.update_to(1.0, checkpoint=fname)
+        assert evo2.t == approx(1.0)
+
+        evo.update_to(1.0)
+        assert qu.fidelity(evo.pt, evo2.pt) == approx(1.0)
+
     @slepc4py_test
     @mark.parametrize('expm_backend', ['slepc-krylov', 'slepc-expokit'])
     def test_expm_slepc(self, expm_backend):
@@ -173,6 +173,34 @@ class TestLOBPCG:
         assert_allclose(np.eye(6), abs(vk.H @ svk), atol=1e-9, rtol=1e-9)
 
 
+class TestDavidson:
+    @pytest.mark.parametrize("which", ['SA', 'LA'])
+    @pytest.mark.parametrize("dtype", [float, complex])
+    def test_against_arpack(self, which, dtype):
+        A = qu.rand_herm(64, dtype=dtype)
+        lk, vk = qu.eigh(A, k=3, which=which, backend='davidson', tol=1e-10)
+        slk, svk = qu.eigh(A, k=3, which=which, backend='scipy')
+        assert_allclose(lk, slk)
+        assert_allclose(np.eye(3), abs(vk.H @ svk), atol=1e-8)
+
+    def test_sparse_linear_operator(self):
+        from scipy.sparse.linalg import aslinearoperator
+        A = qu.ham_heis(8, sparse=True)
+        lk, vk = qu.eigh(aslinearoperator(A), k=1, backend='davidson',
+                         tol=1e-6)
+        slk, svk = qu.eigh(A, k=1, backend='scipy')
+        assert_allclose(lk, slk)
+
+    def test_warm_start_subspace(self):
+        from quimb.linalg.scipy_linalg import eigs_davidson
+        A = qu.rand_herm(64, dtype=float)
+        lk, vk, subspace = eigs_davidson(A, k=1, return_subspace=True)
+        assert subspace.shape == (64, 3)
+        # restarting from the previous subspace should need one iteration
+        lk2, _ = eigs_davidson(A, k=1, subspace=subspace, maxiter=1)
+        assert_allclose(lk, lk2)
+
+
 class TestEvalsWindowed:
     @pytest.mark.parametrize("backend", eigs_backends)
     def test_bound_spectrum(self, ham1, backend):
@@ -311,6 +339,34 @@ class TestExpm:
         if sparse:
             assert isinstance(p, sp.csr_matrix)
 
+    @pytest.mark.parametrize("sparse", [True, False])
+    @pytest.mark.parametrize("factor", [-0.1j, -3j])
+    def test_expm_multiply_krylov(self, sparse, factor):
+        H = qu.ham_heis(8, sparse=sparse)
+        v = qu.rand_ket(2**8)
+        # large ``factor`` requires sub-stepping with this ``ncv``
+        x = qu.expm_multiply(factor * H, v, backend='krylov', ncv=16)
+        y = qu.expm_multiply(factor * H, v, backend='scipy')
+        assert x.shape == v.shape
+        assert_allclose(x, y, atol=1e-10)
+
+    def test_expm_multiply_krylov_errors(self):
+        H = qu.ham_heis(8, sparse=True)
+        v = qu.rand_ket(2**8)
+        v[3] = np.nan
+        with pytest.raises(RuntimeError):
+            qu.expm_multiply(H, v, backend='krylov', ncv=16, max_nsub=2**4)
+        with pytest.raises(TypeError):
+            qu.expm_multiply(H, v, backend='krylov', nvc=16)
+
+    def test_expm_multiply_krylov_large_vector_norm(self):
+        # breakdown should not be judged relative to the vector's norm
+        H = -1j * qu.ham_heis(8, sparse=True)
+        v = 1e16 * qu.rand_ket(2**8)
+        x = qu.expm_multiply(H, v, backend='krylov')
+        y = qu.expm_multiply(H, v, backend='scipy')
+        assert_allclose(x / 1e16, y / 1e16, atol=1e-8)
+
 
 class TestSqrtm:
     @pytest.mark.parametrize("sparse", [True, False])
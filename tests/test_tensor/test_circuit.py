@@ -49,6 +49,19 @@ class TestCircuit:
         assert '111' in counts
         assert counts['000'] + counts['111'] == 1024
 
+    def test_prepare_GHZ_mps_counts(self):
+        qc = qtn.CircuitMPS(20)
+        qc.apply_gate('H', 0)
+        for i in range(19):
+            qc.apply_gate('CNOT', i, i + 1)
+        counts = qc.simulate_counts(1024, seed=42)
+        assert set(counts) == {'0' * 20, '1' * 20}
+        assert sum(counts.values()) == 1024
+
+        # contraction options are accepted like for a generic circuit
+        counts = qc.simulate_counts(16, seed=42, optimize='greedy')
+        assert sum(counts.values()) == 16
+
     def test_rand_reg_qaoa(self):
         G = rand_reg_graph(reg=3, n=18, seed=42)
         qasm = graph_to_circ(G)
@@ -62,6 +75,61 @@ class TestCircuit:
         assert len(qc.psi.tensors) == 18
         assert (qc.psi.H & qc.psi) ^ all == pytest.approx(1.0)
 
+    @pytest.mark.parametrize(
+        'Circ', [qtn.Circuit, qtn.CircuitMPS, qtn.CircuitDense]
+    )
+    def test_amplitudes_and_marginal(self, Circ):
+        qc = Circ(4)
+        qc.apply_gates([
+            ('H', 0), ('H', 1), ('CNOT', 0, 2), ('RX', 0.3, 3),
+            ('CZ', 1, 3), ('RY', 0.7, 2), ('CNOT', 2, 3),
+        ])
+        p = qc.to_dense().A.ravel()
+
+        ntensors = qc.psi.num_tensors
+        assert qc.amplitude('0110') == pytest.approx(p[0b0110])
+        assert qc.psi.num_tensors == ntensors
+
+        bs = ['0000', '1011', '0111', (1, 1, 0, 1)]
+        amps = qc.amplitudes(bs)
+        assert not isinstance(amps, list)
+        expected = [p[0], p[0b1011], p[0b0111], p[0b1101]]
+        assert list(amps) == pytest.approx(expected)
+
+        m = qc.marginal([3, 1])
+        pd = (abs(p)**2).reshape(2, 2, 2, 2).sum(axis=(0, 2)).T
+        assert m == pytest.approx(pd)
+
+        with pytest.raises(ValueError):
+            qc.amplitude('010')
+
+    @pytest.mark.parametrize(
+        'Circ', [qtn.Circuit, qtn.CircuitMPS, qtn.CircuitDense]
+    )
+    def test_local_expectation_lightcone(self, Circ):
+        n = 8
+        qc = Circ(n)
+        for r in range(3):
+            for i in range(n):
+                qc.apply_gate('RY', 0.1 * (i + r + 1), i, gate_round=r)
+            for i in range(r % 2, n - 1, 2):
+                qc.apply_gate('CZ', i, i + 1, gate_round=r)
+        qc.apply_gate('SWAP', 0, 7)
+
+        p = qc.to_dense()
+        X, Z = qu.pauli('X'), qu.pauli('Z')
+        for Gs, where in [([Z], [3]), ([X, Z], [7, 1])]:
+            G = Gs[0] if len(Gs) == 1 else Gs[0] & Gs[1]
+            Gd = qu.ikron(Gs, [2] * n, where)
+            expected = qu.expec(Gd, p)
+            assert qc.local_expectation(G, where) == pytest.approx(expected)
+
+        if Circ is qtn.Circuit:
+            tags = qc.get_reverse_lightcone_tags(3)
+            assert 0 < len(tags) < len(qc.gates)
+            ket = qc.get_psi_reverse_lightcone(3)
+            assert ket.num_tensors < qc.psi.num_tensors
+
     @pytest.mark.parametrize(
         'Circ', [qtn.Circuit, qtn.CircuitMPS, qtn.CircuitDense]
     )
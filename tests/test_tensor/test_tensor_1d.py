@@ -545,6 +545,72 @@ class TestMatrixProductState:
 
         assert ghz.H @ ghz == pytest.approx(1.0)
 
+    def test_environments(self):
+        psi = MPS_rand_state(8, 4)
+        envs = psi.environments()
+        Z, X = qu.pauli('Z'), qu.pauli('X')
+        pd = psi.to_dense()
+        for i in range(8):
+            mz = qu.expec(qu.ikron(Z, [2] * 8, i), pd)
+            assert envs.local_expectation(Z, i) == pytest.approx(mz)
+            assert psi.copy().magnetization(i) == pytest.approx(mz / 2)
+        A, B = qu.rand_herm(2), qu.rand_herm(2)
+        x = qu.expec(qu.ikron([A, B], [2] * 8, (2, 5)), pd)
+        assert envs.local_expectation(A & B, (2, 5)) == pytest.approx(x)
+        for i, j in [(0, 7), (3, 1), (2, 2), (5, 6)]:
+            assert envs.correlation(Z, i, j, B=X) == pytest.approx(
+                psi.correlation(Z, i, j, B=X))
+
+        # unnormalized states
+        envs2 = (2 * psi).environments()
+        assert envs2.norm == pytest.approx(4.0)
+        assert envs2.local_expectation(Z, 3) == pytest.approx(
+            envs.local_expectation(Z, 3))
+        assert envs2.local_expectation(Z, 3, normalized=False) == (
+            pytest.approx(4 * envs.local_expectation(Z, 3)))
+        with pytest.raises(ValueError):
+            envs.correlation(A & B, (1, 2), (2, 3))
+
+    def test_correlation_matrix(self):
+        psi = MPS_rand_state(7, 4)
+        Z, X = qu.pauli('Z'), qu.pauli('X')
+        C = psi.correlation_matrix(Z)
+        assert C.shape == (7, 7)
+        assert_allclose(C, [[psi.correlation(Z, i, j) for j in range(7)]
+                            for i in range(7)], atol=1e-12)
+        sites = [0, 2, 5, 6]
+        C = psi.correlation_matrix([Z, X], [X, Z], sites=sites,
+                                   envs=psi.environments())
+        assert C.shape == (2, 4, 4)
+        for C_AB, A, B in [(C[0], Z, X), (C[1], X, Z)]:
+            assert_allclose(C_AB, [[psi.correlation(A, i, j, B=B)
+                                    for j in sites] for i in sites],
+                            atol=1e-12)
+
+        with pytest.raises(ValueError):
+            psi.correlation_matrix(Z, sites=[])
+        with pytest.raises(ValueError):
+            psi.correlation_matrix(Z, sites=[1, 3, 1])
+        with pytest.raises(ValueError):
+            psi.correlation_matrix(Z, envs=(2 * psi).environments())
+
+    @pytest.mark.parametrize("dtype", [float, complex])
+    def test_sample(self, dtype):
+        psi = MPS_rand_state(5, 4, dtype=dtype)
+        psi /= (psi.H @ psi)**0.5
+        configs = psi.sample(100000, seed=42, chunksize=30000)
+        assert configs.shape == (100000, 5)
+        counts = psi.simulate_counts(100000, seed=42)
+        assert sum(counts.values()) == 100000
+        p_exact = np.abs(psi.to_dense().A.reshape(-1))**2
+        p_sampled = np.zeros(2**5)
+        for b, c in counts.items():
+            p_sampled[int(b, 2)] = c / 100000
+        assert_allclose(p_sampled, p_exact, atol=0.01)
+        # check reversal matches the ordering of the configurations
+        rcounts = psi.simulate_counts(100000, seed=42, reverse=True)
+        assert rcounts == {b[::-1]: c for b, c in counts.items()}
+
     def test_gate_split(self):
         psi = MPS_rand_state(10, 3)
         psi2 = psi.copy()
@@ -757,6 +823,29 @@ class TestMatrixProductOperator:
         Ad, xd, yd = A.to_dense(), x.to_dense(), y.to_dense()
         assert_allclose(Ad @ xd, yd)
 
+    @pytest.mark.parametrize("site_ind_id", ('k{}', 'test{}'))
+    def test_apply_mps_zipup(self, site_ind_id):
+        A = MPO_rand(8, 5)
+        x = MPS_rand_state(8, 4, site_ind_id=site_ind_id)
+        y = A.apply(x, method='zipup')
+        assert isinstance(y, MatrixProductState)
+        assert len(y.tensors) == 8
+        assert y.site_ind_id == site_ind_id
+        Ad, xd, yd = A.to_dense(), x.to_dense(), y.to_dense()
+        assert_allclose(Ad @ xd, yd, atol=1e-10)
+
+        # truncated zip-up should be about as good as direct then compress
+        yz = A.apply(x, method='zipup', max_bond=8)
+        yc = A.apply(x, compress=True, max_bond=8)
+        assert yz.max_bond() <= 8
+        ye = qu.normalize(Ad @ xd, inplace=False)
+        fz = qu.fidelity(ye, qu.normalize(yz.to_dense()))
+        fc = qu.fidelity(ye, qu.normalize(yc.to_dense()))
+        assert fz > 0.9 * fc
+
+        with pytest.raises(ValueError):
+            A.apply(MPS_rand_state(8, 4, cyclic=True), method='zipup')
+
     @pytest.mark.parametrize("cyclic", (False, True))
     def test_sites_mpo_mps_product(self, cyclic):
         k = MPS_rand_state(13, 7, cyclic=cyclic)
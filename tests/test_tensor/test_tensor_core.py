@@ -49,6 +49,109 @@ class TestContractOpts:
             assert qtn.get_tensor_linop_backend() == 'cupy'
         assert qtn.get_tensor_linop_backend() == _TENSOR_LINOP_BACKEND
 
+    @pytest.mark.parametrize('minimize', ['flops', 'size'])
+    @pytest.mark.parametrize('methods', [('greedy',), ('partition',),
+                                         ('greedy', 'partition')])
+    def test_hyper_optimizer(self, minimize, methods):
+        if 'partition' in methods:
+            pytest.importorskip('networkx')
+        from quimb.tensor.tensor_core import HyperOptimizer
+
+        circ = qtn.circ_ansatz_1D_brickwork(10, 6)
+        tn = circ.psi
+        opt = HyperOptimizer(max_repeats=8, minimize=minimize,
+                             methods=methods, partition_cutoff=4)
+        info = tn.contract(all, get='path-info', optimize=opt)
+        greedy_info = tn.contract(all, get='path-info', optimize='greedy')
+        assert opt.best['method'] in methods
+        if 'greedy' in methods:
+            # the first greedy trial is the standard greedy path
+            if minimize == 'flops':
+                assert info.opt_cost <= greedy_info.opt_cost
+            else:
+                assert (info.largest_intermediate <=
+                        greedy_info.largest_intermediate)
+
+    @pytest.mark.parametrize('strategy', ['hyper', 'hyper-size'])
+    def test_hyper_strategies(self, strategy):
+        psi = MPS_rand_state(6, 3)
+        with qtn.contract_strategy(strategy):
+            assert (psi.H & psi) ^ all == pytest.approx(1.0)
+
+    def test_contract_path_cache(self, tmp_path):
+        pytest.importorskip('diskcache')
+        from quimb.tensor.tensor_core import _get_contract_path
+
+        tn = qtn.MPS_rand_state(6, 3)
+        norm = tn.H & tn
+        x_exact = norm ^ all
+        assert qtn.get_contract_path_cache() is None
+
+        with qtn.contract_path_cache(str(tmp_path)) as cache:
+            assert len(cache) == 0
+            x = norm.contract(all, cache=False)
+            assert_allclose(x, x_exact)
+            assert len(cache) == 1
+            key, = cache.iterkeys()
+            eq, shapes, _ = key
+            # a 'new' process should find the path stored
+            cache[key] = [(0, 1)] * (len(shapes) - 1)
+            info = _get_contract_path(eq, *shapes, optimize='greedy')
+            assert info.path == cache[key]
+
+        assert qtn.get_contract_path_cache() is None
+
+    def test_contract_path_cache_nested_restores(self, tmp_path):
+        pytest.importorskip('diskcache')
+
+        outer = qtn.set_contract_path_cache(str(tmp_path / 'outer'),
+                                            size_limit=2**20)
+        try:
+            with qtn.contract_path_cache(str(tmp_path / 'inner')) as inner:
+                assert qtn.get_contract_path_cache() is inner
+                assert inner.size_limit != 2**20
+
+            # the very same cache object, settings and all, is restored
+            assert qtn.get_contract_path_cache() is outer
+            assert outer.size_limit == 2**20
+            outer['x'] = 1
+            assert outer['x'] == 1
+        finally:
+            qtn.set_contract_path_cache(None)
+
+    def test_contraction_cache_info(self):
+        qtn.clear_contraction_cache()
+        info = qtn.get_contraction_cache_info('expression')['expression']
+        assert info['hits'] == info['misses'] == info['size'] == 0
+
+        tn = qtn.MPS_rand_state(5, 3)
+        norm = tn.H & tn
+        qtn.clear_contraction_cache()
+        norm ^ all
+        norm ^ all
+        info = qtn.get_contraction_cache_info()['expression']
+        assert info['misses'] == 1
+        assert info['hits'] == 1
+        assert info['size'] == 1
+        assert info['cost'] == norm.num_tensors - 1
+        assert info['time'] > 0.0
+
+        # check evicting based on the size of expressions
+        tn3 = qtn.MPS_rand_state(3, 3)
+        (tn3.H & tn3) ^ all
+        assert qtn.get_contraction_cache_info()['expression']['size'] == 2
+        qtn.set_contraction_cache_size('expression', maxsize=4096,
+                                       max_cost=norm.num_tensors - 1)
+        info = qtn.get_contraction_cache_info()['expression']
+        assert info['size'] == 1
+        assert info['evictions'] == 1
+        qtn.set_contraction_cache_size('expression', maxsize=4096)
+
+        with pytest.raises(ValueError):
+            qtn.clear_contraction_cache('expr')
+        qtn.clear_contraction_cache('expression')
+        assert qtn.get_contraction_cache_info()['expression']['size'] == 0
+
 
 class TestBasicTensorOperations:
 
@@ -240,6 +343,29 @@ class TestBasicTensorOperations:
         with pytest.raises(ValueError):
             a.transpose(*'cdfebz')
 
+    def test_compact_tensor(self):
+        import pickle
+        import copy
+
+        a = rand_tensor((2, 3), inds=(''.join(['a', 'b']), 0), tags=['X'])
+        assert not hasattr(a, '__dict__')
+        # string labels are interned
+        assert a.inds[0] is 'ab'  # noqa: F632
+        assert a.inds[1] == 0
+
+        tn = TensorNetwork([a], virtual=True)
+        for b in (pickle.loads(pickle.dumps(a)), copy.deepcopy(a)):
+            assert b.inds == a.inds
+            assert b.tags == a.tags
+            assert_allclose(b.data, a.data)
+            assert not b.owners
+        assert hash(tn) in a.owners
+
+        p = qtn.PTensor(np.diag, [1, 2], inds='ab', tags='P')
+        p2 = pickle.loads(pickle.dumps(p.conj()))
+        assert p2.is_conj
+        assert_allclose(p2.data, np.diag([1, 2]))
+
     def test_ownership(self):
         a = rand_tensor((2, 2), ('a', 'b'), tags={'X', 'Y'})
         b = rand_tensor((2, 2), ('b', 'c'), tags={'X', 'Z'})
@@ -277,6 +403,99 @@ class TestBasicTensorOperations:
         assert sum(tn ^ all for tn in pp.cut_iter(*bnds)) == pytest.approx(1.0)
         assert pp ^ all == pytest.approx(1.0)
 
+    def test_compile_contraction(self):
+        psi = MPS_rand_state(6, 3)
+        norm = psi.H & psi
+        fn = norm.compile_contraction()
+        assert fn(*(t.data for t in norm)) == pytest.approx(1.0)
+
+        # new data, same structure
+        psi2 = MPS_rand_state(6, 3)
+        norm2 = psi2.H & psi2
+        assert fn(*(t.data for t in norm2)) == pytest.approx(1.0)
+
+        tn = norm.select(['I0', 'I1'], which='any')
+        fn = tn.compile_contraction(output_inds=tn.outer_inds()[::-1])
+        T = fn.contract_tensors(*tn)
+        assert T.inds == tn.outer_inds()[::-1]
+        assert_allclose(T.data, (tn ^ all).transpose(*T.inds).data)
+        assert T.tags == tn.tags
+
+    def test_contract_sliced(self):
+        psi = MPS_rand_state(10, 7, cyclic=True)
+        pp = psi.H & psi
+        bnds = bonds(pp[0], pp[-1])
+        assert pp.contract(all, slice_inds=bnds) == pytest.approx(1.0)
+
+        max_size = 7**3
+        slice_inds = qtn.find_slice_inds(*pp, max_size=max_size)
+        assert len(slice_inds) > 0
+        info = pp.isel({ix: 0 for ix in slice_inds}).contract(
+            all, get='path-info')
+        assert info.largest_intermediate <= max_size
+        assert pp.contract(all, slice_max_size=max_size) == pytest.approx(1.0)
+
+        # partial contraction with output indices
+        tn = pp.select(['I0', 'I1', 'I2'], which='any')
+        T = tn.contract(all, slice_inds=tn.inner_inds()[:2])
+        assert T.inds == tn.contract(all).inds
+        assert_allclose(T.data, tn.contract(all).data)
+
+        with pytest.raises(ValueError):
+            tn.contract(all, slice_inds=T.inds[:1])
+
+    def test_contraction_cost(self):
+        psi = MPS_rand_state(10, 7, cyclic=True, dtype=complex)
+        pp = psi.H & psi
+        info = pp.contract(all, get='path-info')
+        cost = pp.contraction_cost()
+        assert cost['flops'] == info.opt_cost
+        assert cost['largest_intermediate'] == info.largest_intermediate
+        assert cost['path'] == tuple(info.path)
+        assert cost['peak_size'] > cost['largest_intermediate']
+        assert cost['peak_memory'] == 16 * cost['peak_size']
+        assert cost['nslices'] == 1
+
+        sliced_cost = pp.contraction_cost(slice_max_size=7**3)
+        assert sliced_cost['nslices'] > 1
+        assert sliced_cost['peak_memory'] < cost['peak_memory']
+        assert sliced_cost['largest_intermediate'] <= 7**3
+
+        with pytest.raises(MemoryError):
+            pp.contraction_cost(max_memory=cost['peak_memory'] - 1)
+        with pytest.raises(MemoryError):
+            pp.contract(all, max_memory=cost['peak_memory'] - 1)
+        x = pp.contract(all, max_memory=cost['peak_memory'] - 1,
+                        slice_max_size=7**3)
+        assert x == pytest.approx(1.0)
+
+    @pytest.mark.parametrize('executor', ['threads', 'processes',
+                                          'custom-threads',
+                                          'custom-processes'])
+    def test_contract_sliced_parallel(self, executor):
+        import contextlib
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+        psi = MPS_rand_state(10, 7, cyclic=True)
+        pp = psi.H & psi
+
+        with contextlib.ExitStack() as stack:
+            if executor == 'custom-threads':
+                executor = stack.enter_context(ThreadPoolExecutor(2))
+            elif executor == 'custom-processes':
+                executor = stack.enter_context(ProcessPoolExecutor(2))
+
+            x = pp.contract(all, slice_max_size=7**3, executor=executor)
+            assert x == pytest.approx(1.0)
+
+            tn = pp.select(['I0', 'I1', 'I2'], which='any')
+            T = tn.contract(all, slice_inds=tn.inner_inds()[:2],
+                            executor=executor)
+            assert_allclose(T.data, tn.contract(all).data)
+
+        with pytest.raises(ValueError):
+            pp.contract(all, slice_max_size=7**3, executor='gpu')
+
     @pytest.mark.parametrize("method", ['qr', 'exp', 'mgs', 'svd'])
     def test_unitize(self, method):
         t = rand_tensor((2, 3, 4), 'abc')
@@ -302,6 +521,18 @@ class TestBasicTensorOperations:
         # make sure bond is newly labelled
         assert set('abcd') & set(tn.all_inds()) == set()
 
+    def test_to_memmap(self, tmpdir):
+        fname = str(tmpdir.join('x.npy'))
+        x = rand_tensor((2, 3, 4), 'abc', dtype=complex)
+        y = rand_tensor((4, 5), 'cd')
+        xm = x.to_memmap(fname)
+        assert xm.is_memmapped()
+        assert not x.is_memmapped()
+        assert_allclose((xm @ y).data, (x @ y).data)
+        # changes should be copy-on-write
+        xm *= 2
+        assert_allclose(np.load(fname), x.data)
+
 
 class TestTensorFunctions:
     @pytest.mark.parametrize('method', ['svd', 'eig', 'isvd', 'svds'])
@@ -504,6 +735,55 @@ class TestTensorNetwork:
         tn2['t1'].data[:] /= 2
         assert_allclose(tn1['t1'].data, tn2['t1'].data)
 
+    def test_copy_on_write_maps(self):
+        a = rand_tensor((2, 3, 4), inds='abc', tags='t0')
+        b = rand_tensor((2, 3, 4), inds='abd', tags='t1')
+        tn1 = TensorNetwork((a, b))
+        tn2 = tn1.copy()
+        tn3 = tn1.copy()
+        # maps are shared until modified
+        assert tn2.ind_map is tn1.ind_map
+        tn2['t1'].modify(inds=('a', 'b', 'X'), tags={'t1', 'new'})
+        assert 'X' in tn2.ind_map
+        assert 'new' in tn2.tag_map
+        assert 'X' not in tn1.ind_map
+        assert 'new' not in tn1.tag_map
+        # modifying the original should not affect other copies
+        tn1['t0'].modify(inds=('a', 'b', 'Y'))
+        assert 'Y' in tn1.ind_map
+        assert 'Y' not in tn3.ind_map
+        assert tn3.ind_map['c'] == tn3.tag_map['t0']
+        del tn3['t0']
+        assert len(tn1.tag_map['t0']) == 1
+        assert len(tn2.tag_map['t0']) == 1
+
+    def test_cached_tag_queries(self):
+        a = rand_tensor((2, 3, 4), inds='abc', tags={'t0', 'x'})
+        b = rand_tensor((2, 3, 4), inds='abd', tags={'t1', 'x'})
+        tn = TensorNetwork((a, b))
+        tids = tn._get_tids_from_tags('x')
+        assert len(tids) == 2
+        # returned sets should be safe to modify
+        tids.clear()
+        assert len(tn._get_tids_from_tags('x')) == 2
+        assert len(tn._get_tids_from_tags('t0', which='!all')) == 1
+        assert len(tn._get_tids_from_inds('d')) == 1
+        tn2 = tn.copy()
+        # cache is invalidated by modification, in only the modified network
+        tn['t1'].modify(tags={'t1'}, inds=('a', 'b', 'c'))
+        assert len(tn._get_tids_from_tags('x')) == 1
+        assert len(tn._get_tids_from_inds('c')) == 2
+        assert not tn._get_tids_from_tags('t0', which='!any') & (
+            tn._get_tids_from_tags('t0'))
+        assert len(tn2._get_tids_from_tags('x')) == 2
+        assert len(tn2._get_tids_from_inds('c')) == 1
+        tn.add_tensor(rand_tensor((2,), inds='e', tags='x'))
+        assert len(tn._get_tids_from_tags('x')) == 2
+        assert len(tn.select_tensors(['x', 't1'], which='any')) == 3
+        del tn['t0']
+        assert len(tn._get_tids_from_tags('x')) == 1
+        assert len(tn2._get_tids_from_tags('x')) == 2
+
     def test_copy_deep(self):
         a = rand_tensor((2, 3, 4), inds='abc', tags='t0')
         b = rand_tensor((2, 3, 4), inds='abd', tags='t1')
@@ -997,6 +1277,35 @@ class TestTensorNetwork:
         assert all(hash(tn) not in t.owners for t in tn2)
         assert all(hash(tn2) in t.owners for t in tn2)
 
+    @pytest.mark.parametrize('compress', [False, True])
+    @pytest.mark.parametrize('mmap', [False, True])
+    def test_save_load_native(self, compress, mmap, tmpdir):
+        fname = str(tmpdir.join('tn.qtn'))
+        mps = MPS_rand_state(10, 7, dtype=complex, cyclic=True)
+        mps.save(fname, compress=compress)
+
+        info = qtn.read_tn_file_info(fname)
+        assert info['props']['class'] == 'MatrixProductState'
+        assert len(info['tensors']) == 10
+
+        mps2 = qtn.load_tn_from_disk(fname, mmap=mmap)
+        assert isinstance(mps2, qtn.MatrixProductState)
+        assert mps2.cyclic
+        assert mps2.site_ind_id == mps.site_ind_id
+        assert mps2.H @ mps == pytest.approx(1.0)
+        # loaded mmapped arrays should not modify the file
+        mps2.left_canonize()
+        assert qtn.load_tn_from_disk(fname).H @ mps == pytest.approx(1.0)
+
+        # load just some of the sites
+        sub = qtn.load_tn_from_disk(fname, ['I3', 'I4'], which='any',
+                                    mmap=mmap)
+        assert type(sub) is qtn.TensorNetwork
+        assert sub.num_tensors == 2
+        assert sub.sites == range(3, 5)
+        assert_allclose(sub['I3'].data, mps['I3'].data)
+        assert qtn.load_tn_from_disk(fname, 5).num_tensors == 1
+
     @pytest.mark.parametrize('dtype', [None, 'float32', 'complex128'])
     def test_randomize(self, dtype):
         psi = MPS_rand_state(5, 3, dtype='float64')
@@ -1,3 +1,5 @@
+import os
+
 import pytest
 
 import numpy as np
@@ -9,6 +11,7 @@ from quimb import (
     plus,
     is_eigenvector,
     eigh,
+    groundenergy,
     heisenberg_energy,
 )
 
@@ -21,8 +24,10 @@ from quimb.tensor import (
     MPO_ham_heis,
     MPO_ham_mbl,
     MovingEnvironment,
+    expec_TN_1D,
     DMRG1,
     DMRG2,
+    DMRGParallel,
     DMRGX,
     SpinHam,
 )
@@ -93,6 +98,30 @@ class TestMovingEnvironment:
         assert env.pos == 0
         assert len(env().tensors) == 4
 
+    @pytest.mark.parametrize("begin", ['left', 'right'])
+    def test_spill_to_disk(self, begin, tmpdir):
+        n = 10
+        p = MPS_rand_state(n, bond_dim=7)
+        tn = p.H.reindex_sites('b{}') & MPO_ham_heis(n) & p
+        env = MovingEnvironment(tn, begin=begin, bsz=2,
+                                spill_dir=str(tmpdir))
+        ref = MovingEnvironment(tn, begin=begin, bsz=2)
+
+        def spilled(i):
+            return any(t.is_memmapped() for t in env.envs[i]
+                       if t.tags & {'_LEFT', '_RIGHT'})
+
+        sites = range(n - 1) if begin == 'left' else range(n - 2, -1, -1)
+        for i in sites:
+            env.move_to(i)
+            ref.move_to(i)
+            # only the neighbouring environments should be kept in memory
+            assert all(spilled(j) for j in range(n - 1) if abs(i - j) > 1)
+            assert (env() ^ all) == pytest.approx(ref() ^ all)
+
+        # at most one file per position and end piece is kept
+        assert 0 < len(os.listdir(env.spill_dir)) <= 2 * (n - 1)
+
     @pytest.mark.parametrize("n", [20, 19])
     @pytest.mark.parametrize("bsz", [1, 2])
     @pytest.mark.parametrize("ssz", [1 / 2, 1.0])
@@ -220,6 +249,18 @@ class TestDMRG1:
         assert_allclose(actual_e, eff_e, rtol=tol)
         assert_allclose(abs(expec(mps_gs_dense, gs)), 1.0, rtol=tol)
 
+    @pytest.mark.parametrize("method", ['subspace', 'rand'])
+    def test_bond_expansion(self, method):
+        h = MPO_ham_heis(12)
+        dmrg2 = DMRG2(h, bond_dims=[4, 8, 16])
+        dmrg2.solve(tol=1e-8, sweep_sequence='RL')
+
+        dmrg = DMRG1(h, bond_dims=[4, 8, 16])
+        dmrg.opts['bond_expand_method'] = method
+        dmrg.solve(tol=1e-8, sweep_sequence='RL', max_sweeps=20)
+        assert dmrg._k.max_bond() == 16
+        assert dmrg.energy == pytest.approx(dmrg2.energy, rel=1e-5)
+
     def test_ising_and_MPS_product_state(self):
         h = MPO_ham_ising(6, bx=2.0, j=0.1)
         dmrg = DMRG1(h, bond_dims=8)
@@ -310,6 +351,62 @@ class TestDMRG2:
         dmrg.solve(verbosity=1)
         assert dmrg.energy == pytest.approx(-1 / 4)
 
+    @pytest.mark.parametrize("backend", [None, 'davidson'])
+    def test_adaptive_local_eig_tol(self, backend):
+        n = 10
+        ham = MPO_ham_heis(n)
+        dmrg = DMRG2(ham, bond_dims=[4, 8, 16])
+        dmrg.opts['local_eig_backend'] = backend
+        dmrg.opts['local_eig_tol_adaptive'] = True
+        dmrg.opts['local_eig_tol'] = 1e-2
+        assert dmrg._get_local_eig_tol_maxiter()[0] == 1e-2
+        assert dmrg.solve(tol=1e-8)
+        tol, maxiter = dmrg._get_local_eig_tol_maxiter()
+        assert tol < 1e-2
+        assert maxiter > 100
+        eex = groundenergy(ham_heis(n, cyclic=False, sparse=True))
+        assert dmrg.energy == pytest.approx(eex, 1e-6)
+        if backend == 'davidson':
+            assert set(dmrg._eig_subspaces) == set(range(n - 1))
+
+    def test_env_spill_dir(self, tmpdir):
+        n = 10
+        ham = MPO_ham_heis(n)
+        dmrg = DMRG2(ham, bond_dims=[4, 8, 16])
+        dmrg.opts['env_spill_dir'] = str(tmpdir)
+        assert dmrg.solve(tol=1e-8)
+        eex = groundenergy(ham_heis(n, cyclic=False, sparse=True))
+        assert dmrg.energy == pytest.approx(eex, 1e-6)
+
+    def test_checkpoint_resume(self, tmpdir):
+        pytest.importorskip("joblib")
+        fname = str(tmpdir.join('dmrg.dmp'))
+        n = 10
+        ham = MPO_ham_heis(n)
+
+        dmrg = DMRG2(ham, bond_dims=[4, 8, 16])
+        dmrg.opts['local_eig_ncv'] = 6
+        assert not dmrg.solve(tol=1e-10, max_sweeps=2, checkpoint=fname)
+
+        # fresh instance with different random state should resume
+        dmrg = DMRG2(ham, bond_dims=[4, 8, 16])
+        dmrg.opts['local_eig_tol'] = 1e-6
+        info = dmrg.load_checkpoint(fname)
+        assert dmrg.opts['local_eig_ncv'] == 6
+        assert dmrg.opts['local_eig_tol'] == 1e-6
+        assert info['sweep'] == 2
+        assert len(dmrg.energies) == 2
+        assert dmrg._bond_dims == [16]
+        assert dmrg.state.max_bond() == 8
+        assert (expec_TN_1D(dmrg.state.H, ham, dmrg.state) ==
+                pytest.approx(dmrg.energy))
+
+        dmrg = DMRG2(ham, bond_dims=[4, 8, 16])
+        assert dmrg.solve(tol=1e-8, max_sweeps=10, checkpoint=fname)
+        assert 2 < len(dmrg.energies) <= 10
+        eex = groundenergy(ham_heis(n, cyclic=False, sparse=True))
+        assert dmrg.energy == pytest.approx(eex, 1e-6)
+
     def test_variable_bond_ham(self):
         import quimb as qu
 
@@ -336,6 +433,62 @@ class TestDMRG2:
         assert_allclose(H_explicit, H_sps.A)
 
 
+class TestDMRGParallel:
+
+    @pytest.mark.parametrize("executor", [None, 'threads'])
+    def test_matches_dmrg2(self, executor):
+        H = MPO_ham_heis(16)
+        dmrg = DMRG2(H, bond_dims=[8, 16, 32])
+        dmrg.solve(tol=1e-8, sweep_sequence='RL')
+
+        pdmrg = DMRGParallel(H, bond_dims=[8, 16, 32], nsegments=2,
+                             executor=executor)
+        assert pdmrg.get_segments() == ((0, 8), (8, 16))
+        assert pdmrg.get_segments(shift=True) == ((0, 12), (12, 16))
+        pdmrg.solve(tol=1e-8, sweep_sequence='RL', max_sweeps=20)
+
+        assert pdmrg.energy == pytest.approx(dmrg.energy, rel=1e-4)
+        assert np.all(np.diff(pdmrg.energies) < 1e-10)
+        psi = pdmrg.state
+        assert psi.H @ psi == pytest.approx(1.0)
+        assert expec_TN_1D(psi.H, H, psi) == pytest.approx(pdmrg.energy)
+
+    def test_bad_segments(self):
+        with pytest.raises(ValueError):
+            DMRGParallel(MPO_ham_heis(10), nsegments=3)
+
+    @pytest.mark.parametrize("direction", ['R', 'L'])
+    def test_sweep_canonizes(self, direction):
+        pdmrg = DMRGParallel(MPO_ham_heis(12), bond_dims=[8], nsegments=2,
+                             executor=None)
+        en = pdmrg.sweep(direction, verbosity=1, max_bond=8)
+        psi = pdmrg.state
+        assert psi.count_canonized() == {'R': (11, 0), 'L': (0, 11)}[direction]
+        assert psi.H @ psi == pytest.approx(1.0)
+        assert en == pytest.approx(expec_TN_1D(psi.H, pdmrg.ham, psi))
+
+    def test_dense_choice_per_step(self, monkeypatch):
+        import quimb.tensor.tensor_dmrg as qtd
+
+        sizes = []
+        TNLinearOperator = qtd.TNLinearOperator
+
+        def recording_linear_operator(*args, **kwargs):
+            sizes.append(np.prod(kwargs['ldims']))
+            return TNLinearOperator(*args, **kwargs)
+
+        monkeypatch.setattr(qtd, 'TNLinearOperator',
+                            recording_linear_operator)
+
+        # the boundary steps are small enough to be dense, the middle not
+        pdmrg = DMRGParallel(MPO_ham_heis(16), bond_dims=[32], nsegments=2,
+                             executor=None)
+        pdmrg.sweep('R')
+        assert sizes
+        assert all(sz >= 800 for sz in sizes)
+        assert len(sizes) < 14
+
+
 class TestDMRGX:
 
     def test_explicit_sweeps(self):
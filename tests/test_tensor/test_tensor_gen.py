@@ -65,6 +65,48 @@ class TestSpinHam:
 
         assert dmrg.energy == pytest.approx(-2.25)
 
+    @pytest.mark.parametrize("imag", [False, True])
+    @pytest.mark.parametrize("method", ['WI', 'WII'])
+    def test_evolution_operator(self, method, imag):
+        n, dt = 6, 0.01
+        H = qtn.MPO_ham_heis(n, bz=0.3)
+        U = qtn.MPO_evolution_operator(H, dt, method=method, imag=imag)
+        assert U.max_bond() == H.max_bond() - 1
+        assert U.upper_ind_id == H.upper_ind_id
+
+        Hd = H.to_dense()
+        Ud = qu.expm((-1 if imag else -1j) * dt * Hd)
+        err = qu.norm(U.to_dense() - Ud, 'spectral')
+        assert err < 10 * dt**2
+
+    def test_evolution_operator_WII_more_accurate(self):
+        n, dt = 6, 0.05
+        builder = qtn.SpinHam(1 / 2)
+        builder += 1.0, 'Z', 'Z'
+        builder += 0.5, 'X', 'X'
+        builder -= 0.3, 'Z'
+
+        Ud = qu.expm(-1j * dt * builder.build_sparse(n).A)
+        errs = {
+            method: qu.norm(builder.build_mpo_evolution(
+                n, dt, method=method).to_dense() - Ud, 'spectral')
+            for method in ('WI', 'WII')
+        }
+        assert errs['WII'] < errs['WI']
+
+    def test_evolution_operator_zipup_evolve(self):
+        n, dt, nsteps = 8, 0.02, 10
+        H = qtn.MPO_ham_heis(n)
+        U = qtn.MPO_evolution_operator(H, dt)
+
+        psi = qtn.MPS_neel_state(n)
+        psi0 = psi.to_dense()
+        for _ in range(nsteps):
+            psi = U.apply(psi, method='zipup', cutoff=1e-10)
+
+        psi_ex = qu.expm(-1j * dt * nsteps * H.to_dense()) @ psi0
+        assert qu.fidelity(psi.to_dense(), psi_ex) > 0.999
+
 
 class TestMPSSpecificStates:
 
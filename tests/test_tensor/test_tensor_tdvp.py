@@ -0,0 +1,62 @@
+import pytest
+from pytest import approx
+
+import quimb as qu
+import quimb.tensor as qtn
+
+
+class TestTDVP:
+
+    @pytest.mark.parametrize('dense', [None, False])
+    @pytest.mark.parametrize('bsz', [1, 2])
+    def test_evolve_vs_exact(self, bsz, dense):
+        n = 6
+        tf = 1.0
+        psi0 = qtn.MPS_rand_state(n, bond_dim=8, dtype=complex, seed=42)
+        H = qtn.MPO_ham_ising(n, j=4, bx=1)
+
+        # with the full bond dimension TDVP is exact, whatever the time step
+        tdvp = qtn.TDVP(psi0, H, dt=0.1, bsz=bsz, local_ham_dense=dense,
+                        split_opts={'cutoff': 1e-12})
+        e0 = tdvp.energy
+        tdvp.update_to(tf)
+        assert tdvp.t == approx(tf)
+        assert tdvp.energy == approx(e0)
+
+        evo = qu.Evolution(psi0.to_dense(),
+                           qu.ham_ising(n, jz=4, bx=1, cyclic=False))
+        evo.update_to(tf)
+        assert qu.expec(evo.pt, tdvp.pt.to_dense()) == approx(1, rel=1e-6)
+
+    def test_grows_bond_dim(self):
+        n = 10
+        psi0 = qtn.MPS_neel_state(n)
+        H = qtn.MPO_ham_heis(n)
+        tdvp = qtn.TDVP(psi0, H, dt=0.05, split_opts={'max_bond': 16})
+
+        for pt in tdvp.at_times([0.1, 0.2, 0.5]):
+            assert pt.H @ pt == approx(1, rel=1e-6)
+        assert 1 < tdvp.pt.max_bond() <= 16
+
+        tebd = qtn.TEBD(psi0, qu.ham_heis(2, cyclic=False), dt=0.01)
+        tebd.update_to(0.5, order=4)
+        assert abs(tebd.pt.H @ tdvp.pt) == approx(1, rel=1e-3)
+
+    def test_imag_time_groundstate(self):
+        n = 8
+        psi0 = qtn.MPS_neel_state(n)
+        H = qtn.MPO_ham_heis(n)
+        tdvp = qtn.TDVP(psi0, H, dt=0.1, imag=True,
+                        split_opts={'max_bond': 32, 'cutoff': 1e-10})
+        tdvp.update_to(20)
+        en = qu.groundenergy(qu.ham_heis(n, sparse=True, cyclic=False))
+        assert tdvp.energy == approx(en, rel=1e-6)
+        assert tdvp.pt.H @ tdvp.pt == approx(1)
+
+    def test_raises(self):
+        with pytest.raises(ValueError):
+            qtn.TDVP(qtn.MPS_neel_state(4, cyclic=True),
+                     qtn.MPO_ham_heis(4, cyclic=True))
+        tdvp = qtn.TDVP(qtn.MPS_neel_state(4), qtn.MPO_ham_heis(4))
+        with pytest.raises(ValueError):
+            tdvp.update_to(1.0)
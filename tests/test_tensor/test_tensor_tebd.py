@@ -1,3 +1,5 @@
+import math
+
 import pytest
 from pytest import approx
 import numpy as np
@@ -171,6 +173,86 @@ class TestTEBD:
 
         assert qu.expec(tebd.pt.to_dense(), evo.pt) == pytest.approx(1.0)
 
+    @pytest.mark.parametrize('executor', [None, 'threads'])
+    @pytest.mark.parametrize('imag', [False, True])
+    def test_fused_kernel(self, imag, executor):
+        n = 10
+        psi0 = qtn.MPS_rand_state(n, bond_dim=3, dtype=complex, seed=7)
+        H = qtn.NNI_ham_heis(n, j=(0.7, 0.8, 0.9), bz=0.337)
+
+        tebd = qtn.TEBD(psi0, H, dt=0.05, imag=imag)
+        tebd.split_opts['cutoff'] = 1e-12
+        tebd_fused = qtn.TEBD(psi0, H, dt=0.05, imag=imag,
+                              fused=True, executor=executor)
+        tebd_fused.split_opts['cutoff'] = 1e-12
+
+        for T in (0.25, 0.5):
+            tebd.update_to(T, order=4)
+            tebd_fused.update_to(T, order=4)
+            pt, pt_fused = tebd.pt, tebd_fused.pt
+            assert isinstance(pt_fused, qtn.MatrixProductState)
+            assert pt_fused.H @ pt_fused == approx(1.0)
+            assert abs(pt.H @ pt_fused) == approx(1.0, rel=1e-8)
+
+        with pytest.raises(ValueError):
+            qtn.TEBD(qtn.MPS_neel_state(n, cyclic=True),
+                     qu.ham_heis(2), fused=True)
+
+    @pytest.mark.parametrize('fused', [False, True])
+    @pytest.mark.parametrize('order', [2, 4])
+    def test_adaptive(self, order, fused):
+        n = 10
+        tf = 2
+        tol = 1e-4
+        psi0 = qtn.MPS_neel_state(n)
+        H_int = qu.ham_heis(2, cyclic=False)
+        tebd = qtn.TEBD(psi0, H_int, tol=tol, adaptive=True, fused=fused)
+        tebd.split_opts['cutoff'] = 1e-10
+        tebd.split_opts['cutoff_mode'] = 'rel'
+
+        for pt in tebd.at_times([0.5, 1.0, 1.5, tf]):
+            assert pt.H @ pt == approx(1, rel=1e-5)
+        assert tebd.t == approx(tf)
+        assert not tebd._queued_sweep
+
+        # time step should have been snapped to the grid
+        lg = math.log2(tebd._dt) * 4
+        assert lg == approx(round(lg))
+        for x in (tebd._dt, 2**(-1 / 4), 2**(1 / 4), 2**(3 / 4), 0.3, 1e-3):
+            xq = tebd._quantize_dt(x)
+            assert xq <= x * (1 + 1e-9)
+            assert tebd._quantize_dt(xq) == xq
+        assert 0.0 < tebd.err < tol * tf
+
+        evo = qu.Evolution(psi0.to_dense(),
+                           qu.ham_heis(n=n, sparse=True, cyclic=False))
+        evo.update_to(tf)
+        assert qu.expec(evo.pt, tebd.pt.to_dense()) == approx(1, rel=1e-4)
+
+    def test_adaptive_truncation_floor(self):
+        n = 10
+        psi0 = qtn.MPS_neel_state(n)
+        H_int = qu.ham_heis(2, cyclic=False)
+        tebd = qtn.TEBD(psi0, H_int, tol=1e-4, adaptive=True)
+        # discarding weight 1e-8 per split dominates the target error
+        tebd.split_opts['cutoff'] = 1e-8
+        tebd.split_opts['cutoff_mode'] = 'rsum2'
+
+        # the time step should not be shrunk to try and beat truncation
+        tebd.update_to(1)
+        assert tebd.t == approx(1)
+        assert tebd._dt > 1e-2
+
+        evo = qu.Evolution(psi0.to_dense(),
+                           qu.ham_heis(n=n, sparse=True, cyclic=False))
+        evo.update_to(1)
+        assert qu.expec(evo.pt, tebd.pt.to_dense()) == approx(1, rel=1e-3)
+
+    def test_quantize_dt_rejects_non_positive(self):
+        for dt in (0.0, -0.1):
+            with pytest.raises(ValueError):
+                qtn.TEBD._quantize_dt(dt)
+
     @pytest.mark.parametrize('cyclic', [False, True])
     def test_ising_model_with_field(self, cyclic):
 
@@ -205,6 +287,29 @@ class TestTEBD:
         ef_mpo = qtn.expec_TN_1D(tebd.pt.H, H_mpo, tebd.pt)
         assert ef_mpo == pytest.approx(e0, 1e-5)
 
+    def test_checkpoint_resume(self, tmpdir):
+        pytest.importorskip("joblib")
+        fname = str(tmpdir.join('tebd.dmp'))
+        n = 10
+        H = qtn.NNI_ham_heis(n)
+        psi0 = qtn.MPS_neel_state(n)
+
+        tebd = qtn.TEBD(psi0, H, dt=0.05, progbar=False)
+        tebd.update_to(0.5, checkpoint=fname, checkpoint_every=3)
+
+        tebd2 = qtn.TEBD(psi0, H, dt=0.05, progbar=False)
+        tebd2.load_checkpoint(fname)
+        assert tebd2.t == approx(0.5)
+        assert tebd2.err == approx(tebd.err)
+        assert tebd2.pt.H @ tebd.pt == approx(1.0)
+
+        # resuming a longer evolution should match an uninterrupted one
+        tebd3 = qtn.TEBD(psi0, H, dt=0.05, progbar=False)
+        tebd3.update_to(1.0, checkpoint=fname)
+        assert tebd3.t == approx(1.0)
+        tebd.update_to(1.0)
+        assert abs(tebd3.pt.H @ tebd.pt) == approx(1.0)
+
 
 def test_OTOC_local():
     L = 10
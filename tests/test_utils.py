@@ -3,6 +3,7 @@ from quimb.utils import (
     raise_cant_find_library_function,
     deprecated,
     functions_equal,
+    atomic_write,
 )
 
 
@@ -53,3 +54,45 @@ class TestFunctionsEqual:
         # compare function-method
         assert functions_equal(foo1, Foo2.meth2)
         assert functions_equal(Foo1.meth1, foo2)
+
+
+class TestAtomicWrite:
+
+    def test_replaces_or_leaves_intact(self, tmpdir):
+        fname = str(tmpdir.join('x.txt'))
+
+        with atomic_write(fname) as tmp_fname:
+            assert tmp_fname != fname
+            assert tmp_fname.endswith('.txt')
+            with open(tmp_fname, 'w') as f:
+                f.write('one')
+
+        with pytest.raises(RuntimeError):
+            with atomic_write(fname) as tmp_fname:
+                with open(tmp_fname, 'w') as f:
+                    f.write('tw')
+                raise RuntimeError
+
+        with open(fname) as f:
+            assert f.read() == 'one'
+        assert tmpdir.listdir() == [tmpdir.join('x.txt')]
+
+    def test_concurrent_threads(self, tmpdir):
+        from concurrent.futures import ThreadPoolExecutor
+
+        fname = str(tmpdir.join('x.txt'))
+        tmp_fnames = set()
+
+        def write(i):
+            with atomic_write(fname) as tmp_fname:
+                tmp_fnames.add(tmp_fname)
+                with open(tmp_fname, 'w') as f:
+                    f.write(str(i) * 1000)
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(write, range(32)))
+
+        assert len(tmp_fnames) == 32
+        with open(fname) as f:
+            data = f.read()
+        assert data in {str(i) * 1000 for i in range(32)}